@@ -0,0 +1,165 @@
+"""
+Fingerprinted static assets.
+
+Every file under a static directory is also reachable under a name carrying a
+hash of its contents (styles.css -> styles.3f2a9c1b0d.css). Templates link to
+those names through `url()`, so browsers may cache them forever: a changed file
+gets a new URL. For each fingerprinted request the smallest encoding the client
+accepts is served from the `.br` / `.gz` files built next to the sources by
+tools/build_assets.py, falling back to the source itself.
+
+`Pictures` renders responsive <picture> markup for the image derivatives made
+by tools/build_images.py.
+"""
+import hashlib
+import json
+import os
+from mimetypes import guess_type
+from pathlib import Path
+
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from markupsafe import Markup, escape
+
+# Precompressed variants, preferred in this order
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def fingerprinted_name(path: str, digest: str) -> str:
+    stem, dot, ext = path.rpartition(".")
+    if not dot or "/" in ext:
+        return f"{path}.{digest}"
+    return f"{stem}.{digest}.{ext}"
+
+
+def source_files(directory):
+    """Relative paths of the asset sources (not the built variants) under `directory`."""
+    root = Path(directory)
+    suffixes = {suffix for _, suffix in ENCODINGS}
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and path.suffix not in suffixes and not path.name.startswith("."):
+            yield path.relative_to(root).as_posix()
+
+
+def accepted_encodings(header: str):
+    """Content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class AssetFiles(StaticFiles):
+    """
+    StaticFiles that also serves each file under its fingerprinted name,
+    immutable and precompressed. Plain names keep working as before.
+    """
+
+    def __init__(self, directory, prefix):
+        super().__init__(directory=directory)
+        self.prefix = prefix.rstrip("/")
+        self.manifest = {}
+        self._sources = {}
+        self.scan()
+
+    def scan(self):
+        """Hash the sources; call again if files change while running."""
+        manifest = {}
+        for path in source_files(self.directory):
+            digest = fingerprint(Path(self.directory, path).read_bytes())
+            manifest[path] = fingerprinted_name(path, digest)
+        self.manifest = manifest
+        self._sources = {hashed: path for path, hashed in manifest.items()}
+
+    def url(self, path: str) -> str:
+        """URL of an asset by its source path, fingerprinted when known."""
+        path = path.lstrip("/")
+        return f"{self.prefix}/{self.manifest.get(path, path)}"
+
+    async def get_response(self, path, scope):
+        source = self._sources.get(path.replace(os.sep, "/"))
+        if source is None:
+            return await super().get_response(path, scope)
+
+        full_path = Path(self.directory, source)
+        headers = {"Cache-Control": IMMUTABLE, "Vary": "Accept-Encoding"}
+        request_headers = dict(scope["headers"])
+        accepted = accepted_encodings(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        source_mtime = full_path.stat().st_mtime_ns
+        for coding, suffix in ENCODINGS:
+            if coding not in accepted:
+                continue
+            variant = full_path.with_name(full_path.name + suffix)
+            try:
+                # A variant older than its source is stale; skip it until rebuilt
+                if variant.stat().st_mtime_ns >= source_mtime:
+                    return FileResponse(
+                        variant,
+                        headers={**headers, "Content-Encoding": coding},
+                        media_type=guess_type(source)[0],
+                    )
+            except FileNotFoundError:
+                pass
+        return FileResponse(full_path, headers=headers, media_type=guess_type(source)[0])
+
+
+class Pictures:
+    """
+    Renders <picture> elements for the images in a derivatives manifest (see
+    tools/build_images.py): AVIF and WebP srcsets at several widths, with the
+    original as the <img> fallback. Images missing from the manifest get a
+    plain <img>.
+    """
+
+    TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+    def __init__(self, files: AssetFiles, manifest_path):
+        self.files = files
+        try:
+            self.manifest = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self.manifest = {}
+
+    def __call__(self, name, alt, sizes="100vw", lazy=False, priority=False, **attrs):
+        """
+        {{ picture('Plakakia.jpg', 'Πλακάκια', sizes='50vw', lazy=True) }}.
+        Extra keyword arguments become <img> attributes (class_ for class).
+        """
+        entry = self.manifest.get(name)
+        img = {"src": self.files.url(name), "alt": alt}
+        if entry is not None:
+            img["width"], img["height"] = entry["width"], entry["height"]
+        for key, value in attrs.items():
+            img[key.rstrip("_").replace("_", "-")] = value
+        img["decoding"] = "async"
+        if lazy:
+            img["loading"] = "lazy"
+        if priority:
+            img["fetchpriority"] = "high"
+        tag = "<img" + "".join(f' {key}="{escape(value)}"' for key, value in img.items()) + ">"
+        if entry is None:
+            return Markup(tag)
+
+        sources = []
+        for fmt, candidates in entry["sources"].items():
+            srcset = ", ".join(f"{self.files.url(path)} {width}w" for width, path in candidates)
+            sources.append(
+                f'<source type="{self.TYPES[fmt]}" srcset="{escape(srcset)}" sizes="{escape(sizes)}">'
+            )
+        return Markup("<picture>" + "".join(sources) + tag + "</picture>")
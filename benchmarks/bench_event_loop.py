@@ -0,0 +1,123 @@
+"""
+Event-loop responsiveness benchmark.
+
+Measures latency of `/` and `/static/styles.css` while background clients keep
+re-reading and updating a large scratch catalog, once with catalog I/O running
+in the storage thread pool (the default) and once with it forced inline on the
+event loop, which is how the handlers behaved before.
+
+Run from the project root (requires httpx):
+
+    python benchmarks/bench_event_loop.py --items 20000 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402  (needs the project root as cwd for the static mounts)
+
+THREADED_IO = main.run_storage_io
+
+
+async def inline_storage_io(fn, *args):
+    return fn(*args)
+
+
+def seed_items(path: Path, count: int):
+    tree = ET.parse(path)
+    areas = tree.getroot().find("areas")
+    for i in range(count):
+        it = ET.SubElement(areas, "item", {"key": f"bench_{i:06d}"})
+        ET.SubElement(it, "name").text = f"Bench item {i}"
+        ET.SubElement(it, "unit").text = "m2"
+        ET.SubElement(it, "consumption").text = "1 m2 per 1 m2"
+        ET.SubElement(it, "latest_price").text = "1.00"
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def probe(client, url, stop, samples):
+    while not stop.is_set():
+        started = time.perf_counter()
+        r = await client.get(url)
+        r.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def catalog_load(client, stop, items):
+    i = 0
+    while not stop.is_set():
+        i += 1
+        await client.post(
+            "/api/thermoprosopsi/update-price",
+            json={"key": f"bench_{i % items:06d}", "latest_price": 1 + (i % 100) / 100},
+        )
+        # The write invalidated the cache, so this read is a full parse
+        await client.get("/api/thermoprosopsi/catalog")
+        # In-process requests never suspend when the handler blocks, so yield
+        # explicitly to let the probes (and the stop signal) get a turn.
+        await asyncio.sleep(0)
+
+
+async def run(seconds, items, background):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        results = {"/": [], "/static/styles.css": []}
+        tasks = [asyncio.create_task(probe(client, url, stop, s)) for url, s in results.items()]
+        tasks += [asyncio.create_task(catalog_load(client, stop, items)) for _ in range(background)]
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=20000, help="synthetic items in the catalog")
+    parser.add_argument("--seconds", type=float, default=5, help="duration of each run")
+    parser.add_argument("--background", type=int, default=4, help="concurrent catalog read/write clients")
+    args = parser.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix="tampakakis-bench-"))
+    shutil.copytree(ROOT / "data", scratch / "data")
+    for name in ("static", "images", "templates"):
+        (scratch / name).symlink_to(ROOT / name)
+    os.chdir(scratch)
+    try:
+        seed_items(main.CATALOGS["thermoprosopsi"].path, args.items)
+        for mode, io in (("thread pool", THREADED_IO), ("inline (blocking)", inline_storage_io)):
+            main.run_storage_io = io
+            results = asyncio.run(run(args.seconds, args.items, args.background))
+            print(f"== catalog I/O {mode}, {args.items} items, {args.background} background clients")
+            for url, samples in results.items():
+                print(
+                    f"  {url:<20} n={len(samples):<5} p50={statistics.median(samples):7.2f}ms "
+                    f"p99={percentile(samples, 99):7.2f}ms max={max(samples):7.2f}ms"
+                )
+    finally:
+        main.run_storage_io = THREADED_IO
+        os.chdir(ROOT)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_cli()
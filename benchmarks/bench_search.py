@@ -0,0 +1,130 @@
+"""
+Typeahead latency of the search index (see search.py).
+
+For each size, a synthetic catalog with Greek item names is written to a
+scratch directory and indexed, then measured:
+
+  build     indexing the loaded catalog (the first search; later rebuilds run
+            in the background while the previous index is served)
+  keystroke refresh + search for every prefix of the --queries, as typed
+  update    refresh after one price change, i.e. the incremental path
+
+Latencies are per call in milliseconds. Run from the
+project root:
+
+    python benchmarks/bench_search.py --sizes 1000 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402  (needs the project root as cwd for the static mounts)
+from search import SearchIndex  # noqa: E402
+
+CATALOG = "gypsosanida"
+
+WORDS = (
+    "Κόλλα", "Γωνιόκρανο", "Σοβάς", "Αστάρι", "Πλακάκι", "Αρμόστοκος", "Γυψοσανίδα", "Ορθοστάτης",
+    "Στρωτήρας", "Βύσμα", "Τελείωμα", "Πλέγμα", "Διογκωμένη", "Πολυστερίνη", "Χρώμα", "Ακρυλικό",
+    "Σιλικόνη", "Βίδα", "Ταινία", "Μόνωση", "εξωτερικό", "εσωτερικό", "λευκό", "γκρι", "ενισχυμένο",
+)
+QUERIES = ("κολλα πλακ", "Γωνιόκρανο", "ΣΟΒΑΣ λευκ", "gyps", "ορθοστατης 7")
+
+
+def synthetic_catalog(size: int, rng):
+    groups = main.CATALOG_SPECS[CATALOG]["groups"]
+    data = {group: [] for group in groups}
+    for i in range(size):
+        name = " ".join(rng.sample(WORDS, 3)) + f" {i % 1000}"
+        data[groups[i % len(groups)]].append(
+            {"key": f"gyps_{i:06d}", "name": name, "unit": "m2", "latest_price": 1 + i % 97}
+        )
+    return data
+
+
+def timings(fn, calls):
+    samples = []
+    for call in calls:
+        start = time.perf_counter()
+        fn(call)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "max": samples[-1],
+    }
+
+
+def bench(size: int, args):
+    rng = random.Random(size)
+    store = main.open_store(CATALOG, args.backend)
+    store.replace(synthetic_catalog(size, rng))
+    index = SearchIndex(store)
+    store.entry()  # loading the catalog is the store's cost, shared with every other read
+
+    start = time.perf_counter()
+    index.refresh()
+    build = (time.perf_counter() - start) * 1000
+
+    prefixes = [q[:n] for q in args.queries for n in range(1, len(q) + 1)] * args.rounds
+
+    def keystroke(prefix):
+        index.refresh()
+        index.search(prefix, args.limit)
+
+    keys = [f"gyps_{i:06d}" for i in range(size)]
+
+    def update(i):
+        store.update_price(keys[i % size], 1 + i % 50)
+        store.entry()  # the catalog read any page would do anyway; not timed below
+        start = time.perf_counter()
+        index.refresh()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples = []
+    for i in range(args.updates):
+        update(i)
+    samples.sort()
+    return {
+        "build": build,
+        "keystroke": timings(keystroke, prefixes),
+        "update": {"p50": statistics.median(samples), "max": samples[-1]},
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000])
+    parser.add_argument("--queries", nargs="+", default=list(QUERIES))
+    parser.add_argument("--rounds", type=int, default=5, help="times each query is typed")
+    parser.add_argument("--updates", type=int, default=20, help="price changes for the update measurement")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--backend", choices=("xml", "sqlite"), default=main.CATALOG_BACKEND)
+    args = parser.parse_args()
+
+    print(f"{'items':>7} {'build ms':>9}  {'keystroke p50/p99/max ms':>26}  {'update p50/max ms':>19}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as scratch:
+            os.chdir(scratch)
+            main.CATALOG_DB = os.path.join(scratch, "data", "catalogs.db")
+            try:
+                r = bench(size, args)
+            finally:
+                os.chdir(ROOT)
+        k, u = r["keystroke"], r["update"]
+        print(f"{size:>7} {r['build']:>9.1f}  {k['p50']:>8.2f} {k['p99']:>8.2f} {k['max']:>8.2f}  "
+              f"{u['p50']:>9.2f} {u['max']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main_cli()
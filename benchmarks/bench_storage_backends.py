@@ -0,0 +1,114 @@
+"""
+Read and update throughput of the XML and SQLite catalog backends.
+
+For each catalog size, a synthetic thermoprosopsi catalog (items spread over its
+groups) is written to both backends in a scratch directory, then measured:
+
+  load     a fresh store reading the whole catalog (parse / SELECT + serialize)
+  read     cached entry() calls, i.e. GET /api/<catalog>/catalog minus HTTP
+  lookup   get_item on random keys
+  update   single-item update_price calls, one after the other
+  update∥  the same from --workers threads at once
+
+Each measurement runs for at most --seconds. Run from the project root:
+
+    python benchmarks/bench_storage_backends.py --sizes 10 1000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402  (needs the project root as cwd for the static mounts)
+
+CATALOG = "thermoprosopsi"
+
+
+def synthetic_catalog(size: int):
+    groups = main.CATALOG_SPECS[CATALOG]["groups"]
+    data = {group: [] for group in groups}
+    for i in range(size):
+        data[groups[i % len(groups)]].append(
+            {"key": f"item_{i:06d}", "name": f"Είδος {i}", "unit": "m2", "latest_price": 1 + i % 97}
+        )
+    return data
+
+
+def rate(fn, seconds, limit):
+    """Calls per second of fn(i), over at most `limit` calls or `seconds`."""
+    count, start = 0, time.perf_counter()
+    while count < limit:
+        fn(count)
+        count += 1
+        if time.perf_counter() - start > seconds:
+            break
+    return count / (time.perf_counter() - start)
+
+
+def parallel_rate(fn, seconds, limit, workers):
+    deadline = time.perf_counter() + seconds
+    per_worker = max(1, limit // workers)
+
+    def run(w):
+        done = 0
+        while done < per_worker and time.perf_counter() < deadline:
+            fn(w * per_worker + done)
+            done += 1
+        return done
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        total = sum(pool.map(run, range(workers)))
+    return total / (time.perf_counter() - start)
+
+
+def bench(backend: str, size: int, args):
+    keys = [f"item_{i:06d}" for i in range(size)]
+    main.open_store(CATALOG, backend).replace(synthetic_catalog(size))
+
+    start = time.perf_counter()
+    store = main.open_store(CATALOG, backend)
+    store.entry()
+    results = {"load": 1 / (time.perf_counter() - start)}
+    results["read"] = rate(lambda i: store.entry(), args.seconds, 100_000)
+    results["lookup"] = rate(lambda i: store.get_item(random.choice(keys)), args.seconds, 100_000)
+    results["update"] = rate(
+        lambda i: store.update_price(keys[i % size], 1 + i % 50), args.seconds, 10_000
+    )
+    results["update∥"] = parallel_rate(
+        lambda i: store.update_price(keys[i % size], 1 + i % 50), args.seconds, 10_000, args.workers
+    )
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100_000])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time budget per measurement")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    columns = ("load", "read", "lookup", "update", "update∥")
+    print(f"{'backend':8} {'items':>7} " + " ".join(f"{c + '/s':>10}" for c in columns))
+    for size in args.sizes:
+        for backend in ("xml", "sqlite"):
+            with tempfile.TemporaryDirectory() as scratch:
+                os.chdir(scratch)
+                main.CATALOG_DB = os.path.join(scratch, "data", "catalogs.db")
+                try:
+                    results = bench(backend, size, args)
+                finally:
+                    os.chdir(ROOT)
+            print(f"{backend:8} {size:>7} " + " ".join(f"{results[c]:>10.1f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main_cli()
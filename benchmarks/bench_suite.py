@@ -0,0 +1,214 @@
+"""
+In-process benchmark suite for the API and the pages.
+
+Drives the ASGI app through httpx.ASGITransport (no sockets, no server) against
+scratch copies of the catalogs filled with synthetic items, and reports
+throughput and p50/p95/p99 latency per scenario as JSON:
+
+  catalog:<name>       GET /api/<name>/catalog, gzip accepted
+  update-price:<name>  POST /api/<name>/update-price on random items
+  page:<path>          GET of each page (catalog size independent, run once)
+  mixed                90% catalog reads / 10% price updates over all catalogs
+
+Every scenario runs at each --concurrency level for each --sizes value (items
+per catalog group; 20 is about the size of today's catalogs). Run from the
+project root (requires httpx):
+
+    python benchmarks/bench_suite.py --sizes 20 1000 10000 --output bench.json
+
+All four catalogs at 100000 items per group need several GB of memory; use
+--catalogs to benchmark a subset at that size.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402  (needs the project root as cwd for the static mounts)
+
+PAGES = ("/", "/thermoprosopsi", "/plakakia", "/gypsosanida", "/elaioxromatismoi")
+
+
+def synthetic_catalog(name: str, per_group: int):
+    data = {}
+    for group in main.CATALOG_SPECS[name]["groups"]:
+        unit = "day" if group == "workers" else "m2"
+        data[group] = [
+            {
+                "key": f"{group}_{i:06d}",
+                "name": f"{group} {i}",
+                "unit": unit,
+                "latest_price": round(1 + (i % 997) / 10, 2),
+            }
+            for i in range(per_group)
+        ]
+    return data
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_scenario(client, request, total, concurrency, max_seconds):
+    """Issue `total` requests from `concurrency` clients; stop early after `max_seconds`."""
+    latencies = []
+    errors = 0
+    issued = 0
+    started = time.perf_counter()
+    deadline = started + max_seconds
+
+    async def worker():
+        nonlocal issued, errors
+        while issued < total and time.perf_counter() < deadline:
+            i = issued
+            issued += 1
+            t = time.perf_counter()
+            response = await request(client, i)
+            latencies.append((time.perf_counter() - t) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            # In-process requests that never block would starve the other clients
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def catalog_read(name):
+    async def request(client, i):
+        return await client.get(f"/api/{name}/catalog", headers={"Accept-Encoding": "gzip"})
+
+    return request
+
+
+def price_update(name, per_group):
+    groups = main.CATALOG_SPECS[name]["groups"]
+
+    async def request(client, i):
+        key = f"{random.choice(groups)}_{random.randrange(per_group):06d}"
+        return await client.post(
+            f"/api/{name}/update-price", json={"key": key, "latest_price": round(1 + i % 500 / 10, 2)}
+        )
+
+    return request
+
+
+def page(path):
+    async def request(client, i):
+        return await client.get(path)
+
+    return request
+
+
+def mixed(names, per_group):
+    reads = {name: catalog_read(name) for name in names}
+    writes = {name: price_update(name, per_group) for name in names}
+
+    async def request(client, i):
+        name = random.choice(names)
+        return await (writes if random.random() < 0.1 else reads)[name](client, i)
+
+    return request
+
+
+async def run_size(per_group, args, include_pages):
+    for name in args.catalogs:
+        main.CATALOGS[name].replace(synthetic_catalog(name, per_group))
+
+    scenarios = []
+    for name in args.catalogs:
+        scenarios.append((f"catalog:{name}", catalog_read(name)))
+    for name in args.catalogs:
+        scenarios.append((f"update-price:{name}", price_update(name, per_group)))
+    if include_pages:
+        scenarios += [(f"page:{path}", page(path)) for path in PAGES]
+    scenarios.append(("mixed", mixed(args.catalogs, per_group)))
+
+    results = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for scenario, request in scenarios:
+            # Warm up: first load, template compilation
+            await request(client, 0)
+            for concurrency in args.concurrency:
+                stats = await run_scenario(client, request, args.requests, concurrency, args.max_seconds)
+                results.append({"scenario": scenario, "items_per_group": per_group, "concurrency": concurrency, **stats})
+                print(
+                    f"{scenario:<32} items={per_group:<7} c={concurrency:<3} {stats['rps']:>9.1f} req/s "
+                    f"p50={stats['p50_ms']:.2f}ms p95={stats['p95_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 1000, 10000], help="items per group")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=300, help="requests per scenario and concurrency")
+    parser.add_argument("--max-seconds", type=float, default=10, help="time cap per scenario and concurrency")
+    parser.add_argument("--catalogs", nargs="+", default=list(main.CATALOG_SPECS), choices=list(main.CATALOG_SPECS))
+    parser.add_argument("--backend", choices=("xml", "sqlite"), default=main.CATALOG_BACKEND)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix="tampakakis-bench-"))
+    shutil.copytree(ROOT / "data", scratch / "data", ignore=shutil.ignore_patterns("*.db*", "*.journal"))
+    for name in ("static", "images", "templates"):
+        (scratch / name).symlink_to(ROOT / name)
+    os.chdir(scratch)
+    catalogs = main.CATALOGS
+    try:
+        main.CATALOGS = {name: main.open_store(name, args.backend) for name in main.CATALOG_SPECS}
+        results = []
+        for n, per_group in enumerate(args.sizes):
+            results += asyncio.run(run_size(per_group, args, include_pages=n == 0))
+    finally:
+        main.CATALOGS = catalogs
+        os.chdir(ROOT)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "backend": args.backend,
+            "storage_io_concurrency": main.STORAGE_IO_CONCURRENCY,
+            "requests": args.requests,
+            "max_seconds": args.max_seconds,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main_cli()
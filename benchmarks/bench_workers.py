@@ -0,0 +1,220 @@
+"""
+Multi-worker benchmark: throughput by worker count, with no lost or torn updates.
+
+For each --workers value, starts `uvicorn main:app --workers N` on a scratch
+copy of the data directory, fills one catalog with synthetic items and then
+
+  writes  sends one update-price per item, each with a price of its own,
+          from --concurrency clients (while threads keep parsing the XML file
+          and the journal, to catch a torn write)
+  reads   sends --reads catalog GETs from --concurrency clients
+
+Afterwards every worker must serve every new price (cross-worker cache
+invalidation) and a fresh load of the files must hold them all (no lost
+updates). Throughput is reported per phase as JSON; writes are serialized by
+the catalog lock, so reads are where extra workers pay off. Run from the
+project root (requires httpx):
+
+    python benchmarks/bench_workers.py --workers 1 2 4 --items 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import httpx
+
+from bench_suite import ROOT, main, synthetic_catalog
+
+CATALOG = "thermoprosopsi"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def expected_price(i: int) -> float:
+    return round(10 + i * 0.01, 2)
+
+
+def item_keys(per_group: int):
+    return [item["key"] for items in synthetic_catalog(CATALOG, per_group).values() for item in items]
+
+
+def watch_files(store, stop: threading.Event, errors: list):
+    """Parse the catalog file and every complete journal line until stopped."""
+    while not stop.is_set():
+        try:
+            ET.parse(store.path)
+        except (ET.ParseError, FileNotFoundError) as e:
+            errors.append(repr(e))
+        try:
+            lines = store.journal.path.read_bytes().splitlines(keepends=True)
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            if line.endswith(b"\n"):
+                try:
+                    json.loads(line)
+                except ValueError as e:
+                    errors.append(repr(e))
+
+
+async def run_phase(base_url, requests, concurrency):
+    """Send `requests` (callables taking a client) from `concurrency` clients."""
+    pending = list(requests)
+    failed = []
+
+    async def worker(client):
+        while pending:
+            response = await pending.pop()(client)
+            if response.status_code != 200:
+                failed.append(response.status_code)
+
+    started = time.perf_counter()
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"requests": len(requests), "failed": len(failed), "seconds": round(elapsed, 3),
+            "rps": round(len(requests) / elapsed, 1)}
+
+
+def update(key, price):
+    return lambda client: client.post(f"/api/{CATALOG}/update-price", json={"key": key, "latest_price": price})
+
+
+def read(client):
+    return client.get(f"/api/{CATALOG}/catalog", headers={"Accept-Encoding": "gzip"})
+
+
+def wait_until_up(base_url, process, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"uvicorn exited with {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/api/{CATALOG}/catalog", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("uvicorn did not start")
+
+
+async def served_prices(base_url, requests):
+    """The catalog as served by `requests` separate connections (so by different workers)."""
+    results = []
+    for _ in range(requests):
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            data = (await client.get(f"/api/{CATALOG}/catalog")).json()
+        results.append({item["key"]: item["latest_price"] for items in data.values() for item in items})
+    return results
+
+
+def run_workers(workers, args, scratch):
+    shutil.rmtree(scratch / "data", ignore_errors=True)
+    shutil.copytree(ROOT / "data", scratch / "data", ignore=shutil.ignore_patterns("*.db*", "*.journal", "*.lock"))
+    store = main.open_store(CATALOG, args.backend)
+    store.replace(synthetic_catalog(CATALOG, args.per_group))
+    keys = item_keys(args.per_group)
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "CATALOG_BACKEND": args.backend}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", str(ROOT), "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=scratch,
+        env=env,
+    )
+    stop = threading.Event()
+    errors = []
+    try:
+        wait_until_up(base_url, process)
+        watcher = None
+        if args.backend == "xml":
+            watcher = threading.Thread(target=watch_files, args=(store, stop, errors))
+            watcher.start()
+        writes = asyncio.run(run_phase(
+            base_url, [update(key, expected_price(i)) for i, key in enumerate(keys)], args.concurrency
+        ))
+        stop.set()
+        if watcher is not None:
+            watcher.join()
+        reads = asyncio.run(run_phase(base_url, [read] * args.reads, args.concurrency))
+        served = asyncio.run(served_prices(base_url, 4 * workers))
+    finally:
+        stop.set()
+        process.terminate()
+        process.wait()
+
+    expected = {key: expected_price(i) for i, key in enumerate(keys)}
+    stale_reads = sum(1 for prices in served if any(prices.get(k) != p for k, p in expected.items()))
+    stored = {item["key"]: item["latest_price"] for items in main.open_store(CATALOG, args.backend).load().values()
+              for item in items}
+    lost = sum(1 for key, price in expected.items() if stored.get(key) != price)
+    result = {"workers": workers, "items": len(keys), "writes": writes, "reads": reads,
+              "lost_updates": lost, "torn_reads": len(errors), "stale_reads": stale_reads}
+    print(
+        f"workers={workers:<2} writes {writes['rps']:>8.1f}/s  reads {reads['rps']:>8.1f}/s  "
+        f"lost={lost} torn={len(errors)} stale={stale_reads}",
+        file=sys.stderr,
+    )
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--items", type=int, default=2000, help="price updates (one per item)")
+    parser.add_argument("--reads", type=int, default=2000, help="catalog GETs")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--backend", choices=("xml", "sqlite"), default=main.CATALOG_BACKEND)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    args.per_group = max(1, args.items // len(main.CATALOG_SPECS[CATALOG]["groups"]))
+
+    scratch = Path(tempfile.mkdtemp(prefix="tampakakis-workers-"))
+    for name in ("static", "images", "templates"):
+        (scratch / name).symlink_to(ROOT / name)
+    os.chdir(scratch)
+    try:
+        results = [run_workers(workers, args, scratch) for workers in args.workers]
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "backend": args.backend,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if any(r["lost_updates"] or r["torn_reads"] or r["stale_reads"] for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
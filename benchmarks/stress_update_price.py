@@ -0,0 +1,128 @@
+"""
+Concurrency stress test for the catalog price writers.
+
+Seeds a scratch copy of data/thermoprosopsi.xml with a few hundred extra items,
+then fires one update-price per item in parallel (worker threads calling the
+updater directly and concurrent requests through the ASGI app) while readers
+keep parsing the file. Every update carries a unique price, so at the end each
+item must hold exactly the price that was sent for it: any mismatch is a lost
+update, any parse error is a torn file.
+
+Run from the project root (requires httpx):
+
+    python benchmarks/stress_update_price.py --items 400
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402  (needs the project root as cwd for the static mounts)
+
+
+def seed_items(path: Path, count: int):
+    tree = ET.parse(path)
+    extras = tree.getroot().find("extras")
+    if extras is None:
+        extras = ET.SubElement(tree.getroot(), "extras")
+    for i in range(count):
+        it = ET.SubElement(extras, "item", {"key": f"stress_{i:05d}"})
+        ET.SubElement(it, "name").text = f"Stress {i}"
+        ET.SubElement(it, "unit").text = "unit"
+        ET.SubElement(it, "latest_price").text = "1.00"
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+def expected_price(i: int) -> float:
+    return round(10 + i * 0.01, 2)
+
+
+def run_threads(keys, workers):
+    store = main.CATALOGS["thermoprosopsi"]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda i: store.update_price(f"stress_{i:05d}", expected_price(i)), keys))
+
+
+async def run_asgi(keys):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://stress") as client:
+        responses = await asyncio.gather(*[
+            client.post(
+                "/api/thermoprosopsi/update-price",
+                json={"key": f"stress_{i:05d}", "latest_price": expected_price(i)},
+            )
+            for i in keys
+        ])
+    failed = [r for r in responses if r.status_code != 200]
+    if failed:
+        raise SystemExit(f"{len(failed)} requests failed, first: {failed[0].status_code} {failed[0].text}")
+
+
+def reader(path: Path, stop: threading.Event, errors: list):
+    while not stop.is_set():
+        try:
+            ET.parse(path)
+        except ET.ParseError as e:
+            errors.append(e)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=400, help="number of parallel updates")
+    parser.add_argument("--workers", type=int, default=32, help="thread pool size")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent reader threads")
+    args = parser.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix="tampakakis-stress-"))
+    shutil.copytree(ROOT / "data", scratch / "data")
+    os.chdir(scratch)
+    try:
+        store = main.CATALOGS["thermoprosopsi"]
+        path = store.path
+        seed_items(path, args.items)
+        store.load()
+
+        stop = threading.Event()
+        read_errors = []
+        readers = [threading.Thread(target=reader, args=(path, stop, read_errors)) for _ in range(args.readers)]
+        for t in readers:
+            t.start()
+
+        keys = list(range(args.items))
+        started = time.perf_counter()
+        threaded = threading.Thread(target=run_threads, args=(keys[::2], args.workers))
+        threaded.start()
+        asyncio.run(run_asgi(keys[1::2]))
+        threaded.join()
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        for t in readers:
+            t.join()
+
+        prices = {it["key"]: it["latest_price"] for it in store.load()["extras"]}
+        lost = [i for i in keys if prices.get(f"stress_{i:05d}") != expected_price(i)]
+        print(f"{args.items} updates in {elapsed:.2f}s ({args.items / elapsed:.0f} updates/s)")
+        print(f"lost updates: {len(lost)}, torn reads: {len(read_errors)}")
+        if lost or read_errors:
+            raise SystemExit(1)
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,19 +1,51 @@
+import asyncio
+import base64
+import codecs
+import contextlib
+import csv
+import io
+import json
+import math
+import os
 import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-import xml.etree.ElementTree as ET
+from typing import Annotated, Dict, List, Literal, Optional
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+import anyio
+from fastapi import Body, FastAPI, Query, Request, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field
+from pydantic import AwareDatetime, BaseModel, Field, model_validator
+
+from assets import AssetFiles, Pictures, fingerprint
+from metrics import Counter, Gauge, Histogram, render as render_metrics
+from price_import import PriceImport, parse_column_map
+from quotes import PIECE_UNITS, build_quote_model, compute_quote, compute_sweep, job_columns, job_inputs
+from search import SearchIndex
+from storage import CatalogStore, SqliteCatalogStore, XmlCatalogStore, build_body_entry
 
 app = FastAPI()
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
-app.mount("/images", StaticFiles(directory="images"), name="images")
+static_files = AssetFiles(directory="static", prefix="/static")
+image_files = AssetFiles(directory="images", prefix="/images")
+app.mount("/static", static_files, name="static")
+app.mount("/images", image_files, name="images")
 
 templates = Jinja2Templates(directory="templates")
+# {{ static_url('styles.css') }} -> /static/styles.<hash>.css (cached for good)
+templates.env.globals["static_url"] = static_files.url
+templates.env.globals["image_url"] = image_files.url
+# {{ picture('Plakakia.jpg', 'Πλακάκια', sizes='50vw') }} -> responsive <picture>
+templates.env.globals["picture"] = Pictures(image_files, "images/derived/manifest.json")
+# Units quote-core.js rounds up to whole pieces, as the server quotes do
+templates.env.globals["piece_units"] = " ".join(sorted(PIECE_UNITS))
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -38,234 +70,377 @@ def get_ip_address():
     s.connect(("8.8.8.8", 80))
     return s.getsockname()[0]
 
+
 # =======================
-# Thermoprosopsi catalog
+# Metrics
 # =======================
 
-DATA_FILE = Path("data/thermoprosopsi.xml")
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by method, route and status", ("method", "route", "status")
+)
+HTTP_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request duration by method and route", ("method", "route")
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being handled")
+STORAGE_IO_IN_FLIGHT = Gauge(
+    "storage_io_in_flight", "Catalog storage calls running in or waiting for the storage thread pool"
+)
+PRICE_EVENT_SUBSCRIBERS = Gauge(
+    "price_event_subscribers", "Open /api/<catalog>/events streams", ("catalog",)
+)
+
+
+class MetricsMiddleware:
+    """
+    Records count, duration and in-flight requests per route template (e.g.
+    /api/{catalog}/catalog), so label values stay bounded whatever the URL.
+    """
 
+    def __init__(self, app):
+        self.app = app
 
-def ensure_data_file():
-    if not DATA_FILE.exists():
-        DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-        # Minimal default structure if missing
-        DATA_FILE.write_text(
-            """<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<catalog><areas/><linear/><workers/><extras/></catalog>\n""",
-            encoding="utf-8",
-        )
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500
+        started = time.perf_counter()
 
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
 
-def load_catalog():
-    ensure_data_file()
-    tree = ET.parse(DATA_FILE)
-    root = tree.getroot()
-
-    # Migration: ensure <extras> exists with default items
-    extras_el = root.find("extras")
-    changed = False
-    if extras_el is None:
-        extras_el = ET.SubElement(root, "extras")
-        changed = True
-    # Seed default extras if missing
-    defaults = [
-        {"key": "extra_kados", "name": "Κάδος", "unit": "unit", "latest_price": 120.00},
-        {"key": "extra_fatoura", "name": "Φατούρα", "unit": "m2", "latest_price": 0.00},
-    ]
-    existing_keys = {it.get("key") for it in extras_el.findall("item")}
-    for d in defaults:
-        if d["key"] not in existing_keys:
-            it = ET.SubElement(extras_el, "item", {"key": d["key"]})
-            ET.SubElement(it, "name").text = d["name"]
-            ET.SubElement(it, "unit").text = d["unit"]
-            ET.SubElement(it, "latest_price").text = f"{d['latest_price']:.2f}"
-            changed = True
-    if changed:
-        tree.write(DATA_FILE, encoding="utf-8", xml_declaration=True)
-
-    def parse_group(tag):
-        group_el = root.find(tag)
-        items = []
-        if group_el is not None:
-            for it in group_el.findall("item"):
-                key = it.get("key")
-                name = (it.findtext("name") or "").strip()
-                unit = (it.findtext("unit") or "").strip()
-                latest_price = float(it.findtext("latest_price") or 0)
-                consumption = it.findtext("consumption")
-                items.append(
-                    {
-                        "key": key,
-                        "name": name,
-                        "unit": unit,
-                        "latest_price": latest_price,
-                        **({"consumption": consumption} if consumption else {}),
-                    }
-                )
-        return items
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            if route is not None:
+                template = route.path
+            elif "endpoint" in scope:
+                template = scope.get("root_path") or "mount"  # a mount such as /static
+            else:
+                template = "unmatched"
+            HTTP_SECONDS.observe(time.perf_counter() - started, scope["method"], template)
+            HTTP_REQUESTS.inc(scope["method"], template, str(status))
 
-    return {
-        "areas": parse_group("areas"),
-        "linear": parse_group("linear"),
-        "workers": parse_group("workers"),
-        "extras": parse_group("extras"),
-    }
 
+app.add_middleware(MetricsMiddleware)
 
-def update_price_in_xml(key: str, new_price: float):
-    ensure_data_file()
-    tree = ET.parse(DATA_FILE)
-    root = tree.getroot()
 
-    found_el = None
-    for group in ("areas", "linear", "workers", "extras"):
-        grp = root.find(group)
-        if grp is None:
-            continue
-        for it in grp.findall("item"):
-            if it.get("key") == key:
-                found_el = it
-                break
-        if found_el is not None:
-            break
-
-    if found_el is None:
-        raise KeyError(f"Item with key '{key}' not found")
-
-    lp = found_el.find("latest_price")
-    if lp is None:
-        lp = ET.SubElement(found_el, "latest_price")
-    lp.text = f"{new_price:.2f}"
-
-    tree.write(DATA_FILE, encoding="utf-8", xml_declaration=True)
-
-    # Return updated snapshot
-    name = (found_el.findtext("name") or "").strip()
-    unit = (found_el.findtext("unit") or "").strip()
-    consumption = found_el.findtext("consumption")
-    return {
-        "key": key,
-        "name": name,
-        "unit": unit,
-        "latest_price": float(lp.text or 0),
-        **({"consumption": consumption} if consumption else {}),
-    }
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    # FastAPI's 422, except that a rejected inf/nan input (1e309 in the JSON) is
+    # echoed back as text; as a float it would fail to encode and turn into a 500
+    finite = {float: lambda x: x if math.isfinite(x) else str(x)}
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(exc.errors(), custom_encoder=finite)})
+
+
+@app.get("/metrics")
+async def metrics():
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 # =======================
-# Plakakia catalog
+# Storage I/O
 # =======================
 
-PLAKAKIA_DATA_FILE = Path("data/plakakia.xml")
+# Catalog parsing and writing is blocking file I/O. It runs in worker threads so
+# a slow disk never stalls the event loop (pages, static files), and at most this
+# many storage calls run at once; the rest wait for a free slot.
+STORAGE_IO_CONCURRENCY = 8
+_storage_io_limiter = anyio.CapacityLimiter(STORAGE_IO_CONCURRENCY)
 
 
-def ensure_plakakia_data_file():
-    if not PLAKAKIA_DATA_FILE.exists():
-        PLAKAKIA_DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-        PLAKAKIA_DATA_FILE.write_text(
-            """<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<catalog><areas/><volumes/><workers/><extras/></catalog>\n""",
-            encoding="utf-8",
-        )
+async def run_storage_io(fn, *args):
+    """Run a blocking catalog storage call in the bounded storage thread pool."""
+    with STORAGE_IO_IN_FLIGHT.track():
+        return await anyio.to_thread.run_sync(fn, *args, limiter=_storage_io_limiter)
 
 
-def load_plakakia_catalog():
-    ensure_plakakia_data_file()
-    tree = ET.parse(PLAKAKIA_DATA_FILE)
-    root = tree.getroot()
-
-    # Migration: ensure <extras> with defaults
-    extras_el = root.find("extras")
-    changed = False
-    if extras_el is None:
-        extras_el = ET.SubElement(root, "extras")
-        changed = True
-    defaults = [
-        {"key": "extra_kados", "name": "Κάδος", "unit": "unit", "latest_price": 120.00},
-        {"key": "extra_fatoura", "name": "Φατούρα", "unit": "m2", "latest_price": 0.00},
-    ]
-    existing_keys = {it.get("key") for it in extras_el.findall("item")}
-    for d in defaults:
-        if d["key"] not in existing_keys:
-            it = ET.SubElement(extras_el, "item", {"key": d["key"]})
-            ET.SubElement(it, "name").text = d["name"]
-            ET.SubElement(it, "unit").text = d["unit"]
-            ET.SubElement(it, "latest_price").text = f"{d['latest_price']:.2f}"
-            changed = True
-    if changed:
-        tree.write(PLAKAKIA_DATA_FILE, encoding="utf-8", xml_declaration=True)
-
-    def parse_group(tag):
-        group_el = root.find(tag)
-        items = []
-        if group_el is not None:
-            for it in group_el.findall("item"):
-                key = it.get("key")
-                name = (it.findtext("name") or "").strip()
-                unit = (it.findtext("unit") or "").strip()
-                latest_price = float(it.findtext("latest_price") or 0)
-                consumption = it.findtext("consumption")
-                items.append(
-                    {
-                        "key": key,
-                        "name": name,
-                        "unit": unit,
-                        "latest_price": latest_price,
-                        **({"consumption": consumption} if consumption else {}),
-                    }
-                )
-        return items
+# =======================
+# HTTP caching
+# =======================
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against a strong ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        # Accept the encoding-specific variant we hand out for gzip bodies
+        if candidate.strip('"') in (opaque, opaque + "-gzip"):
+            return True
+    return False
+
+
+def not_modified_since(if_modified_since: str, mtime: int) -> bool:
+    try:
+        return int(parsedate_to_datetime(if_modified_since).timestamp()) >= mtime
+    except (TypeError, ValueError):
+        return False
+
 
-    return {
-        "areas": parse_group("areas"),
-        "volumes": parse_group("volumes"),
-        "workers": parse_group("workers"),
-        "extras": parse_group("extras"),
+def conditional_response(request: Request, entry, media_type="application/json"):
+    """
+    Serve a pre-serialized entry honouring If-None-Match / If-Modified-Since and
+    Accept-Encoding. Clients must revalidate, which is a cheap 304 when unchanged.
+    """
+    headers = {
+        "Cache-Control": "no-cache",
+        "Last-Modified": entry["last_modified"],
+        "Vary": "Accept-Encoding",
     }
+    if "version" in entry:
+        headers["X-Catalog-Version"] = str(entry["version"])
+    use_gzip = entry["gzip"] is not None and "gzip" in request.headers.get("accept-encoding", "")
+    headers["ETag"] = entry["etag"][:-1] + '-gzip"' if use_gzip else entry["etag"]
 
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag_matches(if_none_match, entry["etag"]):
+            return Response(status_code=304, headers=headers)
+    elif not_modified_since(request.headers.get("if-modified-since", ""), entry["mtime"]):
+        return Response(status_code=304, headers=headers)
 
-def update_plakakia_price_in_xml(key: str, new_price: float):
-    ensure_plakakia_data_file()
-    tree = ET.parse(PLAKAKIA_DATA_FILE)
-    root = tree.getroot()
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry["gzip"], media_type=media_type, headers=headers)
+    return Response(content=entry["body"], media_type=media_type, headers=headers)
 
-    found_el = None
-    for group in ("areas", "volumes", "workers", "extras"):
-        grp = root.find(group)
-        if grp is None:
-            continue
-        for it in grp.findall("item"):
-            if it.get("key") == key:
-                found_el = it
-                break
-        if found_el is not None:
-            break
-
-    if found_el is None:
-        raise KeyError(f"Item with key '{key}' not found")
-
-    lp = found_el.find("latest_price")
-    if lp is None:
-        lp = ET.SubElement(found_el, "latest_price")
-    lp.text = f"{new_price:.2f}"
-
-    tree.write(PLAKAKIA_DATA_FILE, encoding="utf-8", xml_declaration=True)
-
-    name = (found_el.findtext("name") or "").strip()
-    unit = (found_el.findtext("unit") or "").strip()
-    consumption = found_el.findtext("consumption")
-    return {
-        "key": key,
-        "name": name,
-        "unit": unit,
-        "latest_price": float(lp.text or 0),
-        **({"consumption": consumption} if consumption else {}),
-    }
 
+# =======================
+# Catalogs
+# =======================
 
-class UpdatePricePayload(BaseModel):
-    key: str = Field(..., description="Unique key of the catalog item")
-    latest_price: float = Field(..., gt=0, description="New price to persist")
+# Extras (Επιπρόσθετα) seeded into every trade catalog
+DEFAULT_EXTRAS = [
+    {"key": "extra_kados", "name": "Κάδος", "unit": "unit", "latest_price": 120.00},
+    {"key": "extra_fatoura", "name": "Φατούρα", "unit": "m2", "latest_price": 0.00},
+]
+
+# Where the catalogs live: "xml" (one data/<name>.xml file each, the default)
+# or "sqlite" (one database for all; fill it with tools/catalog_db.py import)
+CATALOG_BACKEND = os.environ.get("CATALOG_BACKEND", "xml")
+CATALOG_DB = os.environ.get("CATALOG_DB", "data/catalogs.db")
+
+# One entry per trade page: /api/<name>/... is served from catalog <name>
+CATALOG_SPECS = {
+    "thermoprosopsi": {
+        "groups": ("areas", "linear", "workers", "extras"),
+        "defaults": {"extras": DEFAULT_EXTRAS},
+    },
+    "plakakia": {
+        "groups": ("areas", "volumes", "workers", "extras"),
+        "defaults": {"extras": DEFAULT_EXTRAS},
+    },
+    "gypsosanida": {
+        "groups": ("areas", "linear", "pieces", "workers", "extras"),
+        "defaults": {"extras": DEFAULT_EXTRAS},
+    },
+    "elaioxromatismoi": {
+        "groups": ("workers", "extras"),
+        "defaults": {
+            # Seed default workers if file created empty (safety)
+            "workers": [
+                {"key": "technitis", "name": "Τεχνίτης", "unit": "day", "latest_price": 80.00},
+                {"key": "voithos", "name": "Βοηθός Τεχνίτη", "unit": "day", "latest_price": 60.00},
+            ],
+            "extras": [
+                {"key": "extra_kouvas", "name": "Κουβάς", "unit": "unit", "latest_price": 55.00},
+                {"key": "extra_astari", "name": "Αστάρι", "unit": "unit", "latest_price": 50.00},
+                {"key": "extra_stokos", "name": "Στόκος", "unit": "unit", "latest_price": 15.00},
+                *DEFAULT_EXTRAS,
+            ],
+        },
+    },
+}
+
+
+def open_store(name: str, backend: str = CATALOG_BACKEND) -> CatalogStore:
+    spec = CATALOG_SPECS[name]
+    if backend == "xml":
+        return XmlCatalogStore(name, f"data/{name}.xml", **spec)
+    if backend == "sqlite":
+        return SqliteCatalogStore(name, CATALOG_DB, **spec)
+    raise ValueError(f"Unknown catalog backend '{backend}'")
+
+
+CATALOGS = {name: open_store(name) for name in CATALOG_SPECS}
+
+
+def get_store(catalog: str) -> CatalogStore:
+    store = CATALOGS.get(catalog)
+    if store is None:
+        raise HTTPException(status_code=404, detail=f"Unknown catalog '{catalog}'")
+    return store
 
 
+# =======================
+# Price events
+# =======================
+
+# Announcements kept for subscribers that fall behind
+PRICE_EVENTS_BUFFER = 1024
+# Seconds between the comments sent to idle subscribers so proxies keep them open
+PRICE_EVENTS_KEEPALIVE = 15
+# Seconds between checks for prices saved by other worker processes
+PRICE_EVENTS_POLL = 1.0
+
+
+class PriceEvents:
+    """
+    Fan-out of one catalog's price changes to its Server-Sent Events subscribers.
+
+    While anyone is subscribed, a watcher task asks the catalog for its changes
+    since the version last announced: right away when this process saved prices
+    (see `poke`), and every PRICE_EVENTS_POLL seconds for prices saved by other
+    workers. Each announcement is encoded once, with the catalog version as its
+    event id, into a bounded buffer. Subscribers have no queues of their own:
+    they all wait on one event, replaced on every publish, then send what they
+    have not seen from the buffer. An idle subscriber is a single pending wait,
+    and a slow one holds nothing up.
+    """
+
+    def __init__(self, name, size=PRICE_EVENTS_BUFFER):
+        self.name = name
+        self.buffer = deque(maxlen=size)
+        # Announced up to `version`; the buffer has everything after `floor`
+        self.version = None
+        self.floor = None
+        # Times the catalog went back to an older version (a restored database)
+        self.resets = 0
+        self.subscribers = 0
+        self._published = None
+        self._poked = None
+        self._watcher = None
+        self._refresh_lock = None
+
+    @staticmethod
+    def encode(version, items) -> bytes:
+        if items is None:
+            return f"id: {version}\nevent: resync\ndata: {{}}\n\n".encode("ascii")
+        changes = [{"key": item["key"], "latest_price": item["latest_price"]} for item in items]
+        return f"id: {version}\ndata: {json.dumps(changes, ensure_ascii=False)}\n\n".encode("utf-8")
+
+    def poke(self):
+        """Prices were saved by this process: announce them without waiting for the next poll."""
+        if self._poked is not None:
+            self._poked.set()
+
+    async def refresh(self):
+        """Announce whatever the catalog changed since the last announcement."""
+        if self._refresh_lock is None:
+            self._refresh_lock = anyio.Lock()
+        async with self._refresh_lock:
+            store = get_store(self.name)
+            version, items = await run_storage_io(
+                store.changes_since, -1 if self.version is None else self.version
+            )
+            if self.version is None or version < self.version:
+                if self.version is not None:
+                    self.resets += 1
+                self.buffer.clear()
+                self.version = self.floor = version
+                self._wake()
+            elif version > self.version:
+                if len(self.buffer) == self.buffer.maxlen:
+                    self.floor = self.buffer[0][0]
+                self.buffer.append((version, self.encode(version, items)))
+                self.version = version
+                self._wake()
+
+    def since(self, seen: int):
+        """Buffered messages after version `seen`, or None if the buffer no longer reaches back."""
+        if seen >= self.version:
+            return []
+        if seen < self.floor:
+            return None
+        return [message for version, message in self.buffer if version > seen]
+
+    def _wake(self):
+        if self._published is not None:
+            self._published.set()
+            self._published = None
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for the next announcement; False on timeout."""
+        if self._published is None:
+            self._published = anyio.Event()
+        published = self._published
+        with anyio.move_on_after(timeout):
+            await published.wait()
+        return published.is_set()
+
+    async def _watch(self):
+        try:
+            while self.subscribers:
+                # Replaced before refreshing, so a poke during the refresh is not lost
+                poked = self._poked = anyio.Event()
+                with contextlib.suppress(Exception):
+                    await self.refresh()
+                with anyio.move_on_after(PRICE_EVENTS_POLL):
+                    await poked.wait()
+        finally:
+            self._watcher = self._poked = None
+
+    async def catch_up(self, seen: int):
+        """Straight from the catalog: (version, message) for the changes after `seen`."""
+        version, items = await run_storage_io(get_store(self.name).changes_since, seen)
+        return version, self.encode(version, items) if items is None or items else b""
+
+    async def stream(self, last_event_id: Optional[int] = None):
+        """
+        The event stream of one subscriber. On a reconnect (to this worker or
+        another) the changes since the Last-Event-ID version are sent first;
+        when the catalog no longer knows them a "resync" event tells the client
+        to reload the catalog instead.
+        """
+        with PRICE_EVENT_SUBSCRIBERS.track(self.name):
+            self.subscribers += 1
+            try:
+                if self._watcher is None:
+                    self._watcher = asyncio.get_running_loop().create_task(self._watch())
+                if self.version is None:
+                    await self.refresh()
+                yield b"retry: 3000\n\n"
+                seen, resets = self.version, self.resets
+                if last_event_id is not None and last_event_id != seen:
+                    seen, message = await self.catch_up(last_event_id)
+                    if message:
+                        yield message
+                while True:
+                    if resets != self.resets:
+                        seen, resets = self.version, self.resets
+                        yield self.encode(seen, None)
+                        continue
+                    messages = self.since(seen)
+                    if messages is None:
+                        # Fell behind the buffer
+                        seen, message = await self.catch_up(seen)
+                        if message:
+                            yield message
+                    elif messages:
+                        seen = self.version
+                        yield b"".join(messages)
+                    elif not await self.wait(PRICE_EVENTS_KEEPALIVE):
+                        yield b": keepalive\n\n"
+            finally:
+                self.subscribers -= 1
+
+
+PRICE_EVENTS = {name: PriceEvents(name) for name in CATALOG_SPECS}
+
+
+# =======================
+# Pages
+# =======================
+
 @app.get("/thermoprosopsi", response_class=HTMLResponse)
 async def thermoprosopsi_page(request: Request):
     return templates.TemplateResponse(
@@ -274,158 +449,263 @@ async def thermoprosopsi_page(request: Request):
     )
 
 
-@app.get("/api/thermoprosopsi/catalog")
-async def thermoprosopsi_catalog():
+@app.get("/plakakia", response_class=HTMLResponse)
+async def plakakia_page(request: Request):
+    return templates.TemplateResponse(
+        "plakakia.html",
+        {"request": request},
+    )
+
+
+@app.get("/gypsosanida", response_class=HTMLResponse)
+async def gypsosanida_page(request: Request):
+    return templates.TemplateResponse(
+        "gypsosanida.html",
+        {"request": request},
+    )
+
+
+@app.get("/elaioxromatismoi", response_class=HTMLResponse)
+async def elaioxromatismoi_page(request: Request):
+    return templates.TemplateResponse(
+        "elaioxromatismoi.html",
+        {"request": request},
+    )
+
+
+# =======================
+# Offline use
+# =======================
+
+# Pages the service worker keeps for use without a network (see templates/sw.js)
+OFFLINE_PAGES = ("/", "/thermoprosopsi", "/plakakia", "/gypsosanida", "/elaioxromatismoi")
+APP_ICONS = {"192x192": "derived/icon-192.png", "512x512": "derived/icon-512.png"}
+
+
+def offline_precache():
+    """URLs the service worker caches on install: the pages, every static asset and the app icons."""
+    urls = [*OFFLINE_PAGES, "/manifest.webmanifest"]
+    urls += [static_files.url(path) for path in static_files.manifest]
+    urls += [image_files.url(path) for path in APP_ICONS.values()]
+    return urls
+
+
+def offline_version(urls):
+    """Changes with any asset (their URLs carry hashes) or template: a new service worker."""
+    data = "\n".join(urls).encode("utf-8")
+    for path in sorted(Path("templates").glob("*")):
+        data += path.read_bytes()
+    return fingerprint(data)
+
+
+OFFLINE_PRECACHE = offline_precache()
+OFFLINE_VERSION = offline_version(OFFLINE_PRECACHE)
+
+
+@app.get("/sw.js")
+async def service_worker(request: Request):
+    # Served from the root so that it controls every page, and revalidated on
+    # every visit so that a deploy reaches the browsers on their next load
+    return templates.TemplateResponse(
+        "sw.js",
+        {"request": request, "version": OFFLINE_VERSION, "pages": OFFLINE_PAGES, "precache": OFFLINE_PRECACHE},
+        media_type="text/javascript",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.get("/manifest.webmanifest")
+async def web_app_manifest():
+    return JSONResponse(
+        {
+            "name": "Ταμπακάκης — Υπολογισμός Υλικών & Κόστους",
+            "short_name": "Ταμπακάκης",
+            "lang": "el",
+            "start_url": "/",
+            "scope": "/",
+            "display": "standalone",
+            "background_color": "#ffffff",
+            "theme_color": "#e6bb0d",
+            "icons": [
+                {"src": image_files.url(path), "sizes": sizes, "type": "image/png", "purpose": "any"}
+                for sizes, path in APP_ICONS.items()
+            ],
+        },
+        media_type="application/manifest+json",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+# =======================
+# Catalog API
+# =======================
+
+class UpdatePricePayload(BaseModel):
+    key: str = Field(..., description="Unique key of the catalog item")
+    latest_price: float = Field(..., gt=0, description="New price to persist")
+
+
+# Body of the update-prices endpoints: a non-empty list of single-item payloads
+UpdatePricesPayload = Annotated[List[UpdatePricePayload], Body(min_length=1)]
+
+
+@app.get("/api/{catalog}/catalog")
+async def catalog_data(catalog: str, request: Request):
+    store = get_store(catalog)
     try:
-        data = load_catalog()
-        return JSONResponse(data)
+        entry = await run_storage_io(store.entry)
+        return conditional_response(request, entry)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/thermoprosopsi/update-price")
-async def thermoprosopsi_update_price(payload: UpdatePricePayload):
+@app.get("/api/{catalog}/changes")
+async def catalog_changes(catalog: str, since: int):
+    """
+    Items added or changed after catalog version `since` (see the X-Catalog-Version
+    header of /catalog), with the current version to ask from next time. When
+    `since` is older than the change buffer the answer is {"resync": true}: fetch
+    the whole catalog again.
+    """
+    store = get_store(catalog)
     try:
-        updated = update_price_in_xml(payload.key, payload.latest_price)
-        return JSONResponse({"status": "ok", "item": updated})
-    except KeyError as ke:
-        raise HTTPException(status_code=404, detail=str(ke))
+        version, items = await run_storage_io(store.changes_since, since)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if items is None:
+        return JSONResponse({"version": version, "resync": True})
+    return JSONResponse({"version": version, "items": items})
 
 
-# =======================
-# Gypsosanida catalog
-# =======================
+# Largest page of /api/<catalog>/items
+ITEMS_PAGE_MAX = 1000
 
-GYPSO_DATA_FILE = Path("data/gypsosanida.xml")
 
-
-def ensure_gypsosanida_data_file():
-    if not GYPSO_DATA_FILE.exists():
-        GYPSO_DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-        GYPSO_DATA_FILE.write_text(
-            """<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<catalog><areas/><linear/><pieces/><workers/><extras/></catalog>\n""",
-            encoding="utf-8",
-        )
+def encode_cursor(group: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{group}:{offset}".encode("utf-8")).decode("ascii").rstrip("=")
 
 
-def load_gypsosanida_catalog():
-    ensure_gypsosanida_data_file()
-    tree = ET.parse(GYPSO_DATA_FILE)
-    root = tree.getroot()
-
-    # Migration: ensure <extras> with defaults
-    extras_el = root.find("extras")
-    changed = False
-    if extras_el is None:
-        extras_el = ET.SubElement(root, "extras")
-        changed = True
-    defaults = [
-        {"key": "extra_kados", "name": "Κάδος", "unit": "unit", "latest_price": 120.00},
-        {"key": "extra_fatoura", "name": "Φατούρα", "unit": "m2", "latest_price": 0.00},
-    ]
-    existing_keys = {it.get("key") for it in extras_el.findall("item")}
-    for d in defaults:
-        if d["key"] not in existing_keys:
-            it = ET.SubElement(extras_el, "item", {"key": d["key"]})
-            ET.SubElement(it, "name").text = d["name"]
-            ET.SubElement(it, "unit").text = d["unit"]
-            ET.SubElement(it, "latest_price").text = f"{d['latest_price']:.2f}"
-            changed = True
-    if changed:
-        tree.write(GYPSO_DATA_FILE, encoding="utf-8", xml_declaration=True)
-
-    def parse_group(tag):
-        group_el = root.find(tag)
-        items = []
-        if group_el is not None:
-            for it in group_el.findall("item"):
-                key = it.get("key")
-                name = (it.findtext("name") or "").strip()
-                unit = (it.findtext("unit") or "").strip()
-                latest_price = float(it.findtext("latest_price") or 0)
-                consumption = it.findtext("consumption")
-                items.append(
-                    {
-                        "key": key,
-                        "name": name,
-                        "unit": unit,
-                        "latest_price": latest_price,
-                        **({"consumption": consumption} if consumption else {}),
-                    }
-                )
-        return items
-
-    return {
-        "areas": parse_group("areas"),
-        "linear": parse_group("linear"),
-        "pieces": parse_group("pieces"),
-        "workers": parse_group("workers"),
-        "extras": parse_group("extras"),
+def decode_cursor(cursor: str, group: str) -> int:
+    """The offset a cursor of `group` points at; ValueError if it is not one."""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        cursor_group, _, offset = text.rpartition(":")
+        offset = int(offset)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor") from None
+    if cursor_group != group or offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+
+# Serialized pages of /api/<catalog>/items by (catalog, version, group, offset, limit).
+# A new version makes the older pages unreachable, so the oldest are dropped first.
+ITEMS_PAGE_CACHE_SIZE = 256
+_page_entries = {}
+_page_entries_lock = threading.Lock()
+
+
+def items_page_entry(store, group: str, offset: int, limit: int):
+    """One page of a group's items as a cache entry for conditional_response."""
+    version, total, items = store.items_page(group, offset, limit)
+    key = (store.name, version, group, offset, limit)
+    with _page_entries_lock:
+        cached = _page_entries.get(key)
+    if cached is not None:
+        return cached
+    end = offset + len(items)
+    page = {
+        "group": group,
+        "version": version,
+        "offset": offset,
+        "total": total,
+        "items": items,
+        "next_cursor": encode_cursor(group, end) if end < total else None,
     }
+    body = json.dumps(page, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    entry = build_body_entry(body, time.time(), etag_source=" ".join(map(str, key)).encode("utf-8"))
+    entry["version"] = version
+    with _page_entries_lock:
+        while len(_page_entries) >= ITEMS_PAGE_CACHE_SIZE:
+            del _page_entries[next(iter(_page_entries))]
+        _page_entries[key] = entry
+    return entry
+
+
+@app.get("/api/{catalog}/items")
+async def catalog_items(
+    request: Request,
+    catalog: str,
+    group: str,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=ITEMS_PAGE_MAX)] = 100,
+    cursor: Optional[str] = None,
+):
+    """
+    One page of a group's items, for catalogs too big to fetch whole: ?group=areas
+    with offset/limit, or the `next_cursor` of the previous page (null after the
+    last). `version` is the catalog version the page was read at (see /changes).
+    """
+    store = get_store(catalog)
+    if group not in store.groups:
+        raise HTTPException(status_code=404, detail=f"Unknown group '{group}'")
+    if cursor is not None:
+        try:
+            offset = decode_cursor(cursor, group)
+        except ValueError as ve:
+            raise HTTPException(status_code=422, detail=str(ve))
+    try:
+        entry = await run_storage_io(items_page_entry, store, group, offset, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return conditional_response(request, entry)
 
 
-def update_gypsosanida_price_in_xml(key: str, new_price: float):
-    ensure_gypsosanida_data_file()
-    tree = ET.parse(GYPSO_DATA_FILE)
-    root = tree.getroot()
-
-    found_el = None
-    for group in ("areas", "linear", "pieces", "workers", "extras"):
-        grp = root.find(group)
-        if grp is None:
-            continue
-        for it in grp.findall("item"):
-            if it.get("key") == key:
-                found_el = it
-                break
-        if found_el is not None:
-            break
-
-    if found_el is None:
-        raise KeyError(f"Item with key '{key}' not found")
-
-    lp = found_el.find("latest_price")
-    if lp is None:
-        lp = ET.SubElement(found_el, "latest_price")
-    lp.text = f"{new_price:.2f}"
-
-    tree.write(GYPSO_DATA_FILE, encoding="utf-8", xml_declaration=True)
-
-    name = (found_el.findtext("name") or "").strip()
-    unit = (found_el.findtext("unit") or "").strip()
-    consumption = found_el.findtext("consumption")
-    return {
-        "key": key,
-        "name": name,
-        "unit": unit,
-        "latest_price": float(lp.text or 0),
-        **({"consumption": consumption} if consumption else {}),
-    }
+# Combined payloads of /api/catalogs by catalog names, with the member ETags they were built from
+_combined_entries = {}
 
 
-@app.get("/gypsosanida", response_class=HTMLResponse)
-async def gypsosanida_page(request: Request):
-    return templates.TemplateResponse(
-        "gypsosanida.html",
-        {"request": request},
+def combined_catalogs_entry(names):
+    """
+    One cache entry holding several catalogs as {name: catalog}. The body is
+    spliced together from the catalogs' own pre-serialized bodies and rebuilt
+    only when one of them changes; its ETag derives from theirs.
+    """
+    members = [CATALOGS[name].entry() for name in names]
+    etags = tuple(member["etag"] for member in members)
+    cached = _combined_entries.get(names)
+    if cached is not None and cached["members"] == etags:
+        return cached
+    parts = [json.dumps(name).encode("utf-8") + b":" + member["body"] for name, member in zip(names, members)]
+    entry = build_body_entry(
+        b"{" + b",".join(parts) + b"}",
+        max(member["mtime"] for member in members),
+        etag_source=" ".join((*names, *etags)).encode("utf-8"),
     )
+    entry["members"] = etags
+    _combined_entries[names] = entry
+    return entry
 
 
-@app.get("/api/gypsosanida/catalog")
-async def gypsosanida_catalog():
+@app.get("/api/catalogs")
+async def catalogs_data(request: Request, names: Optional[str] = None):
+    """Several catalogs in one response: all of them, or ?names=plakakia,gypsosanida."""
+    wanted = {name.strip() for name in (names or "").split(",") if name.strip()} or set(CATALOGS)
+    for name in wanted:
+        get_store(name)
     try:
-        data = load_gypsosanida_catalog()
-        return JSONResponse(data)
+        entry = await run_storage_io(combined_catalogs_entry, tuple(n for n in CATALOGS if n in wanted))
+        return conditional_response(request, entry)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/gypsosanida/update-price")
-async def gypsosanida_update_price(payload: UpdatePricePayload):
+@app.post("/api/{catalog}/update-price")
+async def catalog_update_price(catalog: str, payload: UpdatePricePayload):
+    store = get_store(catalog)
     try:
-        updated = update_gypsosanida_price_in_xml(payload.key, payload.latest_price)
+        updated = await run_storage_io(store.update_price, payload.key, payload.latest_price)
+        PRICE_EVENTS[catalog].poke()
         return JSONResponse({"status": "ok", "item": updated})
     except KeyError as ke:
         raise HTTPException(status_code=404, detail=str(ke))
@@ -433,183 +713,438 @@ async def gypsosanida_update_price(payload: UpdatePricePayload):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/plakakia", response_class=HTMLResponse)
-async def plakakia_page(request: Request):
-    return templates.TemplateResponse(
-        "plakakia.html",
-        {"request": request},
+@app.post("/api/{catalog}/update-prices")
+async def catalog_update_prices(catalog: str, payload: UpdatePricesPayload):
+    store = get_store(catalog)
+    try:
+        updates = [(p.key, p.latest_price) for p in payload]
+        updated = await run_storage_io(store.update_prices, updates)
+        PRICE_EVENTS[catalog].poke()
+        return JSONResponse({"status": "ok", "items": updated})
+    except KeyError as ke:
+        raise HTTPException(status_code=404, detail=str(ke))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/{catalog}/events")
+async def catalog_events(catalog: str, request: Request):
+    """
+    Server-Sent Events stream of the catalog's saved price changes, data
+    [{"key": ..., "latest_price": ...}, ...] with the catalog version as event id.
+    """
+    get_store(catalog)
+    try:
+        last_event_id = int(request.headers["last-event-id"])
+    except (KeyError, ValueError):
+        last_event_id = None
+    return StreamingResponse(
+        PRICE_EVENTS[catalog].stream(last_event_id),
+        media_type="text/event-stream",
+        # No caching, and no buffering by a reverse proxy (nginx)
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
-@app.get("/api/plakakia/catalog")
-async def plakakia_catalog():
+# =======================
+# Search
+# =======================
+
+SEARCH_INDEXES = {name: SearchIndex(store) for name, store in CATALOGS.items()}
+
+
+def search_catalogs(q: str, limit: int):
+    results = []
+    for name, index in SEARCH_INDEXES.items():
+        index.refresh()
+        results.extend((rank, name, group, item) for rank, group, item in index.search(q, limit))
+    # Stable: name matches first, then catalog order
+    results.sort(key=lambda r: r[0])
+    return [{"catalog": name, "group": group, **item} for _, name, group, item in results[:limit]]
+
+
+@app.get("/api/search")
+async def search(q: str, limit: Annotated[int, Query(ge=1, le=100)] = 20):
+    """
+    Typeahead search over the item names and keys of every catalog (see
+    search.py): each word of `q` is a prefix, accents and case do not matter.
+    Items come with their catalog, group and current price.
+    """
     try:
-        data = load_plakakia_catalog()
-        return JSONResponse(data)
+        items = await run_storage_io(search_catalogs, q, limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return JSONResponse({"q": q, "items": items})
 
 
-@app.post("/api/plakakia/update-price")
-async def plakakia_update_price(payload: UpdatePricePayload):
+# =======================
+# Price history
+# =======================
+
+def timestamp_iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+
+@app.get("/api/{catalog}/history")
+async def catalog_history(catalog: str, at: AwareDatetime):
+    """
+    The catalog with the prices it had at `at`: ISO 8601 with a UTC offset (or
+    Z), or epoch seconds. A timestamp without an offset is rejected with 422
+    rather than read in the server's time zone.
+    """
+    store = get_store(catalog)
     try:
-        updated = update_plakakia_price_in_xml(payload.key, payload.latest_price)
-        return JSONResponse({"status": "ok", "item": updated})
+        return JSONResponse(await run_storage_io(store.load_at, at.timestamp()))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/{catalog}/history/{key}")
+async def catalog_item_history(catalog: str, key: str):
+    """Every recorded price change of one item, oldest first."""
+    store = get_store(catalog)
+    try:
+        item, changes = await run_storage_io(store.price_history, key)
+        return JSONResponse(
+            {
+                "item": item,
+                "history": [
+                    {"at": timestamp_iso(ts), "ts": ts, "price": price, "prev": prev}
+                    for ts, price, prev in changes
+                ],
+            }
+        )
     except KeyError as ke:
         raise HTTPException(status_code=404, detail=str(ke))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-
 # =======================
-# Elaioxromatismoi page (client-side only)
+# Quotes
 # =======================
 
-ELAIO_DATA_FILE = Path("data/elaioxromatismoi.xml")
+# Quantities, days, prices and the markup: finite and >= 0, as /sweep checks its axes
+Amount = Annotated[float, Field(ge=0, allow_inf_nan=False)]
 
 
-def ensure_elaioxromatismoi_data_file():
-    if not ELAIO_DATA_FILE.exists():
-        ELAIO_DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-        ELAIO_DATA_FILE.write_text(
-            """<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<catalog><workers/><extras/></catalog>\n""",
-            encoding="utf-8",
-        )
+class QuoteExtra(BaseModel):
+    key: Optional[str] = Field(None, description="Catalog item key, to price the extra from the catalog")
+    name: str = ""
+    unit: str = "unit"
+    qty: Amount = Field(0, description="Quantity, used when the unit has no automatic source")
+    price: Optional[Amount] = Field(None, description="Unit price; defaults to the catalog price")
+    auto: Optional[bool] = Field(None, description="Take the quantity from m2/lm/m3/worker days")
 
 
-def load_elaioxromatismoi_catalog():
-    ensure_elaioxromatismoi_data_file()
-    tree = ET.parse(ELAIO_DATA_FILE)
-    root = tree.getroot()
-
-    # Migration: ensure <extras> with defaults
-    changed = False
-    workers_el = root.find("workers")
-    if workers_el is None:
-        workers_el = ET.SubElement(root, "workers")
-        changed = True
-    extras_el = root.find("extras")
-    if extras_el is None:
-        extras_el = ET.SubElement(root, "extras")
-        changed = True
-
-    # Seed default extras if missing
-    extras_defaults = [
-        {"key": "extra_kouvas", "name": "Κουβάς", "unit": "unit", "latest_price": 55.00},
-        {"key": "extra_astari", "name": "Αστάρι", "unit": "unit", "latest_price": 50.00},
-        {"key": "extra_stokos", "name": "Στόκος", "unit": "unit", "latest_price": 15.00},
-        {"key": "extra_kados", "name": "Κάδος", "unit": "unit", "latest_price": 120.00},
-        {"key": "extra_fatoura", "name": "Φατούρα", "unit": "m2", "latest_price": 0.00},
-    ]
-    existing_extras = {it.get("key") for it in extras_el.findall("item")}
-    for d in extras_defaults:
-        if d["key"] not in existing_extras:
-            it = ET.SubElement(extras_el, "item", {"key": d["key"]})
-            ET.SubElement(it, "name").text = d["name"]
-            ET.SubElement(it, "unit").text = d["unit"]
-            ET.SubElement(it, "latest_price").text = f"{d['latest_price']:.2f}"
-            changed = True
-
-    # Seed default workers if file created empty (safety)
-    default_workers = [
-        {"key": "technitis", "name": "Τεχνίτης", "unit": "day", "latest_price": 80.00},
-        {"key": "voithos", "name": "Βοηθός Τεχνίτη", "unit": "day", "latest_price": 60.00},
-    ]
-    existing_workers = {it.get("key") for it in workers_el.findall("item")}
-    for d in default_workers:
-        if d["key"] not in existing_workers:
-            it = ET.SubElement(workers_el, "item", {"key": d["key"]})
-            ET.SubElement(it, "name").text = d["name"]
-            ET.SubElement(it, "unit").text = d["unit"]
-            ET.SubElement(it, "latest_price").text = f"{d['latest_price']:.2f}"
-            changed = True
-
-    if changed:
-        tree.write(ELAIO_DATA_FILE, encoding="utf-8", xml_declaration=True)
-
-    def parse_group(tag):
-        group_el = root.find(tag)
-        items = []
-        if group_el is not None:
-            for it in group_el.findall("item"):
-                key = it.get("key")
-                name = (it.findtext("name") or "").strip()
-                unit = (it.findtext("unit") or "").strip()
-                latest_price = float(it.findtext("latest_price") or 0)
-                items.append({
-                    "key": key,
-                    "name": name,
-                    "unit": unit,
-                    "latest_price": latest_price,
-                })
-        return items
-
-    return {"workers": parse_group("workers"), "extras": parse_group("extras")}
-
-
-def update_elaioxromatismoi_price_in_xml(key: str, new_price: float):
-    ensure_elaioxromatismoi_data_file()
-    tree = ET.parse(ELAIO_DATA_FILE)
-    root = tree.getroot()
-
-    found_el = None
-    for group in ("workers", "extras"):
-        grp = root.find(group)
-        if grp is not None:
-            for it in grp.findall("item"):
-                if it.get("key") == key:
-                    found_el = it
-                    break
-        if found_el is not None:
-            break
-
-    if found_el is None:
-        raise KeyError(f"Item with key '{key}' not found")
-
-    lp = found_el.find("latest_price")
-    if lp is None:
-        lp = ET.SubElement(found_el, "latest_price")
-    lp.text = f"{new_price:.2f}"
-
-    tree.write(ELAIO_DATA_FILE, encoding="utf-8", xml_declaration=True)
-
-    name = (found_el.findtext("name") or "").strip()
-    unit = (found_el.findtext("unit") or "").strip()
-    return {
-        "key": key,
-        "name": name,
-        "unit": unit,
-        "latest_price": float(lp.text or 0),
-    }
+class QuotePayload(BaseModel):
+    m2: Amount = 0
+    lm: Amount = 0
+    m3: Amount = 0
+    counts: Dict[str, Amount] = Field(
+        default_factory=dict, description="Piece counts by item key (sheets, profiles)"
+    )
+    worker_days: Dict[str, Amount] = Field(default_factory=dict, description="Days per worker key")
+    markup: Amount = Field(20, description="Markup percentage on cost")
+    prices: Dict[str, Amount] = Field(
+        default_factory=dict, description="Unsaved price overrides by item key"
+    )
+    extras: Optional[List[QuoteExtra]] = Field(
+        None, description="Extras to include; defaults to the catalog extras"
+    )
 
 
-@app.get("/elaioxromatismoi", response_class=HTMLResponse)
-async def elaioxromatismoi_page(request: Request):
-    return templates.TemplateResponse(
-        "elaioxromatismoi.html",
-        {"request": request},
+def get_quote_model(store: CatalogStore):
+    """The compiled quote model for the store's current catalog version."""
+    entry = store.entry()
+    model = entry.get("quote_model")
+    if model is None:
+        model = entry["quote_model"] = build_quote_model(store.name, entry["data"])
+    return model
+
+
+def get_quote_model_at(store: CatalogStore, ts: float):
+    """A quote model with the catalog's prices as of `ts`, e.g. to re-price an old quote."""
+    return build_quote_model(store.name, store.load_at(ts))
+
+
+@app.post("/api/{catalog}/quote")
+async def catalog_quote(catalog: str, payload: QuotePayload, at: Optional[AwareDatetime] = None):
+    """Price a job at the current prices, or those at `at` (as for /history: offset required)."""
+    store = get_store(catalog)
+    try:
+        if at is not None:
+            model = await run_storage_io(get_quote_model_at, store, at.timestamp())
+        else:
+            model = await run_storage_io(get_quote_model, store)
+        return JSONResponse(compute_quote(model, payload.model_dump()))
+    except ValueError as ve:
+        raise HTTPException(status_code=422, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class SweepAxis(BaseModel):
+    param: str = Field(
+        ..., description="m2, lm, m3, markup, days, or days:<worker>, price:<key>, count:<key>"
     )
+    values: Optional[List[float]] = Field(None, min_length=1, description="Explicit points")
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    steps: Optional[int] = Field(None, ge=1, description="Evenly spaced points from start to stop")
 
+    @model_validator(mode="after")
+    def check_points(self):
+        if self.values is None and None in (self.start, self.stop, self.steps):
+            raise ValueError("give either values or start, stop and steps")
+        return self
 
-@app.get("/api/elaioxromatismoi/catalog")
-async def elaioxromatismoi_catalog():
+
+class SweepPayload(QuotePayload):
+    axes: List[SweepAxis] = Field(..., min_length=1, description="One matrix dimension per axis")
+
+
+@app.post("/api/{catalog}/sweep")
+async def catalog_sweep(catalog: str, payload: SweepPayload):
+    """Quote totals over a grid of inputs, e.g. m2 x markup, as cost/sell matrices."""
+    store = get_store(catalog)
     try:
-        data = load_elaioxromatismoi_catalog()
-        return JSONResponse(data)
+        model = await run_storage_io(get_quote_model, store)
+        inputs = payload.model_dump()
+        axes = inputs.pop("axes")
+        # Large grids take tens of milliseconds; keep them off the event loop
+        result = await anyio.to_thread.run_sync(compute_sweep, model, inputs, axes)
+        return JSONResponse(result)
+    except ValueError as ve:
+        raise HTTPException(status_code=422, detail=str(ve))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/elaioxromatismoi/update-price")
-async def elaioxromatismoi_update_price(payload: UpdatePricePayload):
+
+# =======================
+# Bulk quotes
+# =======================
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    A streaming response produced while the request body is still being read.
+    StreamingResponse would also listen on `receive` for a disconnect, taking
+    body chunks away from the endpoint; a disconnect ends request.stream() here.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def csv_record_batches(chunks):
+    """
+    Regroup an async stream of CSV bytes into lists of complete records (one per
+    line, or several lines when a quoted field spans them), one list per chunk.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    text = record = ""
+    done = False
+    while not done:
+        try:
+            text += decoder.decode(await anext(chunks))
+        except StopAsyncIteration:
+            text += decoder.decode(b"", final=True) + "\n"
+            done = True
+        lines = text.splitlines(keepends=True)
+        text = lines.pop() if lines and lines[-1][-1] not in "\r\n" else ""
+        batch = []
+        for line in lines:
+            record += line
+            # An odd number of quotes means a quoted field continues on the next line
+            if record.count('"') % 2 == 0:
+                if record.strip():
+                    batch.append(record)
+                record = ""
+        if batch:
+            yield batch
+    if record.strip():
+        yield [record]
+
+
+def csv_delimiter(header_line: str) -> str:
+    """Comma, or semicolon (spreadsheets in a Greek locale) if the header has more of those."""
+    return ";" if header_line.count(";") > header_line.count(",") else ","
+
+
+BULK_TOTALS = ("cost", "markup", "sell", "gross", "margin_pct")
+
+
+def bulk_quote_rows(model, columns, records, first_row, fmt, delimiter):
+    """Quote one batch of job-list records; returns the encoded output rows."""
+    inputs, passthrough = columns
+    totals_columns = BULK_TOTALS + tuple(f"per_{m}" for m in model["measures"])
+    out = io.StringIO()
+    writer = csv.writer(out)
+    for n, row in enumerate(csv.reader(records, delimiter=delimiter), start=first_row):
+        result = {"row": n}
+        for i, name in passthrough:
+            result[name] = row[i] if i < len(row) else ""
+        try:
+            result.update(compute_quote(model, job_inputs(model, inputs, row))["totals"])
+        except ValueError as e:
+            result["error"] = str(e)
+        if fmt == "csv":
+            writer.writerow(
+                [
+                    n,
+                    *(result[name] for _, name in passthrough),
+                    *(result.get(c, "") for c in totals_columns),
+                    result.get("error", ""),
+                ]
+            )
+        else:
+            out.write(json.dumps(result, ensure_ascii=False))
+            out.write("\n")
+    return out.getvalue().encode("utf-8")
+
+
+@app.post("/api/{catalog}/bulk-quote")
+async def catalog_bulk_quote(
+    catalog: str, request: Request, format: Literal["ndjson", "csv"] = "ndjson"
+):
+    """
+    Price a job list. The request body is CSV (comma or semicolon separated) with
+    a header row: m2/lm/m3, markup, days, days:<worker>, count:<key> and
+    price:<key> columns are quote inputs and the rest (an address, a reference)
+    are copied to the output. Rows are quoted as the upload streams in and the
+    results stream back as NDJSON or CSV, one per row; a row that cannot be
+    quoted gets an "error" instead of totals.
+    """
+    store = get_store(catalog)
     try:
-        updated = update_elaioxromatismoi_price_in_xml(payload.key, payload.latest_price)
-        return JSONResponse({"status": "ok", "item": updated})
-    except KeyError as ke:
-        raise HTTPException(status_code=404, detail=str(ke))
+        model = await run_storage_io(get_quote_model, store)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    batches = csv_record_batches(aiter(request.stream()))
+    try:
+        first = await anext(batches)
+    except StopAsyncIteration:
+        raise HTTPException(status_code=422, detail="Empty job list")
+    header_line = first.pop(0)
+    delimiter = csv_delimiter(header_line)
+    header = next(csv.reader([header_line], delimiter=delimiter))
+    try:
+        columns = job_columns(model, header)
+    except ValueError as ve:
+        raise HTTPException(status_code=422, detail=str(ve))
+
+    async def results():
+        if format == "csv":
+            out = io.StringIO()
+            totals_columns = BULK_TOTALS + tuple(f"per_{m}" for m in model["measures"])
+            csv.writer(out).writerow(["row", *(name for _, name in columns[1]), *totals_columns, "error"])
+            yield out.getvalue().encode("utf-8")
+        row = 1
+        batch = first
+        while True:
+            if batch:
+                # Quote off the event loop; a chunk can hold thousands of rows
+                yield await anyio.to_thread.run_sync(
+                    bulk_quote_rows, model, columns, batch, row, format, delimiter
+                )
+                row += len(batch)
+            try:
+                batch = await anext(batches)
+            except StopAsyncIteration:
+                break
+
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    return UploadStreamingResponse(results(), media_type=media_type)
+
+# =======================
+# Price imports
+# =======================
+
+def price_import_rows(plan, records, first_row, delimiter):
+    """Match one batch of price-list records; returns their diff as NDJSON."""
+    diff = plan.feed(csv.reader(records, delimiter=delimiter), first_row)
+    return "".join(json.dumps(d, ensure_ascii=False) + "\n" for d in diff).encode("utf-8")
+
+
+@app.post("/api/{catalog}/import")
+async def catalog_import(
+    catalog: str,
+    request: Request,
+    apply: bool = False,
+    create: bool = False,
+    group: Optional[str] = None,
+    column: Annotated[List[str], Query()] = [],
+):
+    """
+    Import a supplier price list (see price_import.py). The request body is CSV
+    (comma or semicolon separated) with a header row; key, name, unit,
+    latest_price/price and group columns are read, or others mapped with
+    ?column=price=Τιμή (repeatable). New items are only created with create=true,
+    in their row's group or ?group=.
+
+    The diff streams back as NDJSON while the upload is read, one line per row
+    ({"row", "action": update|unchanged|create|skip|error, ...}), then a
+    {"summary": ...} line with rows/s. Nothing is written unless apply=true, and
+    then only if no row had an error: every change in one write.
+    """
+    started = time.perf_counter()
+    store = get_store(catalog)
+    if group is not None and group not in store.groups:
+        raise HTTPException(status_code=404, detail=f"Unknown group '{group}'")
+    try:
+        columns = parse_column_map(column)
+    except ValueError as ve:
+        raise HTTPException(status_code=422, detail=str(ve))
+    try:
+        entry = await run_storage_io(store.entry)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    batches = csv_record_batches(aiter(request.stream()))
+    try:
+        first = await anext(batches)
+    except StopAsyncIteration:
+        raise HTTPException(status_code=422, detail="Empty price list")
+    header_line = first.pop(0)
+    delimiter = csv_delimiter(header_line)
+    header = next(csv.reader([header_line], delimiter=delimiter))
+    try:
+        plan = PriceImport(entry, store.groups, header, columns, create=create, group=group)
+    except ValueError as ve:
+        raise HTTPException(status_code=422, detail=str(ve))
+
+    async def results():
+        row = 1
+        batch = first
+        while True:
+            if batch:
+                yield await anyio.to_thread.run_sync(price_import_rows, plan, batch, row, delimiter)
+                row += len(batch)
+            try:
+                batch = await anext(batches)
+            except StopAsyncIteration:
+                break
+        summary = {**plan.summary(), "applied": False}
+        if apply and not plan.counts["error"]:
+            updates, additions = plan.changes()
+            try:
+                await run_storage_io(store.import_items, updates, additions)
+                summary["applied"] = True
+                PRICE_EVENTS[catalog].poke()
+                if SEARCH_INDEXES[catalog].version is not None:
+                    # New items: start re-indexing now rather than on the next search
+                    await run_storage_io(SEARCH_INDEXES[catalog].refresh)
+            except (KeyError, ValueError) as e:
+                summary["error"] = e.args[0]
+        elapsed = time.perf_counter() - started
+        summary.update(seconds=round(elapsed, 3), rows_per_s=round(plan.rows / elapsed, 1) if elapsed else None)
+        yield json.dumps({"summary": summary}, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    return UploadStreamingResponse(results(), media_type="application/x-ndjson")
+
 # Convenience for local development (optional)
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,131 @@
+"""
+Process-local metrics, exposed in the Prometheus text format.
+
+A small stand-in for prometheus_client covering what the app records: counters,
+gauges and histograms with labels. Updates are a dict update under a lock, cheap
+enough to sit on every request; `render()` formats everything registered.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; spans a cached catalog read (sub-millisecond) to a full 100k-item rewrite
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY = []
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def samples(self):
+        """(suffix, label values, extra labels, value) for every recorded series."""
+        with self._lock:
+            return [("", labels, (), value) for labels, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{format_labels(self.labelnames, labels, extra)} {format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    @contextmanager
+    def track(self, *labels):
+        """Count the enclosed block as in progress."""
+        self.inc(*labels)
+        try:
+            yield
+        finally:
+            self.dec(*labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), then sum and count
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        """Observe the duration of the enclosed block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def samples(self):
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._values.items())
+        samples = []
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                samples.append(("_bucket", labels, (("le", format_value(float(bound))),), cumulative))
+            samples.append(("_sum", labels, (), values[-2]))
+            samples.append(("_count", labels, (), values[-1]))
+        return samples
+
+
+def render(registry=None) -> str:
+    lines = []
+    for metric in REGISTRY if registry is None else registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
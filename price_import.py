@@ -0,0 +1,162 @@
+"""
+Supplier price-list imports.
+
+A price list is CSV with a header row. Each row is matched to a catalog item by
+its key, or failing that by name and unit (compared without case, accents or
+extra spaces), and its price becomes the item's new latest_price. Rows that
+match nothing are skipped, or with `create` become new items of the group in
+their `group` column (or the import's default group).
+
+The rows are fed in batches and only the resulting changes are kept, one per
+item, so memory follows the size of the catalog rather than the file. The
+changes are applied with the store's import_items, in one write.
+"""
+import math
+
+from search import fold_text
+
+# Header names read for each field unless the import maps the field to another
+IMPORT_FIELDS = {
+    "key": ("key",),
+    "name": ("name",),
+    "unit": ("unit",),
+    "price": ("latest_price", "price"),
+    "group": ("group",),
+}
+
+# Row outcomes, as reported in the diff
+ACTIONS = ("update", "unchanged", "create", "skip", "error")
+
+
+def parse_price(text: str) -> float:
+    """A price as price lists write it: 12.5, 12,50, 1.234,56 or 1,234.56, with or without €."""
+    t = text.replace("€", "").replace("\u00a0", "").replace(" ", "")
+    if "," in t and "." in t:
+        # The later separator is the decimal one
+        t = t.replace("." if t.rfind(",") > t.rfind(".") else ",", "")
+    price = float(t.replace(",", "."))
+    if not (math.isfinite(price) and price > 0):
+        raise ValueError(f"Invalid price '{text}'")
+    return round(price, 2)
+
+
+def parse_column_map(pairs):
+    """{field: header name} from "field=Header" strings."""
+    columns = {}
+    for pair in pairs:
+        field, sep, name = pair.partition("=")
+        field = field.strip()
+        if not sep or not name.strip():
+            raise ValueError(f"Column mapping '{pair}' is not field=Header")
+        if field not in IMPORT_FIELDS:
+            raise ValueError(f"Unknown import field '{field}' (one of {', '.join(IMPORT_FIELDS)})")
+        columns[field] = name.strip()
+    return columns
+
+
+def import_columns(header, columns=None):
+    """Column index of each field found in `header`; `columns` maps fields to other header names."""
+    columns = columns or {}
+    positions = {}
+    for i, name in enumerate(header):
+        positions.setdefault(fold_text(name), i)
+    found = {}
+    for field, defaults in IMPORT_FIELDS.items():
+        names = (columns[field],) if field in columns else defaults
+        for name in names:
+            if fold_text(name) in positions:
+                found[field] = positions[fold_text(name)]
+                break
+        else:
+            if field in columns:
+                raise ValueError(f"Column '{columns[field]}' not in the header")
+    if "price" not in found:
+        raise ValueError("No price column (latest_price or price, or map one with price=<column>)")
+    if "key" not in found and not {"name", "unit"} <= found.keys():
+        raise ValueError("Rows are matched by a key column, or by name and unit columns")
+    return found
+
+
+class PriceImport:
+    """
+    The import of one price list into a catalog, fed a batch of parsed rows at
+    a time. `entry` is the catalog's cache entry (see CatalogStore.entry);
+    `group` is where new items go when a row has no group of its own.
+    """
+
+    def __init__(self, entry, groups, header, columns=None, create=False, group=None):
+        self.columns = import_columns(header, columns)
+        self.groups = tuple(groups)
+        self.create = create
+        self.group = group
+        self.items = entry["items"]
+        self.by_name = {}
+        for key, item in self.items.items():
+            self.by_name.setdefault((fold_text(item["name"]), fold_text(item["unit"])), key)
+        self.updates = {}  # key -> new price
+        self.additions = {}  # key -> (group, item)
+        self.counts = dict.fromkeys(ACTIONS, 0)
+        self.rows = 0
+
+    def feed(self, rows, first_row):
+        """Match a batch of rows (row numbers from `first_row`); returns their diff entries."""
+        return [self._row(n, row) for n, row in enumerate(rows, start=first_row)]
+
+    def changes(self):
+        """The price updates as (key, price) and the new items by group, for import_items."""
+        additions = {}
+        for group, item in self.additions.values():
+            additions.setdefault(group, []).append(item)
+        return list(self.updates.items()), additions
+
+    def summary(self):
+        return {
+            "rows": self.rows,
+            **self.counts,
+            "changed_items": len(self.updates),
+            "new_items": len(self.additions),
+        }
+
+    def _value(self, row, field):
+        i = self.columns.get(field)
+        return row[i].strip() if i is not None and i < len(row) else ""
+
+    def _row(self, n, row):
+        self.rows += 1
+        result = {"row": n}
+        try:
+            price = parse_price(self._value(row, "price"))
+        except ValueError:
+            return self._outcome(result, "error", error=f"Invalid price '{self._value(row, 'price')}'")
+        key = self._value(row, "key")
+        name, unit = self._value(row, "name"), self._value(row, "unit")
+        match = key if key in self.items else None
+        if match is None and name:
+            match = self.by_name.get((fold_text(name), fold_text(unit)))
+        if match is not None:
+            old = self.items[match]["latest_price"]
+            result.update(key=match, name=self.items[match]["name"], old=old, new=price)
+            if price == round(old, 2):
+                # A later row for the same item has the last word
+                self.updates.pop(match, None)
+                return self._outcome(result, "unchanged")
+            self.updates[match] = price
+            return self._outcome(result, "update")
+
+        result.update(key=key, name=name, new=price)
+        if not self.create:
+            return self._outcome(result, "skip", reason="No matching item")
+        group = self._value(row, "group") or self.group
+        if not (key and name and unit):
+            return self._outcome(result, "error", error="A new item needs a key, a name and a unit")
+        if group not in self.groups:
+            return self._outcome(result, "error", error=f"Unknown group '{group}'" if group else "No group")
+        result["group"] = group
+        self.additions[key] = (group, {"key": key, "name": name, "unit": unit, "latest_price": price})
+        return self._outcome(result, "create")
+
+    def _outcome(self, result, action, **notes):
+        self.counts[action] += 1
+        result["action"] = action
+        result.update(notes)
+        return result
@@ -0,0 +1,427 @@
+"""
+Server-side quote computation.
+
+Mirrors the pricing rules of the page scripts (static/*.js `recalc()`): quantities
+derived from the job measures and each item's `consumption` rule, worker days,
+extras and the markup. A catalog is compiled once per version into a quote model
+(consumption strings parsed, prices indexed), which is then evaluated per quote.
+
+compute_sweep evaluates the same model over a grid of inputs with numpy: each
+swept input is an array along its own axis and every line broadcasts into the
+totals, so a what-if matrix costs one pass over the lines rather than one quote
+per point.
+"""
+import math
+import re
+
+import numpy as np
+
+# e.g. "6 kgr per 1 m2", "4 units per 100 m2", "7 bags per 1 m3", "3 units per 1 sheet"
+CONSUMPTION_RE = re.compile(
+    r"^(\d+(?:\.\d+)?)\s+(\w+)\s+per\s+(\d+(?:\.\d+)?)\s+(m2|m3|lm|sheet)$", re.IGNORECASE
+)
+
+# Quantities in these units are whole pieces and are rounded up. The pages read
+# this set too (data-piece-units on quote-core.js), so quotes round as they do.
+PIECE_UNITS = frozenset({"unit", "units", "bag", "bags", "sheet", "sheets", "τεμ", "τεμάχιο", "τεμάχια"})
+
+# Per trade: the job measures the page asks for, and how each item group turns
+# them into a quantity. "basis" is a measure, or "count" for items priced per
+# piece from an explicit count; "consumption" applies the item's consumption
+# rule to the basis (otherwise the basis is used as-is, as the pages do).
+# Workers are priced per day and extras per their own unit everywhere.
+QUOTE_RULES = {
+    "thermoprosopsi": {
+        "measures": ("m2", "lm"),
+        "groups": {
+            "areas": {"basis": "m2"},
+            "linear": {"basis": "lm"},
+        },
+    },
+    "plakakia": {
+        "measures": ("m2", "m3"),
+        "groups": {
+            "areas": {"basis": "m2", "consumption": True},
+            "volumes": {"basis": "m3", "consumption": True},
+        },
+    },
+    "gypsosanida": {
+        "measures": ("m2", "lm"),
+        "groups": {
+            "areas": {"basis": "m2"},
+            "linear": {"basis": "lm", "consumption": True},
+            "pieces": {"basis": "count"},
+        },
+    },
+    "elaioxromatismoi": {
+        "measures": ("m2",),
+        "groups": {},
+    },
+}
+
+
+def parse_consumption(text):
+    """Parse a consumption rule into (per_qty, per_unit, base_qty, base_unit), or None."""
+    if not text:
+        return None
+    m = CONSUMPTION_RE.match(str(text).strip())
+    if not m:
+        return None
+    return float(m.group(1)), m.group(2).lower(), float(m.group(3)), m.group(4).lower()
+
+
+def is_piece_unit(unit) -> bool:
+    return str(unit or "").lower() in PIECE_UNITS
+
+
+def build_quote_model(catalog: str, data):
+    """Compile a parsed catalog into the structure compute_quote evaluates."""
+    rules = QUOTE_RULES[catalog]
+    lines = []
+    for group, rule in rules["groups"].items():
+        for item in data.get(group, []):
+            cons = parse_consumption(item.get("consumption")) if rule.get("consumption") else None
+            basis = rule["basis"]
+            if cons is not None:
+                per_qty, per_unit, base_qty, _ = cons
+                factor, qty_unit, rounded = per_qty / base_qty, per_unit, is_piece_unit(per_unit)
+            else:
+                factor = 1.0
+                qty_unit = item["unit"] if basis == "count" else basis
+                rounded = basis == "count"
+            lines.append(
+                {
+                    "group": group,
+                    "key": item["key"],
+                    "name": item["name"],
+                    "unit": item["unit"],
+                    "price": item["latest_price"],
+                    "basis": basis,
+                    "factor": factor,
+                    "qty_unit": qty_unit,
+                    "rounded": rounded,
+                }
+            )
+    prices = {}
+    for items in data.values():
+        for item in items:
+            prices.setdefault(item["key"], item["latest_price"])
+    return {
+        "catalog": catalog,
+        "groups": list(rules["groups"]) + ["workers", "extras"],
+        "measures": rules["measures"],
+        "auto_units": set(rules["measures"]) | {"day"},
+        "lines": lines,
+        "workers": data.get("workers", []),
+        "extras": data.get("extras", []),
+        "prices": prices,
+    }
+
+
+def line_quantity(line, measures, counts):
+    if line["basis"] == "count":
+        base = counts.get(line["key"], 0)
+    else:
+        base = measures.get(line["basis"], 0)
+    qty = base * line["factor"]
+    if line["rounded"]:
+        qty = math.ceil(qty - 1e-9)
+    return qty
+
+
+def quote_extras(model, inputs):
+    """The extras a quote prices: the given ones, or the catalog's extras."""
+    extras = inputs.get("extras")
+    if extras is None:
+        extras = [
+            {"key": it["key"], "name": it["name"], "unit": it["unit"], "qty": 0} for it in model["extras"]
+        ]
+    return extras
+
+
+def compute_quote(model, inputs):
+    """
+    Price a job. `inputs` holds the measures (m2/lm/m3), `counts` (pieces by
+    item key), `worker_days`, `markup`, optional `prices` overrides by key and
+    optional `extras`; when extras are omitted the catalog's extras are used.
+    Raises ValueError for keyed inputs the catalog lacks.
+    """
+    check_inputs(model, inputs)
+    measures = {m: float(inputs.get(m) or 0) for m in model["measures"]}
+    counts = inputs.get("counts") or {}
+    worker_days = inputs.get("worker_days") or {}
+    overrides = inputs.get("prices") or {}
+
+    def price_of(key, default):
+        return float(overrides.get(key, default))
+
+    lines = []
+    sums = {group: 0.0 for group in model["groups"]}
+
+    for line in model["lines"]:
+        qty = line_quantity(line, measures, counts)
+        price = price_of(line["key"], line["price"])
+        cost = price * qty
+        sums[line["group"]] += cost
+        lines.append(
+            {
+                "group": line["group"],
+                "key": line["key"],
+                "name": line["name"],
+                "qty": qty,
+                "qty_unit": line["qty_unit"],
+                "price": price,
+                "cost": round(cost, 2),
+            }
+        )
+
+    total_days = 0.0
+    for worker in model["workers"]:
+        days = float(worker_days.get(worker["key"], 0) or 0)
+        total_days += days
+        price = price_of(worker["key"], worker["latest_price"])
+        cost = price * days
+        sums["workers"] += cost
+        lines.append(
+            {
+                "group": "workers",
+                "key": worker["key"],
+                "name": worker["name"],
+                "qty": days,
+                "qty_unit": "day",
+                "price": price,
+                "cost": round(cost, 2),
+            }
+        )
+
+    # Units an extra can take its quantity from automatically
+    auto_source = {**measures, "day": total_days}
+    for extra in quote_extras(model, inputs):
+        key = extra.get("key")
+        unit = extra.get("unit") or "unit"
+        if extra.get("price") is not None:
+            price = float(extra["price"])
+        else:
+            price = price_of(key, model["prices"].get(key, 0)) if key else 0.0
+        auto = extra.get("auto")
+        if auto is None:
+            auto = True
+        if auto and unit in model["auto_units"]:
+            qty = auto_source.get(unit, 0.0)
+        else:
+            qty = float(extra.get("qty") or 0)
+        cost = price * qty
+        sums["extras"] += cost
+        lines.append(
+            {
+                "group": "extras",
+                "key": key,
+                "name": extra.get("name") or "",
+                "qty": qty,
+                "qty_unit": unit,
+                "price": price,
+                "cost": round(cost, 2),
+            }
+        )
+
+    cost = sum(sums.values())
+    markup = float(inputs.get("markup", 20))
+    sell = cost * (1 + markup / 100)
+    gross = sell - cost
+    totals = {
+        "cost": round(cost, 2),
+        "markup": markup,
+        "sell": round(sell, 2),
+        "gross": round(gross, 2),
+        "margin_pct": round((gross / sell) * 100 if sell > 0 else 0, 1),
+    }
+    for m, value in measures.items():
+        totals[f"per_{m}"] = round(sell / value, 2) if value > 0 else None
+
+    return {
+        "catalog": model["catalog"],
+        "lines": lines,
+        "groups": {group: round(value, 2) for group, value in sums.items()},
+        "totals": totals,
+    }
+
+
+# Largest grid a single sweep may evaluate
+MAX_SWEEP_POINTS = 250_000
+
+# Inputs that can be swept besides the catalog's measures; "days" sets every
+# worker's days, "days:<key>", "price:<key>" and "count:<key>" a single item
+SWEEP_PARAMS = ("markup", "days")
+
+
+def check_param(model, param):
+    """Raise ValueError unless `param` names an input the model can vary."""
+    kind, _, key = param.partition(":")
+    if key:
+        if kind not in ("days", "price", "count"):
+            raise ValueError(f"Unknown parameter '{param}'")
+        if kind == "days" and key not in {w["key"] for w in model["workers"]}:
+            raise ValueError(f"Unknown worker '{key}'")
+        if kind == "price" and key not in model["prices"]:
+            raise ValueError(f"Item with key '{key}' not found")
+        if kind == "count" and key not in {l["key"] for l in model["lines"] if l["basis"] == "count"}:
+            raise ValueError(f"Item '{key}' is not priced by count")
+    elif param not in model["measures"] and param not in SWEEP_PARAMS:
+        raise ValueError(f"Unknown parameter '{param}' for {model['catalog']}")
+
+
+def check_inputs(model, inputs):
+    """Raise ValueError naming the first key of `counts`, `worker_days` or `prices` the model lacks."""
+    for field, kind in (("counts", "count"), ("worker_days", "days"), ("prices", "price")):
+        for key in inputs.get(field) or {}:
+            try:
+                check_param(model, f"{kind}:{key}")
+            except ValueError as e:
+                raise ValueError(f"{field}: {e}") from None
+
+
+def sweep_axis_values(model, axis):
+    """
+    Validate one sweep axis ({"param", "values"} or {"param", "start", "stop",
+    "steps"}) against the model and return (param, values as a float array).
+    """
+    param = axis["param"]
+    check_param(model, param)
+    if axis.get("values") is not None:
+        values = np.asarray(axis["values"], dtype=float)
+    else:
+        values = np.linspace(axis["start"], axis["stop"], axis["steps"])
+    if values.ndim != 1 or values.size == 0:
+        raise ValueError(f"Sweep parameter '{param}' needs at least one value")
+    if (values < 0).any() or not np.isfinite(values).all():
+        raise ValueError(f"Sweep parameter '{param}' takes finite values >= 0")
+    return param, values
+
+
+def compute_sweep(model, inputs, axes):
+    """
+    Evaluate the quote totals over the grid spanned by `axes`, each input in
+    `inputs` (as for compute_quote) being replaced by its axis where swept.
+    Returns the axes and the cost/sell matrices, indexed in axis order.
+    """
+    check_inputs(model, inputs)
+    shape = []
+    for axis in axes:
+        n = len(axis["values"]) if axis.get("values") is not None else axis["steps"]
+        shape.append(n)
+    if math.prod(shape) > MAX_SWEEP_POINTS:
+        raise ValueError(f"Sweep of {math.prod(shape)} points exceeds the limit of {MAX_SWEEP_POINTS}")
+    params = [sweep_axis_values(model, axis) for axis in axes]
+    if len({param for param, _ in params}) != len(params):
+        raise ValueError("Each parameter can be swept only once")
+
+    # Each swept input varies along its own dimension and broadcasts against the rest
+    grid = {}
+    for dim, (param, values) in enumerate(params):
+        grid[param] = values.reshape([-1 if d == dim else 1 for d in range(len(params))])
+
+    measures = {m: grid.get(m, float(inputs.get(m) or 0)) for m in model["measures"]}
+    counts = inputs.get("counts") or {}
+    worker_days = inputs.get("worker_days") or {}
+    overrides = inputs.get("prices") or {}
+
+    def price_of(key, default):
+        return grid.get(f"price:{key}", float(overrides.get(key, default)))
+
+    cost = np.zeros(shape)
+    for line in model["lines"]:
+        if line["basis"] == "count":
+            base = grid.get(f"count:{line['key']}", counts.get(line["key"], 0))
+        else:
+            base = measures.get(line["basis"], 0)
+        qty = np.multiply(base, line["factor"])
+        if line["rounded"]:
+            qty = np.ceil(qty - 1e-9)
+        cost += price_of(line["key"], line["price"]) * qty
+
+    total_days = 0.0
+    for worker in model["workers"]:
+        days = grid.get(
+            f"days:{worker['key']}", grid.get("days", float(worker_days.get(worker["key"], 0) or 0))
+        )
+        total_days = total_days + days
+        cost += price_of(worker["key"], worker["latest_price"]) * days
+
+    auto_source = {**measures, "day": total_days}
+    for extra in quote_extras(model, inputs):
+        key = extra.get("key")
+        unit = extra.get("unit") or "unit"
+        if extra.get("price") is not None:
+            price = float(extra["price"])
+        else:
+            price = price_of(key, model["prices"].get(key, 0)) if key else 0.0
+        auto = extra.get("auto")
+        if auto is None:
+            auto = True
+        if auto and unit in model["auto_units"]:
+            qty = auto_source.get(unit, 0.0)
+        else:
+            qty = float(extra.get("qty") or 0)
+        cost += price * qty
+
+    markup = grid.get("markup", float(inputs.get("markup", 20)))
+    sell = cost * (1 + markup / 100)
+    return {
+        "catalog": model["catalog"],
+        "axes": [{"param": param, "values": values.tolist()} for param, values in params],
+        "shape": shape,
+        "cost": np.round(cost, 2).tolist(),
+        "sell": np.round(sell, 2).tolist(),
+    }
+
+
+# Job-list columns that are always read as quote inputs; any other column
+# without a "days:", "price:" or "count:" prefix is passed through to the output
+JOB_INPUT_COLUMNS = {"m2", "lm", "m3", *SWEEP_PARAMS}
+
+
+def job_columns(model, header):
+    """
+    Split a job-list header into (input columns, pass-through columns), each a
+    list of (index, name). Raises ValueError for inputs the catalog lacks.
+    """
+    inputs, passthrough = [], []
+    for i, name in enumerate(header):
+        param = name.strip()
+        if param.lower() in JOB_INPUT_COLUMNS:
+            param = param.lower()
+        if param in JOB_INPUT_COLUMNS or param.partition(":")[1]:
+            check_param(model, param)
+            inputs.append((i, param))
+        else:
+            passthrough.append((i, param))
+    return inputs, passthrough
+
+
+def job_inputs(model, inputs, row):
+    """The compute_quote inputs for one job-list row; blank cells are left out."""
+    job = {"worker_days": {}, "counts": {}, "prices": {}}
+    days = {}
+    for i, param in inputs:
+        text = row[i].strip() if i < len(row) else ""
+        if not text:
+            continue
+        try:
+            value = float(text.replace(",", "."))
+        except ValueError:
+            raise ValueError(f"{param}: '{text}' is not a number") from None
+        if not (value >= 0 and math.isfinite(value)):
+            raise ValueError(f"{param}: '{text}' must be a number >= 0")
+        kind, _, key = param.partition(":")
+        if kind == "days":
+            days[key] = value
+        elif kind == "count":
+            job["counts"][key] = value
+        elif kind == "price":
+            job["prices"][key] = value
+        else:
+            job[param] = value
+    # "days" applies to every worker, "days:<key>" to one
+    if days:
+        job["worker_days"] = {w["key"]: days.get(w["key"], days.get("", 0)) for w in model["workers"]}
+    return job
@@ -0,0 +1,162 @@
+"""
+Typeahead search over the catalogs' item names and keys.
+
+Names and keys are folded (lower case, without Greek accents, ς as σ) and
+split into words; each catalog keeps its words in one sorted list, so every
+word starting with a prefix sits in one contiguous range found by bisection. A
+query matches an item when each of its words is a prefix of one of the item's
+words: "κολ" and "ΚΟΛΛΑ" find "Κόλλα", "γωνιοκ" finds "Γωνιόκρανο". A lookup
+costs a few bisections plus a walk over one range that stops at the limit.
+
+The index follows its catalog through CatalogStore.changes_since: price changes
+only swap the items' snapshots, and anything structural (a replace, new items,
+a renamed item) rebuilds that catalog's index in a background thread. Searches
+keep using the previous index until the new one is swapped in, so only the very
+first build, with no index to serve yet, happens inside a request.
+"""
+import bisect
+import re
+import threading
+import unicodedata
+
+WORD_RE = re.compile(r"\w+")
+# Combining diacritics, which NFD splits off accented letters (τόνος, διαλυτικά, ...)
+ACCENTS_RE = re.compile("[\u0300-\u036f]")
+
+# Sorts after every character a folded word can hold
+PREFIX_END = "\U0010ffff"
+
+
+def fold_text(text: str) -> str:
+    """Lower case, without accents and repeated spaces: how names are compared."""
+    return " ".join(ACCENTS_RE.sub("", unicodedata.normalize("NFD", text.casefold())).split())
+
+
+def item_words(name: str, key: str):
+    """The words an item is found by: those of its (folded) name and key, and the key whole."""
+    words = set(WORD_RE.findall(name))
+    words.update(WORD_RE.findall(key.replace("_", " ")))
+    words.add(key)
+    return words
+
+
+class SearchIndex:
+    """Prefix index of one catalog's items; `search`, `refresh` and `join` are thread-safe."""
+
+    def __init__(self, store):
+        self.store = store
+        self.version = None
+        self._lock = threading.Lock()
+        self._words = []  # sorted folded words
+        self._word_keys = []  # item key of each word
+        self._names = []  # sorted folded names
+        self._name_keys = []  # item key of each name
+        self._items = {}  # key -> (group, current item snapshot, its words)
+        self._rebuilder = None  # background rebuild in progress
+
+    def refresh(self):
+        """
+        Catch up with the catalog; cheap when it has not changed. A structural
+        change starts a background rebuild and returns at once.
+        """
+        with self._lock:
+            if self.version is None:
+                self._install(*self._build())
+                return
+            version, changed = self.store.changes_since(self.version)
+            if changed is not None and all(
+                item["key"] in self._items and self._items[item["key"]][1]["name"] == item["name"]
+                for item in changed
+            ):
+                # Prices only: the words stay where they are
+                for item in changed:
+                    group, _, words = self._items[item["key"]]
+                    self._items[item["key"]] = (group, item, words)
+                self.version = version
+            elif self._rebuilder is None:
+                self._rebuilder = threading.Thread(target=self._rebuild, name="search-rebuild", daemon=True)
+                self._rebuilder.start()
+
+    def join(self, timeout=None):
+        """Wait for a background rebuild, if one is running."""
+        rebuilder = self._rebuilder
+        if rebuilder is not None:
+            rebuilder.join(timeout)
+
+    def search(self, query: str, limit: int):
+        """
+        Up to `limit` (rank, group, item) matching every word of `query`: first the
+        items whose name starts with the query (rank 0, by name), then the rest
+        (rank 1, in word order).
+        """
+        words = WORD_RE.findall(fold_text(query))
+        if not words:
+            return []
+        terms = sorted(set(words))
+        with self._lock:
+            found = {}
+            lo, hi = self._range(self._names, " ".join(words))
+            for i in range(lo, min(hi, lo + limit)):
+                found[self._name_keys[i]] = 0
+            if len(found) < limit:
+                # Walk the narrowest word range, checking the other words per item
+                ranges = [(*self._range(self._words, term), term) for term in terms]
+                lo, hi, first = min(ranges, key=lambda r: r[1] - r[0])
+                others = [term for term in terms if term != first]
+                for i in range(lo, hi):
+                    key = self._word_keys[i]
+                    if key in found:
+                        continue
+                    words = self._items[key][2]
+                    if all(any(word.startswith(term) for word in words) for term in others):
+                        found[key] = 1
+                        if len(found) >= limit:
+                            break
+            return [(rank, *self._items[key][:2]) for key, rank in found.items()]
+
+    @staticmethod
+    def _range(values, prefix):
+        lo = bisect.bisect_left(values, prefix)
+        return lo, bisect.bisect_left(values, prefix + PREFIX_END, lo)
+
+    def _rebuild(self):
+        try:
+            built = self._build()
+            with self._lock:
+                self._install(*built)
+        finally:
+            with self._lock:
+                self._rebuilder = None
+        # Whatever changed while building
+        self.refresh()
+
+    def _build(self):
+        """Index the catalog as it is now, without touching the index being served."""
+        entry = self.store.entry()
+        items, words, names = {}, [], []
+        for group, group_items in entry["data"].items():
+            for item in group_items:
+                key = item["key"]
+                if key in items:
+                    continue
+                name = fold_text(item["name"])
+                own = item_words(name, fold_text(key))
+                items[key] = (group, item, tuple(own))
+                words.extend((word, key) for word in own)
+                names.append((name, key))
+        words.sort()
+        names.sort()
+        return (
+            entry["version"],
+            items,
+            [word for word, _ in words],
+            [key for _, key in words],
+            [name for name, _ in names],
+            [key for _, key in names],
+        )
+
+    def _install(self, version, items, words, word_keys, names, name_keys):
+        self._words, self._word_keys = words, word_keys
+        self._names, self._name_keys = names, name_keys
+        self._items = items
+        self.version = version
@@ -0,0 +1,139 @@
+// Catalog groups fetched a page at a time from /api/<catalog>/items. A long list
+// opens on its first page; the rest of it (every item is priced in the totals)
+// follows in one /api/<catalog>/catalog fetch after the first paint, and its
+// cards render a page at a time as the list scrolls.
+window.CatalogPager = (() => {
+  const PAGE_SIZE = 100;
+  const MAX_PAGE = 1000; // largest page the API serves
+
+  // Loaded items are appended to target[group] (the page's state.catalog)
+  function create(catalog, target, { pageSize = PAGE_SIZE } = {}) {
+    const cursors = {}; // group -> next_cursor; null once the group is complete
+    const loading = {}; // group -> true while a page is in flight
+    let version = null; // oldest catalog version among the loaded pages
+    const views = {}; // group -> { attach, detach } of its rendered list
+
+    // 'no-cache': revalidated with the page's ETag, a 304 while the catalog is unchanged
+    async function fetchPage(group, query, cache = 'no-cache') {
+      const res = await fetch(`/api/${catalog}/items?group=${encodeURIComponent(group)}&${query}`, { cache });
+      if (!res.ok) throw new Error('Αποτυχία φόρτωσης καταλόγου');
+      const page = await res.json();
+      version = version === null ? page.version : Math.min(version, page.version);
+      return page;
+    }
+
+    // The next page of `group` as { items, version }; nothing while one is in flight or after the last
+    async function loadMore(group, limit = pageSize) {
+      if (cursors[group] === null || loading[group]) return { items: [], version };
+      loading[group] = true;
+      try {
+        const cursor = cursors[group];
+        const page = await fetchPage(group, cursor ? `cursor=${cursor}&limit=${limit}` : `limit=${limit}`);
+        cursors[group] = page.next_cursor;
+        (target[group] = target[group] || []).push(...page.items);
+        return page;
+      } finally {
+        loading[group] = false;
+      }
+    }
+
+    // Short groups (workers, extras): whole before the first paint
+    async function loadAll(group) {
+      while (cursors[group] !== null) await loadMore(group, MAX_PAGE);
+    }
+
+    // The whole catalog in one response, gzipped and revalidated with its ETag
+    async function fetchCatalog(cache) {
+      const res = await fetch(`/api/${catalog}/catalog`, { cache });
+      if (!res.ok) throw new Error('Αποτυχία φόρτωσης καταλόγου');
+      return { data: await res.json(), version: Number(res.headers.get('X-Catalog-Version')) || 0 };
+    }
+
+    // The items of `groups` past their loaded pages, from one catalog fetch rather
+    // than a page per round trip. Returns { group: items appended to target[group] }.
+    async function loadRest(groups) {
+      const pending = groups.filter(group => cursors[group] !== null);
+      if (!pending.length) return {};
+      const { data, version: current } = await fetchCatalog('no-cache');
+      // The oldest version stays: /changes since it also covers the first pages
+      version = version === null ? current : Math.min(version, current);
+      const added = {};
+      for (const group of pending) {
+        const items = (target[group] = target[group] || []);
+        const loaded = new Set(items.map(item => item.key));
+        added[group] = (data[group] || []).filter(item => !loaded.has(item.key));
+        for (const item of added[group]) items.push(item);
+        cursors[group] = null;
+      }
+      return added;
+    }
+
+    // Cards for the loaded items of `group`, a page at a time: the first page now,
+    // the next whenever the end of `list` scrolls near. renderItems(items) appends them.
+    function render(group, list, renderItems) {
+      if (views[group]) views[group].detach(); // rendered again: the previous sentinel goes
+      const items = (target[group] = target[group] || []);
+      let shown = 0;
+      let observer = null;
+      const sentinel = document.createElement('div');
+      sentinel.className = 'list-sentinel';
+      sentinel.textContent = 'Φόρτωση…';
+      const next = () => {
+        const page = items.slice(shown, shown + pageSize);
+        renderItems(page);
+        shown += page.length;
+        return shown < items.length;
+      };
+      const detach = () => {
+        if (observer) observer.disconnect();
+        observer = null;
+        sentinel.remove();
+      };
+      // Watch the end of the list while items are left to show
+      const attach = () => {
+        if (observer || shown >= items.length) return;
+        if (!('IntersectionObserver' in window)) {
+          while (next());
+          return;
+        }
+        list.after(sentinel);
+        observer = new IntersectionObserver((entries) => {
+          if (!entries.some(e => e.isIntersecting)) return;
+          observer.unobserve(sentinel);
+          // Observing again reports the sentinel afresh if it is still in view
+          if (next()) observer.observe(sentinel);
+          else detach();
+        }, { rootMargin: '0px 0px 600px 0px' });
+        observer.observe(sentinel);
+      };
+      views[group] = { attach, detach };
+      next();
+      attach();
+    }
+
+    // Keep rendering `group` past its shown cards, once loadRest added items to it
+    function resume(group) {
+      if (views[group]) views[group].attach();
+    }
+
+    // Every loaded group again (current prices), for a page too far behind for /changes
+    async function reload() {
+      // 'reload': past the service worker's cache too (sw.js)
+      const { data, version: current } = await fetchCatalog('reload');
+      version = current;
+      return Object.keys(cursors).flatMap(group => data[group] || []);
+    }
+
+    return {
+      loadMore,
+      loadAll,
+      loadRest,
+      render,
+      resume,
+      reload,
+      get version() { return version || 0; },
+    };
+  }
+
+  return { create };
+})();
@@ -16,6 +16,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
   const show = (n) => {
     slides.forEach((el, i) => el.classList.toggle('is-active', i === n));
+    // Frames after the first are lazy; fetch the upcoming one before it rotates in
+    const upcoming = slides[(n + 1) % slides.length].querySelector('img[loading="lazy"]');
+    if (upcoming) upcoming.loading = 'eager';
   };
 
   const next = () => {
@@ -0,0 +1,36 @@
+// Registers the service worker (/sw.js) that keeps the app usable offline, and
+// shows when the page is offline or price changes wait to be sent.
+(() => {
+  if (!('serviceWorker' in navigator)) return;
+  const status = document.getElementById('offline-status');
+  let pending = 0;
+
+  function render() {
+    if (!status) return;
+    const changes = pending === 1 ? '1 αλλαγή τιμής' : `${pending} αλλαγές τιμών`;
+    if (!navigator.onLine) {
+      status.textContent = pending ? `Εκτός σύνδεσης — ${changes} σε αναμονή` : 'Εκτός σύνδεσης';
+    } else {
+      status.textContent = `Αποστολή: ${changes}…`;
+    }
+    status.hidden = navigator.onLine && !pending;
+  }
+
+  // Send what was saved offline (the worker does nothing if the queue is empty)
+  function replay() {
+    if (navigator.serviceWorker.controller) navigator.serviceWorker.controller.postMessage({ type: 'replay' });
+  }
+
+  navigator.serviceWorker.addEventListener('message', (e) => {
+    if (e.data && e.data.type === 'offline-queue') {
+      pending = e.data.pending;
+      render();
+    }
+  });
+  window.addEventListener('online', () => { render(); replay(); });
+  window.addEventListener('offline', render);
+  window.addEventListener('load', () => {
+    navigator.serviceWorker.register('/sw.js').then(replay).catch(console.error);
+  });
+  render();
+})();
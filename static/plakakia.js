@@ -1,68 +1,20 @@
 (() => {
   const $ = (sel) => document.querySelector(sel);
-  const $$ = (sel) => Array.from(document.querySelectorAll(sel));
+
+  const { fmtEUR, parseNum, escapeHtml, enableAutoSelect, createExtra } = QuoteCore;
 
   const state = {
     catalog: { areas: [], volumes: [], workers: [] },
-    m2: 0,
-    m3: 0,
-    markup: 20,
-    workerDays: {},
-    extras: [], // { id, desc, unit, qty, price, autoQty }
+    version: 0, // catalog version (X-Catalog-Version) the prices are from
   };
 
-  const currencyFormatter = new Intl.NumberFormat('el-GR', { style: 'currency', currency: 'EUR' });
-  const fmtEUR = (n) => currencyFormatter.format(isFinite(n) ? Number(n) : 0);
-  const parseCurrency = (s) => {
-    if (typeof s !== 'string') return 0;
-    let t = s.replace(/[€\s\u00A0]/g, '');
-    t = t.replace(/\./g, '').replace(/,/g, '.');
-    const n = parseFloat(t);
-    return isFinite(n) ? n : 0;
-  };
-
-  const _animHandles = new WeakMap();
-  function animateCurrency(el, to, opts = {}) {
-    if (!el) return;
-    const { duration = 800 } = opts;
-    const toNum = isFinite(to) ? Number(to) : 0;
-    const prev = _animHandles.get(el);
-    if (prev && typeof prev.cancel === 'function') prev.cancel();
-    const fromNum = parseCurrency(el.textContent || '') || 0;
-    if (Math.abs(toNum - fromNum) < 0.005) {
-      el.textContent = fmtEUR(toNum);
-      _animHandles.delete(el);
-      return;
-    }
-    const start = performance.now();
-    let rafId = 0;
-    let cancelled = false;
-    const cancel = () => { cancelled = true; if (rafId) cancelAnimationFrame(rafId); el.classList.remove('count-anim'); };
-    _animHandles.set(el, { cancel });
-    const easeOutCubic = (t) => 1 - Math.pow(1 - t, 3);
-    el.classList.add('count-anim');
-    const tick = (now) => {
-      if (cancelled) return;
-      const t = Math.min(1, (now - start) / duration);
-      const eased = easeOutCubic(t);
-      const val = fromNum + (toNum - fromNum) * eased;
-      el.textContent = fmtEUR(val);
-      if (t < 1) {
-        rafId = requestAnimationFrame(tick);
-      } else {
-        el.textContent = fmtEUR(toNum);
-        _animHandles.delete(el);
-        setTimeout(() => el.classList.remove('count-anim'), 80);
-      }
-    };
-    rafId = requestAnimationFrame(tick);
-  }
-
-  const parseNum = (v) => {
-    if (typeof v === 'number') return v;
-    if (!v) return 0;
-    return parseFloat(String(v).replace(',', '.')) || 0;
-  };
+  // Inputs: m², m³, days per worker key, markup (see quote-core.js)
+  const quote = QuoteCore.createQuote({
+    inputs: { m2: 0, m3: 0, technitis: 0, voithos: 0, markup: 20 },
+    groups: ['areas', 'volumes', 'workers', 'extras'],
+    perUnit: { sumPerM2: 'm2', sumPerM3: 'm3' },
+  });
+  let extras = null; // QuoteCore.extrasList, once the page is rendered
 
   const unitNice = (u) => {
     if (!u) return '';
@@ -74,11 +26,6 @@
     return u; // kg, etc.
   };
 
-  const isPieceUnit = (u) => {
-    const x = String(u || '').toLowerCase();
-    return ['unit', 'units', 'bag', 'bags', 'τεμ', 'τεμάχιο', 'τεμάχια'].includes(x);
-  };
-
   const formatConsumption = (item) => {
     if (item.consumption) {
       let s = String(item.consumption);
@@ -94,205 +41,151 @@
     return '';
   };
 
-  function enableAutoSelect(el) {
-    if (!el) return;
-    const selectAll = (e) => { try { e.target.select(); } catch(_) {} };
-    const preventMouseUpClear = (e) => e.preventDefault();
-    el.addEventListener('focus', selectAll);
-    el.addEventListener('click', selectAll);
-    el.addEventListener('mouseup', preventMouseUpClear);
-    el.addEventListener('touchend', selectAll, { passive: true });
-  }
+  // Unit of a card's quantity: the consumption's unit, else the base unit (m² / m³)
+  const qtyUnit = (item, baseUnit) => {
+    const cons = QuoteCore.parseConsumption(item.consumption);
+    return cons ? unitNice(cons.perUnit || item.unit) : baseUnit;
+  };
 
+  const pager = CatalogPager.create('plakakia', state.catalog);
+
+  // The long lists open on their first page (the rest follows, see loadRest); the
+  // short groups are loaded whole
   async function fetchCatalog() {
-    const res = await fetch('/api/plakakia/catalog');
-    if (!res.ok) throw new Error('Αποτυχία φόρτωσης καταλόγου');
-    state.catalog = await res.json();
+    await Promise.all([
+      pager.loadMore('areas'),
+      pager.loadMore('volumes'),
+      pager.loadAll('workers'),
+      pager.loadAll('extras'),
+    ]);
+    state.version = pager.version;
   }
 
-  // ---------- Extras (Επιπρόσθετα) ----------
-  const UNIT_OPTIONS = [
-    { value: 'm2', label: 'Τετραγωνικά Μέτρα (m²)' },
-    { value: 'm3', label: 'Κυβικά Μέτρα (m³)' },
-    { value: 'lm', label: 'Τρεχόμετρο (lm)' },
-    { value: 'day', label: 'Ημέρα' },
-    { value: 'unit', label: 'Τεμάχια' },
-  ];
-
-  // Units that have an automatic source on this page (Πλακάκια)
-  function supportsAutoUnit(unit) {
-    return unit === 'm2' || unit === 'm3' || unit === 'day';
+  // The rest of the long lists, after the first paint: every item is priced in
+  // the totals, its card rendered once scrolled near
+  async function loadRest() {
+    const added = await pager.loadRest(['areas', 'volumes']);
+    Object.entries(added).forEach(([group, items]) => {
+      items.forEach(item => quote.addItem(item, LINES[group](item)));
+      pager.resume(group);
+    });
+    // Prices announced while the catalog was on its way
+    if (pager.version < state.version) await prices.sync(pager.version);
   }
 
-  function createExtra(desc = '', unit = 'unit', qty = 0, price = 0, autoQty = true, key = null) {
-    return {
-      id: Math.random().toString(36).slice(2),
-      desc,
-      unit,
-      qty: Number(qty) || 0,
-      price: Number(price) || 0,
-      autoQty: !!autoQty,
-      key: key || null,
-    };
+  const makePriceGroup = (item) => `
+    <div class="price-stack">
+      <div class="price-label">Τιμή/μον.</div>
+      <div class="price-group">
+        <div class="price-chip">
+          <input type="number" class="price price-input" min="0" step="0.01" value="${item.latest_price}" data-original="${item.latest_price}">
+          <span class="sep">|</span>
+          <span class="unit">€/${escapeHtml(unitNice(item.unit))}</span>
+        </div>
+        <button class="btn-update" hidden>Ενημέρωση</button>
+      </div>
+    </div>`;
+
+  // Areas (based on m2, consumption-driven)
+  function areaCard(item) {
+    const card = document.createElement('div');
+    card.className = 'item-card';
+    card.dataset.key = item.key;
+    card.dataset.group = 'areas';
+    if (item.consumption) card.dataset.consumption = item.consumption;
+    if (item.unit) card.dataset.unit = item.unit;
+    card.innerHTML = `
+      <div class="info">
+        <div class="title">${escapeHtml(item.name)}</div>
+        <div class="sub">${escapeHtml(formatConsumption(item))}</div>
+      </div>
+      ${makePriceGroup(item)}
+      <div class="card-total right">
+        <div class="qty"><span class="qty-val">0</span> <span class="qty-unit">${escapeHtml(qtyUnit(item, 'm²'))}</span></div>
+        <div class="cost">${fmtEUR(0)}</div>
+      </div>
+    `;
+    return card;
   }
 
-  function unitAutoQtyValue(unit) {
-    switch (unit) {
-      case 'm2': return state.m2 || 0;
-      case 'm3': return state.m3 || 0;
-      case 'day': {
-        let total = 0; for (const k in state.workerDays) total += Number(state.workerDays[k] || 0); return total;
-      }
-      default:
-        return 0; // lm, unit
-    }
+  // Volumes (based on m3)
+  function volumeCard(item) {
+    const card = document.createElement('div');
+    card.className = 'item-card';
+    card.dataset.key = item.key;
+    card.dataset.group = 'volumes';
+    if (item.consumption) card.dataset.consumption = item.consumption;
+    if (item.unit) card.dataset.unit = item.unit;
+    const sub = formatConsumption(item) || 'ανά m³';
+    card.innerHTML = `
+      <div class="info">
+        <div class="title">${escapeHtml(item.name)}</div>
+        <div class="sub">${escapeHtml(sub)}</div>
+      </div>
+      ${makePriceGroup(item)}
+      <div class="card-total right">
+        <div class="qty"><span class="qty-val">0</span> <span class="qty-unit">${escapeHtml(qtyUnit(item, 'm³'))}</span></div>
+        <div class="cost">${fmtEUR(0)}</div>
+      </div>
+    `;
+    return card;
   }
 
-  function renderExtras() {
-    const wrap = document.getElementById('extras-list');
-    if (!wrap) return;
-    wrap.innerHTML = '';
-    state.extras.forEach(ex => {
-      const card = document.createElement('div');
-      card.className = 'item-card';
-      card.dataset.id = ex.id;
-      if (ex.key) card.dataset.key = ex.key;
-      const opts = UNIT_OPTIONS.map(o => `<option value="${o.value}" ${ex.unit===o.value?'selected':''}>${o.label}</option>`).join('');
-      const canAuto = supportsAutoUnit(ex.unit);
-      const effectiveAuto = canAuto && !!ex.autoQty;
-      const qtyVal = effectiveAuto ? unitAutoQtyValue(ex.unit) : ex.qty;
-      const cost = (Number(ex.price)||0) * (Number(qtyVal)||0);
-      card.innerHTML = `
-        <div class="info">
-          <div class="title"><input type="text" class="extra-desc" value="${ex.desc}" placeholder="Περιγραφή"></div>
-        </div>
-        <div class="price-stack">
-          <div class="price-label">Τιμή/μον.</div>
-          <div class="price-group">
-            <div class="price-chip">
-              <input type="number" class="price extra-price" min="0" step="0.01" value="${ex.price}" ${ex.key ? `data-original="${Number(ex.price).toFixed(2)}"` : ''}>
-              <span class="sep">|</span>
-              <span class="unit">€/${unitNice(ex.unit)}</span>
-            </div>
-            ${ex.key ? '<button class="btn-update" hidden>Ενημέρωση</button>' : ''}
-          </div>
-        </div>
-        <div class="card-total right">
-          <div class="qty">
-            <select class="extra-unit">${opts}</select>
-            <span class="sep">|</span>
-            <input type="number" class="extra-qty" min="0" step="0.01" value="${Number(qtyVal).toFixed(2)}" ${effectiveAuto ? 'disabled' : ''}>
-            <label style="display:inline-flex;align-items:center;gap:6px;margin-left:6px;font-size:12px;">
-              <input type="checkbox" class="extra-auto" ${effectiveAuto ? 'checked' : ''} ${canAuto ? '' : 'disabled'}> αυτόματα
-            </label>
-          </div>
-          <div class="qty-help" hidden>Απαιτείται ποσότητα</div>
-          <div class="cost">${fmtEUR(cost)}</div>
-          <button type="button" class="btn-remove" title="Διαγραφή">−</button>
-        </div>
-      `;
-      wrap.appendChild(card);
-    });
-
-    if (!wrap.dataset.bound) {
-      wrap.addEventListener('input', onExtrasInput);
-      wrap.addEventListener('change', onExtrasChange);
-      wrap.addEventListener('click', onExtrasClick);
-      wrap.dataset.bound = '1';
-    }
-    // Enable select-all behavior for numeric inputs in Extras
-    wrap.querySelectorAll('input.extra-price, input.extra-qty').forEach(enableAutoSelect);
+  // Workers
+  function workerCard(item) {
+    const card = document.createElement('div');
+    card.className = 'item-card';
+    card.dataset.key = item.key;
+    card.dataset.group = 'workers';
+    card.dataset.unit = item.unit;
+    card.innerHTML = `
+      <div class="info">
+        <div class="title">${escapeHtml(item.name)}</div>
+        <div class="sub">/ημέρα</div>
+      </div>
+      ${makePriceGroup(item)}
+      <div class="card-total right">
+        <div class="qty"><span class="qty-val">0.0</span> ημ.</div>
+        <div class="cost">${fmtEUR(0)}</div>
+      </div>
+    `;
+    return card;
   }
 
-  function onExtrasInput(e) {
-    const card = e.target.closest('.item-card');
-    if (!card) return;
-    const id = card.dataset.id;
-    const ex = state.extras.find(x => x.id === id);
-    if (!ex) return;
-    if (e.target.classList.contains('extra-desc')) ex.desc = e.target.value;
-    else if (e.target.classList.contains('extra-price')) {
-      ex.price = parseNum(e.target.value);
-      if (ex.key) {
-        const btn = card.querySelector('.btn-update');
-        const orig = parseNum(e.target.dataset.original);
-        const now = parseNum(e.target.value);
-        if (btn) btn.hidden = !(Math.abs(now - orig) > 0.0001);
-      }
-    }
-    else if (e.target.classList.contains('extra-qty')) ex.qty = parseNum(e.target.value);
-    recalc();
+  // Areas and volumes follow m² / m³, through the item's consumption when it has one
+  function baseLine(group, base, item) {
+    const cons = QuoteCore.parseConsumption(item.consumption);
+    return {
+      group,
+      deps: [base],
+      qty: cons ? (q) => QuoteCore.calcQtyFromConsumption(cons, q[base]).qty : (q) => q[base],
+      format: QuoteCore.isPieceUnit(item.unit) ? (qty) => String(Math.round(qty)) : (qty) => qty.toFixed(2),
+    };
   }
 
-  function onExtrasChange(e) {
-    const card = e.target.closest('.item-card');
-    if (!card) return;
-    const id = card.dataset.id;
-    const ex = state.extras.find(x => x.id === id);
-    if (!ex) return;
-    if (e.target.classList.contains('extra-unit')) {
-      ex.unit = e.target.value;
-      const canAuto = supportsAutoUnit(ex.unit);
-      const autoCb = card.querySelector('.extra-auto');
-      const qtyInput = card.querySelector('.extra-qty');
-      if (autoCb) {
-        autoCb.disabled = !canAuto;
-        autoCb.checked = !!canAuto;
-        ex.autoQty = !!canAuto;
-      }
-      if (qtyInput) {
-        if (canAuto) { qtyInput.value = unitAutoQtyValue(ex.unit).toFixed(2); qtyInput.disabled = true; }
-        else { qtyInput.disabled = false; }
-      }
-      const unitSpan = card.querySelector('.price-chip .unit');
-      if (unitSpan) unitSpan.textContent = '€/' + unitNice(ex.unit);
-    } else if (e.target.classList.contains('extra-auto')) {
-      const canAuto = supportsAutoUnit(ex.unit);
-      const checked = canAuto && e.target.checked;
-      e.target.checked = checked;
-      ex.autoQty = checked;
-      const q = card.querySelector('.extra-qty');
-      if (q) {
-        if (checked) { q.value = unitAutoQtyValue(ex.unit).toFixed(2); q.disabled = true; }
-        else { q.disabled = false; }
-      }
-    }
-    recalc();
-  }
+  // How the line items of each group follow the quote inputs
+  const LINES = {
+    areas: (item) => baseLine('areas', 'm2', item),
+    volumes: (item) => baseLine('volumes', 'm3', item),
+    workers: (item) => ({
+      group: 'workers', deps: [item.key], qty: (q) => q[item.key] || 0, format: (days) => days.toFixed(1),
+    }),
+  };
 
-  function onExtrasClick(e) {
-    if (e.target.classList.contains('btn-remove')) {
-      const card = e.target.closest('.item-card');
-      const id = card?.dataset.id; if (!id) return;
-      state.extras = state.extras.filter(x => x.id !== id);
-      renderExtras();
-      recalc();
-    } else {
-      const btn = e.target.closest('.btn-update');
-      if (btn) {
-        const card = btn.closest('.item-card');
-        const key = card?.dataset.key;
-        if (!key) return;
-        const priceInput = card.querySelector('input.extra-price');
-        const newPrice = parseNum(priceInput.value);
-        btn.disabled = true;
-        (async () => {
-          try {
-            await savePrice(key, newPrice);
-            priceInput.dataset.original = String(newPrice.toFixed(2));
-            btn.hidden = true;
-          } catch (err) {
-            console.error(err);
-            alert('Σφάλμα ενημέρωσης τιμής.');
-          } finally {
-            btn.disabled = false;
-          }
-        })();
-      }
-    }
+  function appendCards(list, makeCard, items) {
+    const cards = items.map(makeCard);
+    list.append(...cards);
+    cards.forEach((card, i) => {
+      enableAutoSelect(card.querySelector('input.price'));
+      quote.addCard(card, LINES[card.dataset.group](items[i]));
+    });
   }
 
-  function addExtraRow(prefill) { state.extras.push(prefill || createExtra('', 'unit', 0, 0, true)); renderExtras(); recalc(); }
+  // A long list: every loaded item is in the quote, its card rendered once scrolled near
+  function renderPaged(group, list, makeCard) {
+    state.catalog[group].forEach(item => quote.addItem(item, LINES[group](item)));
+    pager.render(group, list, (items) => appendCards(list, makeCard, items));
+  }
 
   function renderLists() {
     const areasList = $('#areas-list');
@@ -303,134 +196,11 @@
     volumesList.innerHTML = '';
     workersList.innerHTML = '';
 
-    const makePriceGroup = (item) => `
-      <div class="price-stack">
-        <div class="price-label">Τιμή/μον.</div>
-        <div class="price-group">
-          <div class="price-chip">
-            <input type="number" class="price price-input" min="0" step="0.01" value="${item.latest_price}" data-original="${item.latest_price}">
-            <span class="sep">|</span>
-            <span class="unit">€/${unitNice(item.unit)}</span>
-          </div>
-          <button class="btn-update" hidden>Ενημέρωση</button>
-        </div>
-      </div>`;
-
-    // Areas (based on m2, consumption-driven)
-    state.catalog.areas.forEach((item) => {
-      const card = document.createElement('div');
-      card.className = 'item-card';
-      card.dataset.key = item.key;
-      card.dataset.group = 'areas';
-      if (item.consumption) card.dataset.consumption = item.consumption;
-      if (item.unit) card.dataset.unit = item.unit;
-      card.innerHTML = `
-        <div class="info">
-          <div class="title">${item.name}</div>
-          <div class="sub">${formatConsumption(item)}</div>
-        </div>
-        ${makePriceGroup(item)}
-        <div class="card-total right">
-          <div class="qty"><span class="qty-val">0</span> <span class="qty-unit">${unitNice(item.unit)}</span></div>
-          <div class="cost">${fmtEUR(0)}</div>
-        </div>
-      `;
-      areasList.appendChild(card);
-    });
-
-    // Volumes (based on m3)
-    state.catalog.volumes.forEach((item) => {
-      const card = document.createElement('div');
-      card.className = 'item-card';
-      card.dataset.key = item.key;
-      card.dataset.group = 'volumes';
-      if (item.consumption) card.dataset.consumption = item.consumption;
-      if (item.unit) card.dataset.unit = item.unit;
-      const sub = formatConsumption(item) || 'ανά m³';
-      card.innerHTML = `
-        <div class="info">
-          <div class="title">${item.name}</div>
-          <div class="sub">${sub}</div>
-        </div>
-        ${makePriceGroup(item)}
-        <div class="card-total right">
-          <div class="qty"><span class="qty-val">0</span> <span class="qty-unit">${item.consumption ? unitNice(item.unit) : 'm³'}</span></div>
-          <div class="cost">${fmtEUR(0)}</div>
-        </div>
-      `;
-      volumesList.appendChild(card);
-    });
-
-    // Workers
-    state.catalog.workers.forEach((item) => {
-      const card = document.createElement('div');
-      card.className = 'item-card';
-      card.dataset.key = item.key;
-      card.dataset.group = 'workers';
-      card.dataset.unit = item.unit;
-      card.innerHTML = `
-        <div class="info">
-          <div class="title">${item.name}</div>
-          <div class="sub">/ημέρα</div>
-        </div>
-        ${makePriceGroup(item)}
-        <div class="card-total right">
-          <div class="qty"><span class="qty-val">0.0</span> ημ.</div>
-          <div class="cost">${fmtEUR(0)}</div>
-        </div>
-      `;
-      workersList.appendChild(card);
-    });
+    appendCards(workersList, workerCard, state.catalog.workers);
+    renderPaged('areas', areasList, areaCard);
+    renderPaged('volumes', volumesList, volumeCard);
 
-    attachCardHandlers();
-    $$('#areas-list input.price, #volumes-list input.price, #workers-list input.price').forEach(enableAutoSelect);
-    recalc();
-  }
-
-  function attachCardHandlers() {
-    ['#areas-list', '#volumes-list', '#workers-list'].forEach(sel => {
-      const list = document.querySelector(sel);
-      list.addEventListener('input', (ev) => {
-        const t = ev.target;
-        if (!(t instanceof HTMLInputElement)) return;
-        if (!t.classList.contains('price')) return;
-        const card = t.closest('.item-card');
-        if (!card) return;
-        const key = card.dataset.key;
-        const group = card.dataset.group;
-        const newPrice = parseNum(t.value);
-        const original = parseNum(t.dataset.original);
-        const btn = card.querySelector('.btn-update');
-        if (Math.abs(newPrice - original) > 0.0001) {
-          btn.hidden = false;
-        } else {
-          btn.hidden = true;
-        }
-        recalc();
-      });
-
-      list.addEventListener('click', async (ev) => {
-        const btn = ev.target.closest('.btn-update');
-        if (!btn) return;
-        const card = btn.closest('.item-card');
-        const priceInput = card.querySelector('input.price');
-        const key = card.dataset.key;
-        const newPrice = parseNum(priceInput.value);
-        if (newPrice > 0) {
-          btn.disabled = true;
-          try {
-            await savePrice(key, newPrice);
-            priceInput.dataset.original = String(newPrice.toFixed(2));
-            btn.hidden = true;
-          } catch (err) {
-            console.error(err);
-            alert('Σφάλμα ενημέρωσης τιμής.');
-          } finally {
-            btn.disabled = false;
-          }
-        }
-      });
-    });
+    [areasList, volumesList, workersList].forEach(list => QuoteCore.bindPriceList(list, quote, savePrice));
   }
 
   async function savePrice(key, latest_price) {
@@ -449,158 +219,17 @@
       const idx = state.catalog[group].findIndex(x => x.key === item.key);
       if (idx >= 0) state.catalog[group][idx].latest_price = item.latest_price;
     });
-    recalc();
-  }
-
-  function parseConsumption(cons) {
-    if (!cons) return null;
-    // e.g. "7 kg per 1 m2" or "4 units per 100 m2" or "7 bags per 1 m3"
-    const m = String(cons).trim().match(/^(\d+(?:\.\d+)?)\s+(\w+)\s+per\s+(\d+(?:\.\d+)?)\s+(m2|m3|lm)$/i);
-    if (!m) return null;
-    const num = parseFloat(m[1]);
-    const unit = m[2].toLowerCase();
-    const den = parseFloat(m[3]);
-    const base = m[4].toLowerCase();
-    return { perQty: num, perUnit: unit, baseQty: den, baseUnit: base };
-  }
-
-  function calcQtyFromConsumption(consObj, baseAmount) {
-    if (!consObj) return { qty: baseAmount, unit: null, rounded: false };
-    const factor = consObj.perQty / consObj.baseQty; // quantity per 1 base unit
-    let qty = baseAmount * factor;
-    const rounded = isPieceUnit(consObj.perUnit);
-    if (rounded) qty = Math.ceil(qty - 1e-9);
-    return { qty, unit: consObj.perUnit, rounded };
   }
 
-  function recalc() {
-    const m2 = state.m2;
-    const m3 = state.m3;
-
-    let sumAreas = 0;
-    $$('#areas-list .item-card').forEach(card => {
-      const price = parseNum(card.querySelector('input.price').value);
-      const unit = card.dataset.unit || '';
-      const cons = parseConsumption(card.dataset.consumption || '');
-      const qtyEl = card.querySelector('.qty-val');
-      const qtyUnitEl = card.querySelector('.qty-unit');
-      const costEl = card.querySelector('.cost');
-      let qty = 0;
-      let shownUnit = unitNice(unit);
-      if (cons) {
-        const r = calcQtyFromConsumption(cons, m2);
-        qty = r.qty;
-        shownUnit = unitNice(r.unit || unit);
-      } else {
-        qty = m2;
-        shownUnit = 'm²';
-      }
-      if (qtyEl) qtyEl.textContent = isPieceUnit(unit) ? String(Math.round(qty)) : qty.toFixed(2);
-      if (qtyUnitEl) qtyUnitEl.textContent = shownUnit;
-      const cost = price * qty;
-      if (costEl) costEl.textContent = fmtEUR(cost);
-      sumAreas += cost;
-    });
-
-    let sumVolumes = 0;
-    $$('#volumes-list .item-card').forEach(card => {
-      const price = parseNum(card.querySelector('input.price').value);
-      const unit = card.dataset.unit || '';
-      const cons = parseConsumption(card.dataset.consumption || '');
-      const qtyEl = card.querySelector('.qty-val');
-      const qtyUnitEl = card.querySelector('.qty-unit');
-      const costEl = card.querySelector('.cost');
-      let qty = 0;
-      let shownUnit = unitNice(unit);
-      if (cons) {
-        const r = calcQtyFromConsumption(cons, m3);
-        qty = r.qty;
-        shownUnit = unitNice(r.unit || unit);
-      } else {
-        qty = m3;
-        shownUnit = 'm³';
-      }
-      if (qtyEl) qtyEl.textContent = isPieceUnit(unit) ? String(Math.round(qty)) : qty.toFixed(2);
-      if (qtyUnitEl) qtyUnitEl.textContent = shownUnit;
-      const cost = price * qty;
-      if (costEl) costEl.textContent = fmtEUR(cost);
-      sumVolumes += cost;
-    });
-
-    let sumWorkers = 0;
-    $$('#workers-list .item-card').forEach(card => {
-      const price = parseNum(card.querySelector('input.price').value);
-      const key = card.dataset.key;
-      const days = parseNum(state.workerDays[key] ?? 0);
-      const qtyVal = card.querySelector('.qty-val');
-      const costEl = card.querySelector('.cost');
-      if (qtyVal) qtyVal.textContent = days.toFixed(1);
-      const cost = price * days;
-      if (costEl) costEl.textContent = fmtEUR(cost);
-      sumWorkers += cost;
-    });
-
-    // Extras
-    let sumExtras = 0;
-    $$('#extras-list .item-card').forEach(card => {
-      const price = parseNum(card.querySelector('input.extra-price').value);
-      const unitSel = card.querySelector('select.extra-unit');
-      const autoCb = card.querySelector('input.extra-auto');
-      const qtyInput = card.querySelector('input.extra-qty');
-      let qty = 0;
-      const unit = unitSel?.value;
-      if (autoCb && autoCb.checked && supportsAutoUnit(unit)) {
-        // reuse helper
-        qty = unitAutoQtyValue(unit);
-        if (qtyInput) qtyInput.value = Number(qty).toFixed(2);
-      } else {
-        qty = parseNum(qtyInput?.value);
-      }
-      const costEl = card.querySelector('.cost');
-      const cost = price * qty;
-      if (costEl) costEl.textContent = fmtEUR(cost);
-      const help = card.querySelector('.qty-help');
-      if (qtyInput && qty <= 0) {
-        qtyInput.classList.add('qty--invalid');
-        card.classList.add('has-zero-qty');
-        if (help) help.hidden = false;
-      } else {
-        if (qtyInput) qtyInput.classList.remove('qty--invalid');
-        card.classList.remove('has-zero-qty');
-        if (help) help.hidden = true;
-      }
-      sumExtras += cost;
-    });
-
-    const sumCost = sumAreas + sumVolumes + sumWorkers + sumExtras;
-    const markup = state.markup;
-    const sell = sumCost * (1 + markup / 100);
-    const gross = sell - sumCost;
-    const marginPct = sell > 0 ? (gross / sell) * 100 : 0;
-
-    $('#sumAreas').textContent = fmtEUR(sumAreas);
-    $('#sumVolumes').textContent = fmtEUR(sumVolumes);
-    const sumExtrasEl = $('#sumExtras'); if (sumExtrasEl) sumExtrasEl.textContent = fmtEUR(sumExtras);
-    $('#sumWorkers').textContent = fmtEUR(sumWorkers);
-    animateCurrency($('#sumCost'), sumCost);
-    $('#sumMarkup').textContent = `${markup}%`;
-    animateCurrency($('#sumSell'), sell);
-    const sumGrossAmtEl = $('#sumGrossAmt');
-    const sumGrossPctEl = $('#sumGrossPct');
-    if (sumGrossAmtEl) animateCurrency(sumGrossAmtEl, gross);
-    if (sumGrossPctEl) sumGrossPctEl.textContent = `(${marginPct.toFixed(1)}%)`;
-    $('#sumPerM2').textContent = m2 > 0 ? fmtEUR(sell / Math.max(m2, 1e-9)) : '—';
-    $('#sumPerM3').textContent = m3 > 0 ? fmtEUR(sell / Math.max(m3, 1e-9)) : '—';
-
-    const liveCost = $('#liveCost');
-    const liveSell = $('#liveSell');
-    if (liveCost) animateCurrency(liveCost, sumCost, { duration: 700 });
-    if (liveSell) animateCurrency(liveSell, sell, { duration: 700 });
-    const liveGrossAmt = $('#liveGrossAmt');
-    const liveGrossPct = $('#liveGrossPct');
-    if (liveGrossAmt) animateCurrency(liveGrossAmt, gross, { duration: 700 });
-    if (liveGrossPct) liveGrossPct.textContent = `(${marginPct.toFixed(1)}%)`;
-  }
+  // ---------- Live prices ----------
+  const prices = QuoteCore.livePrices('plakakia', state, quote, {
+    // The loaded items again, past the caches
+    reload: async () => {
+      const items = await pager.reload();
+      state.version = pager.version;
+      return items;
+    },
+  });
 
   function attachInputs() {
     const m2El = $('#m2');
@@ -616,12 +245,12 @@
     enableAutoSelect(daysTechnitisEl);
     enableAutoSelect(daysVoithosEl);
 
-    m2El.addEventListener('input', () => { state.m2 = parseNum(m2El.value); recalc(); });
-    m3El.addEventListener('input', () => { state.m3 = parseNum(m3El.value); recalc(); });
-    state.workerDays['technitis'] = parseNum(daysTechnitisEl.value);
-    state.workerDays['voithos'] = parseNum(daysVoithosEl.value);
-    daysTechnitisEl.addEventListener('input', () => { state.workerDays['technitis'] = parseNum(daysTechnitisEl.value); recalc(); });
-    daysVoithosEl.addEventListener('input', () => { state.workerDays['voithos'] = parseNum(daysVoithosEl.value); recalc(); });
+    m2El.addEventListener('input', () => quote.setInput('m2', m2El.value));
+    m3El.addEventListener('input', () => quote.setInput('m3', m3El.value));
+    quote.setInput('technitis', daysTechnitisEl.value);
+    quote.setInput('voithos', daysVoithosEl.value);
+    daysTechnitisEl.addEventListener('input', () => quote.setInput('technitis', daysTechnitisEl.value));
+    daysVoithosEl.addEventListener('input', () => quote.setInput('voithos', daysVoithosEl.value));
 
     // Keep pretty slider fill in sync via CSS vars (mirrors thermoprosopsi)
     function updateRangeVars(range) {
@@ -651,7 +280,6 @@
       let val = clamp(markupEl.value, min, max);
       val = Math.round(val);
 
-      state.markup = val;
       markupEl.value = String(val);
 
       // bubble text + precise position over thumb (px-based)
@@ -694,8 +322,7 @@
       updateRangeVars(markupEl);
 
       // reflect in summary and totals
-      $('#sumMarkup').textContent = `${state.markup}%`;
-      recalc();
+      quote.setInput('markup', val);
     }
 
     // events
@@ -715,21 +342,26 @@
       await fetchCatalog();
       renderLists();
       attachInputs();
-      // Extras UI and defaults
+      // Extras UI and defaults: m², m³ and days (all workers) can fill an extra's quantity
+      extras = QuoteCore.extrasList($('#extras-list'), quote, {
+        autoUnits: { m2: ['m2'], m3: ['m3'], day: ['technitis', 'voithos'] },
+        unitNice,
+        savePrice,
+      });
       const addBtn = document.getElementById('add-extra');
-      if (addBtn) addBtn.addEventListener('click', () => addExtraRow());
+      if (addBtn) addBtn.addEventListener('click', () => extras.add(createExtra('', 'unit', 0, 0, true)));
       if (Array.isArray(state.catalog.extras) && state.catalog.extras.length) {
         const order = ['extra_kados', 'extra_fatoura'];
         const sorted = [...state.catalog.extras].sort((a,b)=>order.indexOf(a.key)-order.indexOf(b.key));
-        state.extras = sorted.map(it => createExtra(it.name, it.unit, 0, it.latest_price, true, it.key));
+        extras.reset(sorted.map(it => createExtra(it.name, it.unit, 0, it.latest_price, true, it.key)));
       } else {
-        state.extras = [
+        extras.reset([
           createExtra('Κάδος', 'unit', 0, 120, true, 'extra_kados'),
           createExtra('Φατούρα', 'm2', 0, 0, true, 'extra_fatoura'),
-        ];
+        ]);
       }
-      renderExtras();
-      recalc();
+      prices.subscribe();
+      await loadRest();
     } catch (e) {
       console.error(e);
       alert('Αποτυχία φόρτωσης σελίδας Πλακάκια.');
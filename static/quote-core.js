@@ -0,0 +1,618 @@
+// Calculation core shared by the calculator pages (thermoprosopsi.js, plakakia.js,
+// gypsosanida.js, elaioxromatismoi.js).
+//
+// A quote is plain data: named inputs (m2, lm, worker days by key, markup, ...)
+// and line items, each with a price and a quantity computed from the inputs it
+// lists in `deps`. Changing an input recomputes only the lines that depend on it
+// and the sums of their groups. The DOM is written once per animation frame, and
+// only where a shown value changed.
+window.QuoteCore = (() => {
+  const currencyFormatter = new Intl.NumberFormat('el-GR', { style: 'currency', currency: 'EUR' });
+  const fmtEUR = (n) => currencyFormatter.format(isFinite(n) ? Number(n) : 0);
+  // Best-effort number from a currency string like "1.234,56 €" or "€0.00"
+  const parseCurrency = (s) => {
+    if (typeof s !== 'string') return 0;
+    let t = s.replace(/[€\s\u00A0]/g, '');
+    t = t.replace(/\./g, '').replace(/,/g, '.');
+    const n = parseFloat(t);
+    return isFinite(n) ? n : 0;
+  };
+  const parseNum = (v) => {
+    if (typeof v === 'number') return v;
+    if (!v) return 0;
+    return parseFloat(String(v).replace(',', '.')) || 0;
+  };
+  // Catalog text (names, units, consumption) inside an HTML template
+  const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+  const escapeHtml = (s) => String(s ?? '').replace(/[&<>"']/g, (c) => HTML_ESCAPES[c]);
+  // A typed price differs from the saved one
+  const PRICE_EPSILON = 0.0001;
+
+  // Text writes that skip unchanged values (no style or layout work for them)
+  function setText(el, text) {
+    if (el && el.textContent !== text) el.textContent = text;
+  }
+
+  // UX: auto-select content when focusing/clicking inputs
+  function enableAutoSelect(el) {
+    if (!el) return;
+    const selectAll = (e) => { try { e.target.select(); } catch(_) {} };
+    const preventMouseUpClear = (e) => e.preventDefault();
+    el.addEventListener('focus', selectAll);
+    el.addEventListener('click', selectAll);
+    el.addEventListener('mouseup', preventMouseUpClear);
+    el.addEventListener('touchend', selectAll, { passive: true });
+  }
+
+  // ---------- Count-up of the totals ----------
+  // One frame loop runs every animation. A new target for a running animation
+  // continues from the value on screen instead of starting over.
+  const animations = new Map(); // el -> { from, to, start, duration }
+  const shown = new WeakMap(); // el -> value on screen
+  let animationFrame = 0;
+  const easeOutCubic = (t) => 1 - Math.pow(1 - t, 3);
+
+  function animateCurrency(el, to, { duration = 800 } = {}) {
+    if (!el) return;
+    const target = isFinite(to) ? Number(to) : 0;
+    const running = animations.get(el);
+    if (running && running.to === target) return;
+    const from = shown.has(el) ? shown.get(el) : parseCurrency(el.textContent || '');
+    if (!running && Math.abs(target - from) < 0.005) { // tiny diff -> set directly
+      shown.set(el, target);
+      setText(el, fmtEUR(target));
+      return;
+    }
+    animations.set(el, { from, to: target, start: performance.now(), duration });
+    el.classList.add('count-anim');
+    if (!animationFrame) animationFrame = requestAnimationFrame(tickAnimations);
+  }
+
+  function tickAnimations(now) {
+    animationFrame = 0;
+    animations.forEach((a, el) => {
+      const t = Math.max(0, Math.min(1, (now - a.start) / a.duration));
+      const value = t < 1 ? a.from + (a.to - a.from) * easeOutCubic(t) : a.to;
+      shown.set(el, value);
+      setText(el, fmtEUR(value));
+      if (t === 1) {
+        animations.delete(el);
+        // let the CSS animation finish then remove the class
+        setTimeout(() => { if (!animations.has(el)) el.classList.remove('count-anim'); }, 80);
+      }
+    });
+    if (animations.size) animationFrame = requestAnimationFrame(tickAnimations);
+  }
+
+  // ---------- Quotes ----------
+  // groups: line groups in page order (their sums show in #sum<Group>, e.g. #sumAreas);
+  // perUnit: { elementId: input } for the sell price per unit (#sumPerM2 -> 'm2')
+  function createQuote({ inputs = {}, groups, perUnit = {} }) {
+    const state = { markup: 0, ...inputs };
+    const lines = new Map(); // id -> line
+    const byInput = new Map(); // input name -> ids of the lines that depend on it
+    const byGroup = new Map(groups.map(g => [g, new Set()])); // group -> lines
+    const sums = Object.fromEntries(groups.map(g => [g, 0]));
+    const dirtyLines = new Set();
+    const dirtyGroups = new Set();
+    let totalsDirty = true;
+    let frame = 0;
+    let els = null; // summary elements, looked up on the first render
+
+    function schedule() {
+      if (!frame) frame = requestAnimationFrame(flush);
+    }
+
+    function compute(line) {
+      line.qty = line.qtyOf(state);
+      line.cost = line.price * line.qty;
+      dirtyLines.add(line);
+      dirtyGroups.add(line.group);
+      schedule();
+    }
+
+    function index(line) {
+      line.deps.forEach(name => {
+        if (!byInput.has(name)) byInput.set(name, new Set());
+        byInput.get(name).add(line.id);
+      });
+    }
+
+    function unindex(line) {
+      line.deps.forEach(name => byInput.get(name)?.delete(line.id));
+    }
+
+    // spec: { id, group, el, price, deps, qty(inputs), format(qty), view(line) }; returns the line
+    function addLine(spec) {
+      if (lines.has(spec.id)) removeLine(spec.id);
+      const line = {
+        id: spec.id,
+        group: spec.group,
+        el: spec.el || null,
+        price: parseNum(spec.price),
+        deps: spec.deps || [],
+        qtyOf: spec.qty || (() => 0),
+        format: spec.format || ((qty) => qty.toFixed(2)),
+        view: spec.view || writeLine,
+        qty: 0,
+        cost: 0,
+        qtyEl: spec.el ? spec.el.querySelector('.qty-val') : null,
+        costEl: spec.el ? spec.el.querySelector('.cost') : null,
+      };
+      if (line.el) line.el.dataset.line = line.id;
+      lines.set(line.id, line);
+      byGroup.get(line.group).add(line);
+      index(line);
+      compute(line);
+      return line;
+    }
+
+    // A catalog item without a card yet (lists render a page at a time): priced
+    // from the item; addCard takes the line over once the card is rendered
+    function addItem(item, spec) {
+      return addLine({ id: `${spec.group}:${item.key}`, price: item.latest_price, ...spec });
+    }
+
+    // A catalog item's card: its line is `<group>:<key>`, priced from the card's price input
+    function addCard(card, spec) {
+      const input = card.querySelector('input.price');
+      return addLine({
+        id: `${spec.group}:${card.dataset.key}`,
+        el: card,
+        price: input ? input.value : 0,
+        ...spec,
+      });
+    }
+
+    // Change a line's price, deps or quantity function; recomputes just that line
+    function setLine(id, changes = {}) {
+      const line = lines.get(id);
+      if (!line) return;
+      if ('deps' in changes) {
+        unindex(line);
+        line.deps = changes.deps;
+        index(line);
+      }
+      if ('qty' in changes) line.qtyOf = changes.qty;
+      if ('price' in changes) line.price = parseNum(changes.price);
+      compute(line);
+    }
+
+    const setPrice = (id, price) => setLine(id, { price });
+
+    function removeLine(id) {
+      const line = lines.get(id);
+      if (!line) return;
+      unindex(line);
+      lines.delete(id);
+      byGroup.get(line.group).delete(line);
+      dirtyLines.delete(line);
+      dirtyGroups.add(line.group);
+      schedule();
+    }
+
+    function removeGroup(group) {
+      [...byGroup.get(group)].forEach(line => removeLine(line.id));
+    }
+
+    function setInput(name, value) {
+      const v = parseNum(value);
+      if (state[name] === v) return;
+      state[name] = v;
+      (byInput.get(name) || []).forEach(id => compute(lines.get(id)));
+      // markup and the per-unit inputs show in the totals
+      totalsDirty = true;
+      schedule();
+    }
+
+    function totals() {
+      dirtyGroups.forEach(group => {
+        let sum = 0;
+        byGroup.get(group).forEach(line => { sum += line.cost; });
+        sums[group] = sum;
+      });
+      dirtyGroups.clear();
+      let cost = 0;
+      groups.forEach(g => { cost += sums[g]; });
+      const sell = cost * (1 + state.markup / 100);
+      const gross = sell - cost;
+      const marginPct = sell > 0 ? (gross / sell) * 100 : 0;
+      return { sums: { ...sums }, cost, sell, gross, marginPct, markup: state.markup };
+    }
+
+    function writeLine(line) {
+      setText(line.qtyEl, line.format(line.qty));
+      setText(line.costEl, fmtEUR(line.cost));
+    }
+
+    function writeTotals(t) {
+      if (!els) {
+        const byId = (id) => document.getElementById(id);
+        els = {
+          sums: groups.map(g => [g, byId(`sum${g[0].toUpperCase()}${g.slice(1)}`)]),
+          perUnit: Object.entries(perUnit).map(([id, name]) => [byId(id), name]),
+          cost: byId('sumCost'), sell: byId('sumSell'), markup: byId('sumMarkup'),
+          grossAmt: byId('sumGrossAmt'), grossPct: byId('sumGrossPct'),
+          liveCost: byId('liveCost'), liveSell: byId('liveSell'),
+          liveGrossAmt: byId('liveGrossAmt'), liveGrossPct: byId('liveGrossPct'),
+        };
+      }
+      els.sums.forEach(([g, el]) => setText(el, fmtEUR(t.sums[g])));
+      animateCurrency(els.cost, t.cost);
+      setText(els.markup, `${t.markup}%`);
+      animateCurrency(els.sell, t.sell);
+      animateCurrency(els.grossAmt, t.gross);
+      setText(els.grossPct, `(${t.marginPct.toFixed(1)}%)`);
+      els.perUnit.forEach(([el, name]) => {
+        const amount = state[name];
+        setText(el, amount > 0 ? fmtEUR(t.sell / Math.max(amount, 1e-9)) : '—');
+      });
+      // Live header widgets
+      animateCurrency(els.liveCost, t.cost, { duration: 700 });
+      animateCurrency(els.liveSell, t.sell, { duration: 700 });
+      animateCurrency(els.liveGrossAmt, t.gross, { duration: 700 });
+      setText(els.liveGrossPct, `(${t.marginPct.toFixed(1)}%)`);
+    }
+
+    // Write what changed since the last frame; also callable directly (benchmarks)
+    function flush() {
+      if (frame) cancelAnimationFrame(frame);
+      frame = 0;
+      dirtyLines.forEach(line => line.view(line));
+      const changed = dirtyLines.size > 0 || dirtyGroups.size > 0 || totalsDirty;
+      dirtyLines.clear();
+      totalsDirty = false;
+      if (changed) writeTotals(totals());
+    }
+
+    return {
+      inputs: state,
+      addLine,
+      addItem,
+      addCard,
+      setLine,
+      setPrice,
+      removeLine,
+      removeGroup,
+      setInput,
+      totals,
+      flush,
+      line: (id) => lines.get(id),
+      get size() { return lines.size; },
+    };
+  }
+
+  // ---------- Consumption ----------
+  // Units counted in whole pieces: their quantities round up. The list is the
+  // server's (quotes.PIECE_UNITS), given on this script's tag as data-piece-units.
+  const PIECE_UNITS = (document.currentScript?.dataset.pieceUnits || '').split(' ').filter(Boolean);
+  const isPieceUnit = (u) => PIECE_UNITS.includes(String(u || '').toLowerCase());
+
+  // An item's consumption, e.g. "7 kg per 1 m2", "4 units per 100 m2" or "3 units per 1 sheet"
+  function parseConsumption(cons) {
+    if (!cons) return null;
+    const m = String(cons).trim().match(/^(\d+(?:\.\d+)?)\s+(\w+)\s+per\s+(\d+(?:\.\d+)?)\s+(m2|m3|lm|sheet)$/i);
+    if (!m) return null;
+    const num = parseFloat(m[1]);
+    const unit = m[2].toLowerCase();
+    const den = parseFloat(m[3]);
+    const base = m[4].toLowerCase();
+    return { perQty: num, perUnit: unit, baseQty: den, baseUnit: base };
+  }
+
+  function calcQtyFromConsumption(consObj, baseAmount) {
+    if (!consObj) return { qty: baseAmount, unit: null, rounded: false };
+    const factor = consObj.perQty / consObj.baseQty; // quantity per 1 base unit
+    let qty = baseAmount * factor;
+    const rounded = isPieceUnit(consObj.perUnit);
+    if (rounded) qty = Math.ceil(qty - 1e-9);
+    return { qty, unit: consObj.perUnit, rounded };
+  }
+
+  // Price inputs of a catalog list: the typed price prices the line, and the
+  // update button saves it (savePrice(key, price) persists it)
+  function bindPriceList(list, quote, savePrice) {
+    if (!list || list.dataset.priced) return;
+    list.dataset.priced = '1';
+    list.addEventListener('input', (ev) => {
+      const t = ev.target;
+      if (!(t instanceof HTMLInputElement) || !t.classList.contains('price')) return;
+      const card = t.closest('.item-card');
+      if (!card) return;
+      const now = parseNum(t.value);
+      const btn = card.querySelector('.btn-update');
+      if (btn) btn.hidden = !(Math.abs(now - parseNum(t.dataset.original)) > PRICE_EPSILON);
+      quote.setPrice(card.dataset.line, now);
+    });
+    list.addEventListener('click', (ev) => {
+      const btn = ev.target.closest('.btn-update');
+      if (!btn) return;
+      const card = btn.closest('.item-card');
+      savePriceInput(btn, card.querySelector('input.price'), card.dataset.key, savePrice);
+    });
+  }
+
+  async function savePriceInput(btn, priceInput, key, savePrice) {
+    const newPrice = parseNum(priceInput.value);
+    if (!(newPrice > 0)) return;
+    btn.disabled = true;
+    try {
+      await savePrice(key, newPrice);
+      priceInput.dataset.original = String(newPrice.toFixed(2));
+      btn.hidden = true;
+    } catch (err) {
+      console.error(err);
+      alert('Σφάλμα ενημέρωσης τιμής.');
+    } finally {
+      btn.disabled = false;
+    }
+  }
+
+  // A price saved elsewhere (live prices): moves the card's saved price, and the
+  // typed one unless the user is editing it
+  function applyCardPrice(card, quote, latest_price) {
+    const input = card.querySelector('input.price');
+    if (!input) return;
+    const edited = Math.abs(parseNum(input.value) - parseNum(input.dataset.original)) > PRICE_EPSILON;
+    input.dataset.original = Number(latest_price).toFixed(2);
+    if (!edited) {
+      input.value = String(latest_price);
+      quote.setPrice(card.dataset.line, latest_price);
+    }
+    const btn = card.querySelector('.btn-update');
+    if (btn) btn.hidden = Math.abs(parseNum(input.value) - latest_price) <= PRICE_EPSILON;
+  }
+
+  // ---------- Live prices ----------
+  // Prices saved on any open page arrive over /api/<catalog>/events as
+  // [{ key, latest_price }, ...] and go into state.catalog and the cards.
+  // reload() fetches the page's items again when the change buffer cannot
+  // catch up, sets state.version, and returns the items.
+  function livePrices(catalog, state, quote, { reload }) {
+    function apply(changes) {
+      changes.forEach(({ key, latest_price }) => {
+        Object.entries(state.catalog).forEach(([group, items]) => {
+          if (!Array.isArray(items)) return;
+          const item = items.find(x => x.key === key);
+          if (!item) return;
+          item.latest_price = latest_price;
+          // Not rendered yet: the card will show the item's new price
+          const line = quote.line(`${group}:${key}`);
+          if (line && !line.el) quote.setPrice(line.id, latest_price);
+        });
+        document.querySelectorAll(`.item-card[data-key="${CSS.escape(key)}"]`).forEach(card => {
+          applyCardPrice(card, quote, latest_price);
+        });
+      });
+    }
+
+    async function sync(since = state.version) {
+      const res = await fetch(`/api/${catalog}/changes?since=${since}`, { cache: 'no-store' });
+      if (!res.ok) throw new Error('Αποτυχία συγχρονισμού τιμών');
+      const changes = await res.json();
+      if (changes.resync) {
+        // Too far behind for the change buffer
+        apply(await reload());
+      } else {
+        state.version = Math.max(state.version, changes.version);
+        apply(changes.items);
+      }
+    }
+
+    function subscribe() {
+      if (!('EventSource' in window)) return;
+      const events = new EventSource(`/api/${catalog}/events`);
+      events.onmessage = (e) => {
+        // Event ids are catalog versions
+        state.version = Number(e.lastEventId) || state.version;
+        apply(JSON.parse(e.data));
+      };
+      // Events were missed while disconnected: catch up from the catalog version we have
+      events.addEventListener('resync', () => sync().catch(console.error));
+      // The catalog may have come from the offline cache (sw.js): catch up once connected
+      events.addEventListener('open', () => sync().catch(console.error), { once: true });
+    }
+
+    return { apply, sync, subscribe };
+  }
+
+  // ---------- Extras (Επιπρόσθετα) ----------
+  const UNIT_OPTIONS = [
+    { value: 'm2', label: 'Τετραγωνικά Μέτρα (m²)' },
+    { value: 'm3', label: 'Κυβικά Μέτρα (m³)' },
+    { value: 'lm', label: 'Τρεχόμετρο (lm)' },
+    { value: 'day', label: 'Ημέρα' },
+    { value: 'unit', label: 'Τεμάχια' },
+  ];
+
+  function createExtra(desc = '', unit = 'unit', qty = 0, price = 0, autoQty = true, key = null) {
+    return {
+      id: Math.random().toString(36).slice(2),
+      desc,
+      unit,
+      qty: Number(qty) || 0,
+      price: Number(price) || 0,
+      autoQty: !!autoQty,
+      key: key || null,
+    };
+  }
+
+  // The free-form extra lines of a page, in `list`. autoUnits maps the units
+  // whose quantity can follow the page's inputs to those inputs, summed
+  // ({ m2: ['m2'], day: ['technitis', 'voithos'] }).
+  function extrasList(list, quote, { autoUnits, unitNice, savePrice }) {
+    const extras = []; // { id, desc, unit, qty, price, autoQty, key }
+    const canAuto = (unit) => unit in autoUnits;
+    const autoQty = (unit) => (inputs) => autoUnits[unit].reduce((sum, name) => sum + (Number(inputs[name]) || 0), 0);
+    const lineId = (ex) => `extras:${ex.id}`;
+    const find = (card) => extras.find(x => x.id === card?.dataset.id);
+
+    // How the quantity of `ex` is found: its inputs when automatic, else what was typed
+    function quantity(ex) {
+      return ex.autoQty && canAuto(ex.unit)
+        ? { deps: autoUnits[ex.unit], qty: autoQty(ex.unit) }
+        : { deps: [], qty: () => ex.qty };
+    }
+
+    function writeExtra(line) {
+      const { card, qtyInput, help, costEl } = line.refs;
+      const auto = qtyInput.disabled;
+      const text = Number(line.qty).toFixed(2);
+      if (auto && qtyInput.value !== text) qtyInput.value = text;
+      setText(costEl, fmtEUR(line.cost));
+      // zero-qty highlighting
+      const missing = line.qty <= 0;
+      qtyInput.classList.toggle('qty--invalid', missing);
+      card.classList.toggle('has-zero-qty', missing);
+      if (help) help.hidden = !missing;
+    }
+
+    function extraCard(ex) {
+      const card = document.createElement('div');
+      card.className = 'item-card';
+      card.dataset.id = ex.id;
+      if (ex.key) card.dataset.key = ex.key;
+      const opts = UNIT_OPTIONS.map(o => `<option value="${o.value}" ${ex.unit===o.value?'selected':''}>${o.label}</option>`).join('');
+      // Enforce auto capability
+      const effectiveAuto = canAuto(ex.unit) && !!ex.autoQty;
+      card.innerHTML = `
+        <div class="info">
+          <div class="title"><input type="text" class="extra-desc" placeholder="Περιγραφή"></div>
+        </div>
+        <div class="price-stack">
+          <div class="price-label">Τιμή/μον.</div>
+          <div class="price-group">
+            <div class="price-chip">
+              <input type="number" class="price extra-price" min="0" step="0.01" value="${ex.price}" ${ex.key ? `data-original="${Number(ex.price).toFixed(2)}"` : ''}>
+              <span class="sep">|</span>
+              <span class="unit">€/${escapeHtml(unitNice(ex.unit))}</span>
+            </div>
+            ${ex.key ? '<button class="btn-update" hidden>Ενημέρωση</button>' : ''}
+          </div>
+        </div>
+        <div class="card-total right">
+          <div class="qty">
+            <select class="extra-unit">${opts}</select>
+            <span class="sep">|</span>
+            <input type="number" class="extra-qty" min="0" step="0.01" value="${Number(ex.qty).toFixed(2)}" ${effectiveAuto ? 'disabled' : ''}>
+            <label style="display:inline-flex;align-items:center;gap:6px;margin-left:6px;font-size:12px;">
+              <input type="checkbox" class="extra-auto" ${effectiveAuto ? 'checked' : ''} ${canAuto(ex.unit) ? '' : 'disabled'}> αυτόματα
+            </label>
+          </div>
+          <div class="qty-help" hidden>Απαιτείται ποσότητα</div>
+          <div class="cost">${fmtEUR(0)}</div>
+          <button type="button" class="btn-remove" title="Διαγραφή">−</button>
+        </div>
+      `;
+      card.querySelector('.extra-desc').value = ex.desc;
+      card.querySelectorAll('input.extra-price, input.extra-qty').forEach(enableAutoSelect);
+      return card;
+    }
+
+    function add(ex) {
+      extras.push(ex);
+      const card = extraCard(ex);
+      list.appendChild(card);
+      const line = quote.addLine({
+        id: lineId(ex), group: 'extras', el: card, price: ex.price, view: writeExtra, ...quantity(ex),
+      });
+      line.refs = {
+        card,
+        qtyInput: card.querySelector('.extra-qty'),
+        help: card.querySelector('.qty-help'),
+        costEl: card.querySelector('.cost'),
+      };
+    }
+
+    function remove(ex) {
+      extras.splice(extras.indexOf(ex), 1);
+      quote.removeLine(lineId(ex));
+      list.querySelector(`.item-card[data-id="${CSS.escape(ex.id)}"]`)?.remove();
+    }
+
+    list.addEventListener('input', (e) => {
+      const card = e.target.closest('.item-card');
+      const ex = find(card);
+      if (!ex) return;
+      if (e.target.classList.contains('extra-desc')) {
+        ex.desc = e.target.value;
+      } else if (e.target.classList.contains('extra-price')) {
+        ex.price = parseNum(e.target.value);
+        // Toggle update button if this extra is backed by catalog (has key)
+        const btn = card.querySelector('.btn-update');
+        if (ex.key && btn) btn.hidden = !(Math.abs(ex.price - parseNum(e.target.dataset.original)) > PRICE_EPSILON);
+        quote.setPrice(lineId(ex), ex.price);
+      } else if (e.target.classList.contains('extra-qty')) {
+        ex.qty = parseNum(e.target.value);
+        quote.setLine(lineId(ex));
+      }
+    });
+
+    list.addEventListener('change', (e) => {
+      const card = e.target.closest('.item-card');
+      const ex = find(card);
+      if (!ex) return;
+      const qtyInput = card.querySelector('.extra-qty');
+      if (e.target.classList.contains('extra-unit')) {
+        ex.unit = e.target.value;
+        // Enable/disable auto checkbox based on support, and auto-select when supported
+        const autoCb = card.querySelector('.extra-auto');
+        autoCb.disabled = !canAuto(ex.unit);
+        autoCb.checked = canAuto(ex.unit);
+        ex.autoQty = canAuto(ex.unit);
+        // update unit label next to price
+        setText(card.querySelector('.price-chip .unit'), '€/' + unitNice(ex.unit));
+      } else if (e.target.classList.contains('extra-auto')) {
+        // If not supported, force off
+        e.target.checked = canAuto(ex.unit) && e.target.checked;
+        ex.autoQty = e.target.checked;
+      } else {
+        return;
+      }
+      // A quantity typed by hand starts from the one shown
+      if (!ex.autoQty) ex.qty = parseNum(qtyInput.value);
+      qtyInput.disabled = ex.autoQty;
+      quote.setLine(lineId(ex), quantity(ex));
+    });
+
+    list.addEventListener('click', (e) => {
+      const card = e.target.closest('.item-card');
+      const ex = find(card);
+      if (!ex) return;
+      if (e.target.classList.contains('btn-remove')) {
+        remove(ex);
+        return;
+      }
+      const btn = e.target.closest('.btn-update');
+      if (btn && ex.key) savePriceInput(btn, card.querySelector('input.extra-price'), ex.key, savePrice);
+    });
+
+    return {
+      add,
+      // Replace every extra
+      reset(items) {
+        [...extras].forEach(remove);
+        items.forEach(add);
+      },
+      get items() { return extras; },
+    };
+  }
+
+  return {
+    fmtEUR,
+    parseNum,
+    escapeHtml,
+    setText,
+    enableAutoSelect,
+    animateCurrency,
+    createQuote,
+    isPieceUnit,
+    parseConsumption,
+    calcQtyFromConsumption,
+    bindPriceList,
+    applyCardPrice,
+    livePrices,
+    createExtra,
+    extrasList,
+  };
+})();
@@ -0,0 +1,1119 @@
+"""
+Catalog storage: the backends behind /api/<catalog>/..., and their caches.
+
+A CatalogStore holds one catalog (groups of items with a key, name, unit,
+latest_price and optional consumption rule) and serves it as a pre-serialized
+cache entry (build_catalog_entry), rebuilt only when the catalog changes. Two
+backends implement it:
+
+- XmlCatalogStore: one XML file per catalog plus an append-only PriceJournal of
+  price changes, compacted into the file every JOURNAL_COMPACT_EVERY changes;
+  FileLock serializes writers across worker processes.
+- SqliteCatalogStore: every catalog in one SQLite database (WAL), with the
+  price history in a table.
+
+Each committed write bumps the catalog's version and records the keys it
+changed in a ChangeBuffer, which answers /api/<catalog>/changes?since=N.
+"""
+import bisect
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import deque
+from email.utils import formatdate
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+try:
+    import fcntl
+except ImportError:  # Windows: data files are only locked against other threads
+    fcntl = None
+
+from metrics import Counter, Histogram
+
+CATALOG_SECONDS = Histogram(
+    "catalog_operation_seconds",
+    "Catalog storage work by catalog and operation (parse, serialize, write, journal)",
+    ("catalog", "operation"),
+)
+CATALOG_CACHE = Counter(
+    "catalog_cache_requests_total", "Catalog cache entry lookups by result (hit, miss)", ("catalog", "result")
+)
+MIGRATION_WRITES = Counter(
+    "catalog_migration_writes_total", "Writes made to seed a catalog's default items", ("catalog",)
+)
+
+
+# =======================
+# Cache entries
+# =======================
+
+# Bodies below this size are not worth the gzip framing overhead
+GZIP_MIN_SIZE = 1024
+
+
+def build_body_entry(body: bytes, mtime: float, etag_source: bytes = None):
+    """
+    A pre-serialized response body with its validators and gzip variant, as
+    served by conditional_response. The ETag hashes `etag_source` (default: the
+    body itself).
+    """
+    return {
+        "body": body,
+        "gzip": gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_SIZE else None,
+        "etag": '"' + hashlib.sha256(etag_source or body).hexdigest()[:32] + '"',
+        "mtime": int(mtime),
+        "last_modified": formatdate(mtime, usegmt=True),
+    }
+
+
+def build_catalog_entry(signature, data):
+    """Serialize a parsed catalog once, with its validators and gzip variant."""
+    body = json.dumps(
+        data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    return {
+        "signature": signature,
+        "data": data,
+        **build_body_entry(body, signature[0] / 1_000_000_000),
+    }
+
+
+# =======================
+# Catalog storage
+# =======================
+
+def file_signature(path: Path):
+    """Identity of a data file on disk: (mtime_ns, size, inode)."""
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def write_bytes_atomic(path: Path, data: bytes):
+    """
+    Replace `path` with `data` via a temp file in the same directory and a
+    rename, so readers see either the old or the new file, never a partial one.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        try:
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+class FileLock:
+    """
+    An exclusive lock shared by every process that opens `path` (flock), so
+    several workers can serve the same data files. Reentrant within a thread;
+    `timer()`, if given, wraps the wait for the lock.
+    """
+
+    def __init__(self, path, timer=None):
+        self.path = Path(path)
+        self.timer = timer or contextlib.nullcontext
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fh = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                with self.timer():
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._fh = open(self.path, "ab")
+                    fcntl.flock(self._fh, fcntl.LOCK_EX)
+            except BaseException:
+                if self._fh is not None:
+                    self._fh.close()
+                    self._fh = None
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._fh is not None:
+            self._fh.close()  # releases the flock
+            self._fh = None
+        self._lock.release()
+
+
+def serialize_tree(tree: ET.ElementTree) -> bytes:
+    buf = io.BytesIO()
+    tree.write(buf, encoding="utf-8", xml_declaration=True)
+    return buf.getvalue()
+
+
+def item_snapshot(item_el):
+    consumption = item_el.findtext("consumption")
+    return {
+        "key": item_el.get("key"),
+        "name": (item_el.findtext("name") or "").strip(),
+        "unit": (item_el.findtext("unit") or "").strip(),
+        "latest_price": float(item_el.findtext("latest_price") or 0),
+        **({"consumption": consumption} if consumption else {}),
+    }
+
+
+def append_item(group_el, item):
+    """Add `item` to a group element as an <item>; returns the element."""
+    it = ET.SubElement(group_el, "item", {"key": item["key"]})
+    ET.SubElement(it, "name").text = item["name"]
+    ET.SubElement(it, "unit").text = item["unit"]
+    if item.get("consumption"):
+        ET.SubElement(it, "consumption").text = item["consumption"]
+    ET.SubElement(it, "latest_price").text = f"{item['latest_price']:.2f}"
+    return it
+
+
+def existing_keys_error(existing):
+    if len(existing) == 1:
+        return ValueError(f"Item with key '{existing[0]}' already exists")
+    return ValueError(f"Items with keys {', '.join(repr(k) for k in existing)} already exist")
+
+
+def unknown_keys_error(missing):
+    if len(missing) == 1:
+        return KeyError(f"Item with key '{missing[0]}' not found")
+    return KeyError(f"Items with keys {', '.join(repr(k) for k in missing)} not found")
+
+
+# Catalog versions whose changed keys are kept for /api/<catalog>/changes
+CHANGE_BUFFER = 1024
+
+
+class ChangeBuffer:
+    """
+    The keys changed by each of a catalog's last CHANGE_BUFFER versions. A
+    version that changed the catalog as a whole (a replace, an outside edit) is
+    a `reset`: changes from before it cannot be told apart any more.
+    """
+
+    def __init__(self, size=CHANGE_BUFFER):
+        self._versions = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.version = None
+        # The oldest version the changes since which are still known
+        self.floor = None
+
+    def reset(self, version: int):
+        with self._lock:
+            self._versions.clear()
+            self.version = self.floor = version
+
+    def record(self, version: int, keys):
+        """Record the keys changed by `version`, which must follow the last one."""
+        with self._lock:
+            if self.version is not None and version <= self.version:
+                return
+            if self.version is None or version != self.version + 1:
+                self._versions.clear()
+                self.version = self.floor = version
+                return
+            if len(self._versions) == self._versions.maxlen:
+                self.floor = self._versions[0][0]
+            self._versions.append((version, frozenset(keys)))
+            self.version = version
+
+    def keys_since(self, since: int, until: int):
+        """Keys changed after version `since` up to `until`; None if not known that far back."""
+        with self._lock:
+            if since == until:
+                return set()
+            if self.floor is None or not self.floor <= since < until <= self.version:
+                return None
+            keys = set()
+            for version, changed in reversed(self._versions):
+                if version <= since:
+                    break
+                if version <= until:
+                    keys |= changed
+            return keys
+
+
+class CatalogStore:
+    """
+    A catalog, configured by its groups and the default items seeded into it.
+
+    Backends keep the catalog wherever they like and provide `entry` (the cache
+    entry of the current contents, see build_catalog_entry, plus a key -> item
+    dict under "items"), `update_prices` and `replace`; lookups and single price
+    updates are built on those.
+
+    Every committed write (a price batch, a replace, a migration) bumps the
+    catalog's `version` by one and records what it changed in `change_buffer`.
+    """
+
+    def __init__(self, name, groups, defaults=None):
+        self.name = name
+        self.groups = tuple(groups)
+        self.defaults = defaults or {}
+        self.version = 0
+        self.change_buffer = ChangeBuffer()
+
+    def entry(self):
+        raise NotImplementedError
+
+    def load(self):
+        return self.entry()["data"]
+
+    def get_item(self, key):
+        """O(1) lookup of an item snapshot by key; raises KeyError if unknown."""
+        try:
+            return self.entry()["items"][key]
+        except KeyError:
+            raise KeyError(f"Item with key '{key}' not found") from None
+
+    def changes_since(self, version: int):
+        """
+        The current version and the items added or changed after `version`; the
+        items are None when the change buffer does not reach back that far.
+        """
+        entry = self.entry()
+        keys = self.change_buffer.keys_since(version, entry["version"])
+        if keys is None:
+            return entry["version"], None
+        items = entry["items"]
+        return entry["version"], [items[key] for key in sorted(keys) if key in items]
+
+    def items_page(self, group: str, offset: int, limit: int):
+        """(version, size of the group, up to `limit` of its items from `offset` on), in catalog order."""
+        entry = self.entry()
+        items = entry["data"].get(group, [])
+        return entry["version"], len(items), items[offset:offset + limit]
+
+    def update_price(self, key: str, new_price: float):
+        return self.update_prices([(key, new_price)])[0]
+
+    def update_prices(self, updates):
+        """
+        Set latest_price for each (key, price) and return the updated items in
+        order. Every key is resolved first, so one unknown key changes nothing.
+        """
+        raise NotImplementedError
+
+    def replace(self, data):
+        """Replace the whole catalog with `data` ({group: [item, ...]})."""
+        raise NotImplementedError
+
+    def import_items(self, updates, additions):
+        """
+        Set latest_price for each (key, price) and append the new items of
+        `additions` ({group: [item, ...]}) in one write; returns the updated
+        items. A new key that already exists is a ValueError and writes nothing.
+        """
+        raise NotImplementedError
+
+    def price_history(self, key):
+        """The item and its recorded price changes as (ts, price, prev), oldest first."""
+        raise NotImplementedError
+
+    def prices_before(self, ts: float):
+        """For every key whose price changed after `ts`, the price it had at `ts`."""
+        raise NotImplementedError
+
+    def load_at(self, ts: float):
+        """
+        The catalog with the prices it had at `ts` (epoch seconds). Only price
+        changes are recorded, so items and names are today's.
+        """
+        prices = self.prices_before(ts)
+        return {
+            group: [
+                {**item, "latest_price": prices[item["key"]]} if item["key"] in prices else item
+                for item in items
+            ]
+            for group, items in self.load().items()
+        }
+
+    def _build_entry(self, signature, data):
+        CATALOG_CACHE.inc(self.name, "miss")
+        with CATALOG_SECONDS.time(self.name, "serialize"):
+            entry = build_catalog_entry(signature, data)
+        entry["version"] = self.version
+        items = {}
+        for group_items in data.values():
+            for item in group_items:
+                items.setdefault(item["key"], item)
+        entry["items"] = items
+        return entry
+
+
+class PriceJournal:
+    """
+    Append-only log of price changes next to a catalog file: one JSON line per
+    committed batch, {"ts": <epoch seconds>, "version": <catalog version>,
+    "prices": [[key, price, prev], ...]}.
+    A line is only trusted once its newline is on disk, so a write cut short by
+    a crash is ignored (and cut off by the next append).
+
+    The history index (every change in time order plus the changes per key) is
+    built on first use and then extended with whatever was appended since, so
+    history queries never replay the whole log.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._indexed = 0
+        self._times = []
+        self._changes = []
+        self._by_key = {}
+
+    def stat(self):
+        try:
+            st = self.path.stat()
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return 0, 0
+
+    def read(self, offset: int):
+        """The batches after byte `offset`, and the offset after the last whole line."""
+        try:
+            with open(self.path, "rb") as fh:
+                fh.seek(offset)
+                chunk = fh.read()
+        except FileNotFoundError:
+            return [], offset
+        batches = []
+        for line in chunk.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            with contextlib.suppress(ValueError):
+                batches.append(json.loads(line))
+        return batches, offset
+
+    def append(self, offset: int, changes, version: int) -> int:
+        """Append one batch of (key, price, prev) at `offset`; returns the new end."""
+        line = json.dumps(
+            {"ts": time.time(), "version": version, "prices": [list(change) for change in changes]},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8") + b"\n"
+        with open(self.path, "ab") as fh:
+            if fh.tell() != offset:
+                fh.truncate(offset)
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+        return offset + len(line)
+
+    # ----- history index -----
+
+    def _sync(self):
+        batches, self._indexed = self.read(self._indexed)
+        for batch in batches:
+            for key, price, prev in batch["prices"]:
+                self._by_key.setdefault(key, []).append(len(self._changes))
+                self._times.append(batch["ts"])
+                self._changes.append((batch["ts"], key, price, prev))
+
+    def history(self, key):
+        """Every change of `key` as (ts, price, prev), oldest first."""
+        with self._lock:
+            self._sync()
+            changes = (self._changes[i] for i in self._by_key.get(key, []))
+            return [(ts, price, prev) for ts, _, price, prev in changes]
+
+    def prices_before(self, ts: float):
+        """For every key changed after `ts`, the price it had at `ts`."""
+        with self._lock:
+            self._sync()
+            prices = {}
+            for _, key, _, prev in self._changes[bisect.bisect_right(self._times, ts):]:
+                prices.setdefault(key, prev)
+            return prices
+
+
+# Price changes kept in the journal before they are folded into the XML file
+JOURNAL_COMPACT_EVERY = 256
+
+
+class XmlCatalogStore(CatalogStore):
+    """
+    A catalog kept in its own XML file plus a price journal.
+
+    The parsed tree stays in memory with a key -> <item> index, so a price update
+    is a dict lookup on the live tree plus one small append to the journal, and
+    reads come from a pre-serialized cache entry. Every JOURNAL_COMPACT_EVERY
+    changes the tree is written back to the XML file as a snapshot, which records
+    in its `journal` attribute how much of the journal it already contains;
+    loading is the snapshot plus the journal lines after that point. When either
+    file changes on disk (an outside edit) it is read again. The snapshot's
+    `version` attribute and each journal line carry the catalog version.
+
+    Every write goes through `submit`. Mutations run under a lock, so concurrent
+    read-modify-write cycles cannot lose each other's changes, and submissions
+    that queue up during a write are coalesced into the next one. The lock is
+    also a file lock (<name>.lock next to the catalog), and each write first
+    catches up with the files, so worker processes sharing the data directory
+    serialize their writes the same way.
+    """
+
+    def __init__(self, name, path, groups, defaults=None):
+        super().__init__(name, groups, defaults)
+        self.path = Path(path)
+        self.journal = PriceJournal(self.path.with_suffix(".journal"))
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(self.path.with_suffix(".lock"), lambda: CATALOG_SECONDS.time(name, "lock"))
+        self._queue_lock = threading.Lock()
+        self._pending = []
+        self._tree = None
+        self._file_signature = None
+        self._journal_end = 0
+        self._unsnapshotted = 0
+        self._snapshot_due = False
+        self._seeded = set()
+        self._journal_batch = []
+        self._signature = None
+        self._index = {}
+        self._entry = None
+
+    # ----- reads -----
+
+    def entry(self):
+        entry = self._entry
+        if entry is not None:
+            try:
+                if self._disk_signature() == entry["signature"]:
+                    CATALOG_CACHE.inc(self.name, "hit")
+                    return entry
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._current_tree()
+            if self._entry is None:
+                data = {group: self._parse_group(group) for group in self.groups}
+                self._entry = self._build_entry(self._signature, data)
+            else:
+                CATALOG_CACHE.inc(self.name, "hit")
+            return self._entry
+
+    def items_page(self, group, offset, limit):
+        # Straight from the tree: a page costs its own items, not a rebuilt entry
+        # (the whole catalog's JSON and gzip) after every price change
+        with self._lock:
+            root = self._current_tree().getroot()
+            if self._entry is not None:
+                items = self._entry["data"].get(group, [])
+                return self.version, len(items), items[offset:offset + limit]
+            group_el = root.find(group)
+            if group_el is None:
+                return self.version, 0, []
+            # A group's children are its <item> elements
+            return self.version, len(group_el), [item_snapshot(it) for it in group_el[offset:offset + limit]]
+
+    def price_history(self, key):
+        item = self.get_item(key)
+        return item, self.journal.history(key)
+
+    def prices_before(self, ts):
+        return self.journal.prices_before(ts)
+
+    # ----- writes -----
+
+    def update_prices(self, updates):
+        return self.submit(lambda root: self._apply_price_updates(updates), journaled=True)
+
+    def replace(self, data):
+        def rebuild(root):
+            root.clear()
+            for group in self.groups:
+                group_el = ET.SubElement(root, group)
+                for item in data.get(group, []):
+                    append_item(group_el, item)
+            ET.indent(root)
+            # Price updates coalesced into the same flush must find the new elements
+            self._index = self._index_items(root)
+
+        self.submit(rebuild)
+
+    def import_items(self, updates, additions):
+        if not any(additions.values()):
+            return self.update_prices(updates) if updates else []
+
+        def apply(root):
+            existing = [item["key"] for items in additions.values() for item in items
+                        if item["key"] in self._index]
+            if existing:
+                raise existing_keys_error(existing)
+            # Prices first: an unknown key raises before the tree is touched
+            updated = self._apply_price_updates(updates)
+            for group, items in additions.items():
+                group_el = root.find(group)
+                if group_el is None:
+                    group_el = ET.SubElement(root, group)
+                for item in items:
+                    self._index[item["key"]] = append_item(group_el, item)
+            ET.indent(root)
+            return updated
+
+        # Not journaled: the prices and the new items land in one snapshot
+        return self.submit(apply)
+
+    def submit(self, mutate, journaled=False):
+        """
+        Apply `mutate(root)` to the catalog and persist it; returns its result.
+        A journaled mutation only changes prices through _apply_price_updates and
+        is persisted as a journal append; anything else writes a new snapshot.
+        """
+        job = {"mutate": mutate, "journaled": journaled, "done": False, "result": None, "error": None}
+        with self._queue_lock:
+            self._pending.append(job)
+        with self._lock:
+            if not job["done"]:
+                with self._file_lock:
+                    self._flush()
+        if job["error"] is not None:
+            raise job["error"]
+        return job["result"]
+
+    def _flush(self):
+        with self._queue_lock:
+            batch, self._pending = self._pending, []
+        try:
+            tree = self._current_tree()
+            applied = 0
+            structural = False
+            self._journal_batch = []
+            for job in batch:
+                try:
+                    job["result"] = job["mutate"](tree.getroot())
+                    applied += 1
+                    structural = structural or not job["journaled"]
+                except Exception as e:
+                    job["error"] = e
+            if applied:
+                # A loaded tree the file does not match yet (see _load_snapshot)
+                snapshot = structural or self._snapshot_due
+                self.version += 1
+                try:
+                    if snapshot:
+                        # One rename commits the whole batch; the price history follows
+                        self._write_snapshot()
+                    if self._journal_batch:
+                        with CATALOG_SECONDS.time(self.name, "journal"):
+                            self._journal_end = self.journal.append(
+                                self._journal_end, self._journal_batch, self.version
+                            )
+                        self._unsnapshotted += 1
+                    if not snapshot and self._unsnapshotted >= JOURNAL_COMPACT_EVERY:
+                        self._write_snapshot()
+                except BaseException:
+                    # The in-memory tree is now ahead of the files; re-read them next time
+                    self._tree = None
+                    raise
+                if snapshot:
+                    self._set_tree(tree, self._file_signature)
+                # Writing the snapshot is only compaction; the changes are the journaled ones
+                if structural:
+                    self.change_buffer.reset(self.version)
+                else:
+                    self.change_buffer.record(self.version, {key for key, _, _ in self._journal_batch})
+                self._signature = self._disk_signature()
+                self._entry = None
+        except Exception as e:
+            for job in batch:
+                if job["error"] is None:
+                    job["error"] = e
+        finally:
+            for job in batch:
+                job["done"] = True
+
+    def _apply_price_updates(self, updates):
+        missing = [key for key, _ in updates if key not in self._index]
+        if missing:
+            raise unknown_keys_error(missing)
+
+        updated = []
+        for key, new_price in updates:
+            found_el = self._index[key]
+            prev = float(found_el.findtext("latest_price") or 0)
+            lp = found_el.find("latest_price")
+            if lp is None:
+                lp = ET.SubElement(found_el, "latest_price")
+            lp.text = f"{new_price:.2f}"
+            self._journal_batch.append((key, round(float(new_price), 2), prev))
+            updated.append(item_snapshot(found_el))
+        return updated
+
+    # ----- file and tree state (self._lock held) -----
+
+    def _disk_signature(self):
+        """(mtime_ns, size, inode) of the XML file, with the journal's mtime and size folded in."""
+        mtime_ns, size, inode = file_signature(self.path)
+        journal_mtime_ns, journal_size = self.journal.stat()
+        return max(mtime_ns, journal_mtime_ns), size, inode, journal_size
+
+    def _current_tree(self):
+        """The in-memory tree, brought up to date with the files on disk."""
+        if not self.path.exists():
+            with self._file_lock:
+                if not self.path.exists():
+                    # Minimal default structure if missing
+                    empty_groups = "".join(f"<{group}/>" for group in self.groups)
+                    write_bytes_atomic(
+                        self.path,
+                        f'<?xml version="1.0" encoding="UTF-8"?>\n<catalog>{empty_groups}</catalog>\n'.encode("utf-8"),
+                    )
+        # Taken before reading, so it can only understate what the tree holds
+        signature = self._disk_signature()
+        if self._tree is not None and signature == self._signature:
+            return self._tree
+
+        if self._tree is None or file_signature(self.path) != self._file_signature:
+            # Locked: not halfway through another process's snapshot and journal append
+            with self._file_lock:
+                self._load_snapshot()
+        # Journal lines appended after the snapshot (or since we last looked)
+        batches, self._journal_end = self.journal.read(self._journal_end)
+        for batch in batches:
+            for key, price, _ in batch["prices"]:
+                found_el = self._index.get(key)
+                if found_el is not None:
+                    lp = found_el.find("latest_price")
+                    if lp is None:
+                        lp = ET.SubElement(found_el, "latest_price")
+                    lp.text = f"{price:.2f}"
+            version = batch.get("version")
+            if version is not None and version <= self.version:
+                # Written after the snapshot that already holds it (see _flush)
+                continue
+            self.version = max(self.version + 1, version or 0)
+            self.change_buffer.record(self.version, {key for key, _, _ in batch["prices"]})
+        self._unsnapshotted += len(batches)
+        self._signature = signature
+        self._entry = None
+        return self._tree
+
+    def _load_snapshot(self):
+        known_end = self._journal_end if self._tree is not None else None
+        # Only trust a parse if the file did not change underneath it
+        file_sig = file_signature(self.path)
+        while True:
+            with CATALOG_SECONDS.time(self.name, "parse"):
+                tree = ET.parse(self.path)
+            parsed_sig, file_sig = file_sig, file_signature(self.path)
+            if parsed_sig == file_sig:
+                break
+        self._set_tree(tree, file_sig)
+        # A file without the attribute (new, or edited by hand) already has every price
+        journal_offset = tree.getroot().get("journal")
+        version = int(tree.getroot().get("version", 0))
+        if journal_offset is not None:
+            self._journal_end = int(journal_offset)
+        else:
+            self._journal_end = self.journal.read(0)[1]
+        if journal_offset is None or version < self.version:
+            # Changed outside the app: a version of its own
+            version = max(version, self.version + 1)
+            self.change_buffer.reset(version)
+        elif known_end is not None:
+            # Another process's snapshot: what it added since our last look is
+            # in the journal, so the changes stay known unless a write was structural
+            self._record_journal(known_end, version)
+        else:
+            self.change_buffer.reset(version)
+        self.version = version
+        self._unsnapshotted = 0
+        self._seeded = self._seed_defaults(tree.getroot())
+        if self._seeded:
+            self._index = self._index_items(tree.getroot())
+            self.version += 1
+            self.change_buffer.record(self.version, self._seeded)
+        # Loading never writes; seeded items and the offset/version derived above
+        # live in memory until the next change is flushed as a full snapshot.
+        # Journaled alone, that change would be taken as already in a file
+        # without the attribute on the next load.
+        self._snapshot_due = bool(self._seeded) or journal_offset is None
+
+    def _record_journal(self, offset, version):
+        """Record the journaled changes after `offset` up to `version` in the change buffer."""
+        for batch in self.journal.read(offset)[0]:
+            batch_version = batch.get("version")
+            if batch_version is None or batch_version > version:
+                break
+            # A gap (a structural write has no journal line) clears the buffer
+            self.change_buffer.record(batch_version, {key for key, _, _ in batch["prices"]})
+        if self.change_buffer.version != version:
+            self.change_buffer.reset(version)
+
+    def _write_snapshot(self):
+        root = self._tree.getroot()
+        root.set("journal", str(self._journal_end))
+        root.set("version", str(self.version))
+        with CATALOG_SECONDS.time(self.name, "write"):
+            write_bytes_atomic(self.path, serialize_tree(self._tree))
+        self._file_signature = file_signature(self.path)
+        self._unsnapshotted = 0
+        self._snapshot_due = False
+        if self._seeded:
+            MIGRATION_WRITES.inc(self.name)
+            self._seeded = set()
+
+    def _index_items(self, root):
+        """Item elements by key (the first one, should a key repeat)."""
+        index = {}
+        for group in self.groups:
+            group_el = root.find(group)
+            if group_el is not None:
+                for it in group_el.findall("item"):
+                    index.setdefault(it.get("key"), it)
+        return index
+
+    def _set_tree(self, tree, file_sig):
+        self._tree = tree
+        self._file_signature = file_sig
+        self._index = self._index_items(tree.getroot())
+        self._entry = None
+
+    def _seed_defaults(self, root):
+        """Migration: make sure the configured groups and default items exist; returns the keys added."""
+        added = set()
+        for group, defaults in self.defaults.items():
+            group_el = root.find(group)
+            if group_el is None:
+                group_el = ET.SubElement(root, group)
+            existing_keys = {it.get("key") for it in group_el.findall("item")}
+            for d in defaults:
+                if d["key"] not in existing_keys:
+                    append_item(group_el, d)
+                    added.add(d["key"])
+        return added
+
+    def _parse_group(self, tag):
+        group_el = self._tree.getroot().find(tag)
+        if group_el is None:
+            return []
+        return [item_snapshot(it) for it in group_el.findall("item")]
+
+
+class SqliteCatalogStore(CatalogStore):
+    """
+    A catalog kept as rows of a SQLite database in WAL mode, shared by all
+    catalogs. A price update is one indexed UPDATE in its own transaction, so
+    writers (threads or processes) never rewrite each other's data and readers
+    are not blocked; the same transaction records the change in `price_history`
+    under the catalog version it created. Each write bumps the catalog's row in
+    `catalogs`, which is what the cache entry is validated against.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS catalogs (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            modified_ns INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY,
+            catalog TEXT NOT NULL,
+            grp TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            key TEXT NOT NULL,
+            name TEXT NOT NULL,
+            unit TEXT NOT NULL,
+            latest_price REAL NOT NULL,
+            consumption TEXT
+        );
+        CREATE INDEX IF NOT EXISTS items_by_key ON items (catalog, key);
+        CREATE INDEX IF NOT EXISTS items_by_group ON items (catalog, grp, position);
+        CREATE TABLE IF NOT EXISTS price_history (
+            id INTEGER PRIMARY KEY,
+            catalog TEXT NOT NULL,
+            key TEXT NOT NULL,
+            ts REAL NOT NULL,
+            price REAL NOT NULL,
+            prev REAL NOT NULL,
+            version INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS price_history_by_key ON price_history (catalog, key, ts);
+        CREATE INDEX IF NOT EXISTS price_history_by_ts ON price_history (catalog, ts);
+    """
+
+    def __init__(self, name, path, groups, defaults=None):
+        super().__init__(name, groups, defaults)
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._ready = False
+        self._entry = None
+
+    # ----- reads -----
+
+    def entry(self):
+        entry = self._entry
+        if entry is not None and entry["signature"] == self._signature(self._conn()):
+            CATALOG_CACHE.inc(self.name, "hit")
+            return entry
+        with self._lock, self._transaction("BEGIN") as conn:
+            signature = self._signature(conn)
+            if self._entry is None or self._entry["signature"] != signature:
+                self._catch_up(conn, signature[1])
+                data = {group: [] for group in self.groups}
+                with CATALOG_SECONDS.time(self.name, "parse"):
+                    for grp, *fields in conn.execute(
+                        "SELECT grp, key, name, unit, latest_price, consumption FROM items"
+                        " WHERE catalog = ? ORDER BY grp, position",
+                        (self.name,),
+                    ):
+                        if grp in data:
+                            data[grp].append(self._item(*fields))
+                self._entry = self._build_entry(signature, data)
+            else:
+                CATALOG_CACHE.inc(self.name, "hit")
+            return self._entry
+
+    def price_history(self, key):
+        item = self.get_item(key)
+        rows = self._conn().execute(
+            "SELECT ts, price, prev FROM price_history WHERE catalog = ? AND key = ? ORDER BY ts, id",
+            (self.name, key),
+        )
+        return item, rows.fetchall()
+
+    def prices_before(self, ts):
+        rows = self._conn().execute(
+            "SELECT key, prev FROM price_history WHERE catalog = ? AND ts > ? ORDER BY ts DESC, id DESC",
+            (self.name, ts),
+        )
+        # Newest first, so the earliest change after `ts` is the one left standing
+        return dict(rows.fetchall())
+
+    def items_page(self, group, offset, limit):
+        # A range of the items_by_group index; the catalog is never loaded for it
+        with self._transaction("BEGIN") as conn:
+            version = self._signature(conn)[1]
+            (total,) = conn.execute(
+                "SELECT COUNT(*) FROM items WHERE catalog = ? AND grp = ?", (self.name, group)
+            ).fetchone()
+            rows = conn.execute(
+                "SELECT key, name, unit, latest_price, consumption FROM items"
+                " WHERE catalog = ? AND grp = ? AND position >= ? ORDER BY position LIMIT ?",
+                (self.name, group, offset, limit),
+            )
+            return version, total, [self._item(*row) for row in rows]
+
+    # ----- writes -----
+
+    def update_prices(self, updates):
+        with CATALOG_SECONDS.time(self.name, "write"), self._transaction() as conn:
+            return self._update_prices(conn, updates)
+
+    def replace(self, data):
+        with CATALOG_SECONDS.time(self.name, "write"), self._transaction() as conn:
+            conn.execute("DELETE FROM items WHERE catalog = ?", (self.name,))
+            for group in self.groups:
+                self._insert(conn, group, data.get(group, []), 0)
+            self._bump(conn)
+
+    def import_items(self, updates, additions):
+        with CATALOG_SECONDS.time(self.name, "write"), self._transaction() as conn:
+            added = [item["key"] for items in additions.values() for item in items]
+            existing = [key for key in added if self._find(conn, key) is not None]
+            if existing:
+                raise existing_keys_error(existing)
+            updated = self._update_prices(conn, updates) if updates else []
+            if added:
+                for group, items in additions.items():
+                    (last,) = conn.execute(
+                        "SELECT COALESCE(MAX(position), -1) FROM items WHERE catalog = ? AND grp = ?",
+                        (self.name, group),
+                    ).fetchone()
+                    self._insert(conn, group, items, last + 1)
+                # A version of their own, without price history: readers of /changes resync
+                self._bump(conn)
+            return updated
+
+    # ----- connection and schema -----
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None: transactions are opened explicitly below
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.executescript(self.SCHEMA)
+                    self._migrate_schema(conn)
+                    self._seed_defaults(conn)
+                    self._ready = True
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self, begin="BEGIN IMMEDIATE"):
+        conn = self._conn()
+        conn.execute(begin)
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _migrate_schema(self, conn):
+        """Add what databases created by earlier versions lack."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(price_history)")}
+        if "version" not in columns:
+            conn.execute("ALTER TABLE price_history ADD COLUMN version INTEGER")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS price_history_by_version ON price_history (catalog, version)"
+        )
+
+    def _seed_defaults(self, conn):
+        """Migration: make sure the catalog and its default items exist."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO catalogs (name, version, modified_ns) VALUES (?, 0, ?)",
+                (self.name, time.time_ns()),
+            )
+            changed = False
+            for group, defaults in self.defaults.items():
+                existing = {
+                    key
+                    for (key,) in conn.execute(
+                        "SELECT key FROM items WHERE catalog = ? AND grp = ?", (self.name, group)
+                    )
+                }
+                missing = [d for d in defaults if d["key"] not in existing]
+                if missing:
+                    (last,) = conn.execute(
+                        "SELECT COALESCE(MAX(position), -1) FROM items WHERE catalog = ? AND grp = ?",
+                        (self.name, group),
+                    ).fetchone()
+                    self._insert(conn, group, missing, last + 1)
+                    changed = True
+            if changed:
+                self._bump(conn)
+                MIGRATION_WRITES.inc(self.name)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ----- rows -----
+
+    def _signature(self, conn):
+        return conn.execute(
+            "SELECT modified_ns, version FROM catalogs WHERE name = ?", (self.name,)
+        ).fetchone()
+
+    def _bump(self, conn) -> int:
+        conn.execute(
+            "UPDATE catalogs SET version = version + 1, modified_ns = ? WHERE name = ?",
+            (time.time_ns(), self.name),
+        )
+        (version,) = conn.execute("SELECT version FROM catalogs WHERE name = ?", (self.name,)).fetchone()
+        return version
+
+    def _catch_up(self, conn, version):
+        """
+        Bring the version and change buffer up to `version`, whoever wrote it:
+        price batches are read back from price_history; a version without
+        recorded prices (a replace, a migration) resets the buffer.
+        """
+        known = self.change_buffer.version
+        self.version = version
+        if known is None or not 0 <= version - known <= CHANGE_BUFFER:
+            self.change_buffer.reset(version)
+            return
+        changed = {}
+        for batch_version, key in conn.execute(
+            "SELECT version, key FROM price_history WHERE catalog = ? AND version > ? AND version <= ?",
+            (self.name, known, version),
+        ):
+            changed.setdefault(batch_version, set()).add(key)
+        for batch_version in range(known + 1, version + 1):
+            if batch_version in changed:
+                self.change_buffer.record(batch_version, changed[batch_version])
+            else:
+                self.change_buffer.reset(batch_version)
+
+    def _update_prices(self, conn, updates):
+        found = [(key, self._find(conn, key), price) for key, price in updates]
+        missing = [key for key, row_id, _ in found if row_id is None]
+        if missing:
+            raise unknown_keys_error(missing)
+        updated = []
+        ts = time.time()
+        version = self._bump(conn)
+        for key, row_id, new_price in found:
+            (prev,) = conn.execute("SELECT latest_price FROM items WHERE id = ?", (row_id,)).fetchone()
+            conn.execute(
+                "UPDATE items SET latest_price = ? WHERE id = ?", (round(new_price, 2), row_id)
+            )
+            conn.execute(
+                "INSERT INTO price_history (catalog, key, ts, price, prev, version) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.name, key, ts, round(new_price, 2), prev, version),
+            )
+            row = conn.execute(
+                "SELECT key, name, unit, latest_price, consumption FROM items WHERE id = ?",
+                (row_id,),
+            ).fetchone()
+            updated.append(self._item(*row))
+        return updated
+
+    def _find(self, conn, key):
+        """Row id of the item with `key`, first in group order as in the XML backend."""
+        rows = conn.execute(
+            "SELECT id, grp, position FROM items WHERE catalog = ? AND key = ?", (self.name, key)
+        ).fetchall()
+        rows = [row for row in rows if row[1] in self.groups]
+        if not rows:
+            return None
+        return min(rows, key=lambda row: (self.groups.index(row[1]), row[2]))[0]
+
+    def _insert(self, conn, group, items, first_position):
+        conn.executemany(
+            "INSERT INTO items (catalog, grp, position, key, name, unit, latest_price, consumption)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    self.name,
+                    group,
+                    first_position + i,
+                    item["key"],
+                    item["name"],
+                    item["unit"],
+                    round(item["latest_price"], 2),
+                    item.get("consumption"),
+                )
+                for i, item in enumerate(items)
+            ],
+        )
+
+    @staticmethod
+    def _item(key, name, unit, latest_price, consumption):
+        return {
+            "key": key,
+            "name": name,
+            "unit": unit,
+            "latest_price": latest_price,
+            **({"consumption": consumption} if consumption else {}),
+        }
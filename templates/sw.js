@@ -0,0 +1,247 @@
+// Service worker: repeat visits load from the device, and the calculators keep
+// working without a network (job sites with poor signal).
+//
+//   pages                        stale-while-revalidate; precached on install
+//   /static, /images, web fonts  cache first (asset URLs carry content hashes)
+//   /api/*/catalog, /api/*/items stale-while-revalidate (network first for
+//                                cache: 'reload'); price changes still queued
+//                                here are applied on top
+//   POST /api/*/update-price(s)  without a network, queued in IndexedDB and sent
+//                                in order once it is back
+//
+// Rendered by main.py (/sw.js). VERSION changes with any asset or template: the
+// new worker precaches afresh and drops the shell cache of the old one.
+const VERSION = {{ version|tojson }};
+const PAGES = {{ pages|tojson }};
+const PRECACHE = {{ precache|tojson }};
+
+const SHELL_CACHE = `shell-${VERSION}`;
+const DATA_CACHE = 'catalog-data'; // kept across versions: the last catalogs seen
+const QUEUE_DB = 'offline-queue';
+const SYNC_TAG = 'price-updates';
+
+const CATALOG_DATA = /^\/api\/([^/]+)\/(catalog|items)$/;
+const PRICE_UPDATE = /^\/api\/([^/]+)\/update-prices?$/;
+const FONT_HOSTS = ['fonts.googleapis.com', 'fonts.gstatic.com'];
+
+self.addEventListener('install', (event) => {
+  event.waitUntil((async () => {
+    const cache = await caches.open(SHELL_CACHE);
+    // Past the browser's HTTP cache, so the pages match this version's assets
+    await cache.addAll(PRECACHE.map(url => new Request(url, { cache: 'reload' })));
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    for (const name of await caches.keys()) {
+      if (name.startsWith('shell-') && name !== SHELL_CACHE) await caches.delete(name);
+    }
+    await self.clients.claim();
+    await replayQueue();
+  })());
+});
+
+self.addEventListener('fetch', (event) => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) {
+    if (request.method === 'GET' && FONT_HOSTS.includes(url.hostname)) {
+      event.respondWith(cacheFirst(request));
+    }
+    return;
+  }
+  if (request.method === 'POST' && PRICE_UPDATE.test(url.pathname)) {
+    event.respondWith(postOrQueue(request));
+  } else if (request.method !== 'GET') {
+    return;
+  } else if (CATALOG_DATA.test(url.pathname)) {
+    event.respondWith(catalogData(event));
+  } else if (url.pathname.startsWith('/static/') || url.pathname.startsWith('/images/')) {
+    event.respondWith(cacheFirst(request));
+  } else if (PAGES.includes(url.pathname)) {
+    event.respondWith(staleWhileRevalidate(event, SHELL_CACHE, { ignoreSearch: true }));
+  }
+});
+
+// Background Sync (where the browser has it): a retry until the queue is sent
+self.addEventListener('sync', (event) => {
+  if (event.tag !== SYNC_TAG) return;
+  event.waitUntil(replayQueue().then((sent) => {
+    if (!sent) throw new Error('Still offline');
+  }));
+});
+
+// Pages ask for a replay when they load and when the browser is back online
+self.addEventListener('message', (event) => {
+  if (event.data && event.data.type === 'replay') event.waitUntil(replayQueue().then(notifyClients));
+});
+
+// ---------- Caching ----------
+
+async function cacheFirst(request) {
+  const cache = await caches.open(SHELL_CACHE);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  // Opaque (cross-origin font) responses report status 0
+  if (response.ok || response.type === 'opaque') await cache.put(request, response.clone());
+  return response;
+}
+
+// The cached response right away, refreshed in the background; the network's when none is cached
+async function staleWhileRevalidate(event, cacheName, options) {
+  const request = event.request;
+  const cache = await caches.open(cacheName);
+  // A page asking past caches (a resync) gets the server's answer
+  const cached = request.cache === 'reload' ? undefined : await cache.match(request, options);
+  const fresh = fetch(request).then(async (response) => {
+    if (response.ok) await cache.put(request, response.clone());
+    return response;
+  });
+  if (!cached) return fresh;
+  event.waitUntil(fresh.catch(() => {}));
+  return cached;
+}
+
+async function catalogData(event) {
+  const response = await staleWhileRevalidate(event, DATA_CACHE);
+  const catalog = new URL(event.request.url).pathname.match(CATALOG_DATA)[1];
+  const prices = new Map();
+  for (const entry of await queued()) {
+    if (entry.catalog !== catalog) continue;
+    for (const { key, latest_price } of [].concat(entry.body)) prices.set(key, latest_price);
+  }
+  if (!prices.size || !response.ok) return response;
+
+  // Saved here but not sent yet: show the prices the server is about to have
+  const data = await response.json();
+  for (const items of Object.values(data)) {
+    if (!Array.isArray(items)) continue;
+    for (const item of items) {
+      if (item && prices.has(item.key)) item.latest_price = prices.get(item.key);
+    }
+  }
+  const headers = new Headers(response.headers);
+  ['Content-Encoding', 'Content-Length', 'ETag'].forEach(name => headers.delete(name));
+  return new Response(JSON.stringify(data), { status: response.status, headers });
+}
+
+// Fetch the cached catalog data of `catalogs` again, after queued prices reached the server
+async function refreshCatalogData(catalogs) {
+  const cache = await caches.open(DATA_CACHE);
+  for (const request of await cache.keys()) {
+    const match = new URL(request.url).pathname.match(CATALOG_DATA);
+    if (!match || !catalogs.has(match[1])) continue;
+    try {
+      const response = await fetch(request.url, { cache: 'no-store' });
+      if (response.ok) await cache.put(request, response);
+    } catch {
+      return;
+    }
+  }
+}
+
+// ---------- Price updates made offline ----------
+
+async function postOrQueue(request) {
+  const url = new URL(request.url);
+  let body;
+  try {
+    body = await request.clone().json();
+  } catch {
+    return fetch(request); // not ours to queue; let the server answer
+  }
+  // Saves made while others wait in the queue go after them, in order
+  if (await replayQueue()) {
+    try {
+      return await fetch(request);
+    } catch {
+      // No network: queue it below
+    }
+  }
+  await enqueue({ catalog: url.pathname.match(PRICE_UPDATE)[1], url: url.pathname, body, queued_at: Date.now() });
+  if (self.registration.sync) self.registration.sync.register(SYNC_TAG).catch(() => {});
+  await notifyClients();
+  // Shaped like the server's answer, so the page carries on with the new price
+  const saved = Array.isArray(body) ? { items: body } : { item: body };
+  return new Response(JSON.stringify({ status: 'queued', ...saved }), {
+    status: 202,
+    headers: { 'Content-Type': 'application/json' },
+  });
+}
+
+// Send the queued updates in order. True once the queue is empty; false while
+// the server cannot be reached (what is left stays queued)
+let replaying = null;
+function replayQueue() {
+  if (!replaying) {
+    replaying = sendQueued().finally(() => { replaying = null; });
+  }
+  return replaying;
+}
+
+async function sendQueued() {
+  const sent = new Set();
+  let done = true;
+  for (const entry of await queued()) {
+    let response;
+    try {
+      response = await fetch(entry.url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(entry.body),
+      });
+    } catch {
+      done = false;
+      break;
+    }
+    if (response.status >= 500) {
+      done = false;
+      break;
+    }
+    // Saved, or refused for good (an item since removed, an invalid price)
+    if (!response.ok) console.warn('Queued price update refused', entry, response.status);
+    await dequeue(entry.id);
+    sent.add(entry.catalog);
+  }
+  if (sent.size) {
+    await notifyClients();
+    await refreshCatalogData(sent);
+  }
+  return done;
+}
+
+async function notifyClients() {
+  const pending = (await queued()).length;
+  for (const client of await self.clients.matchAll()) {
+    client.postMessage({ type: 'offline-queue', pending });
+  }
+}
+
+// ---------- Queue storage (IndexedDB) ----------
+
+function openQueue() {
+  return new Promise((resolve, reject) => {
+    const open = indexedDB.open(QUEUE_DB, 1);
+    open.onupgradeneeded = () => open.result.createObjectStore('requests', { keyPath: 'id', autoIncrement: true });
+    open.onsuccess = () => resolve(open.result);
+    open.onerror = () => reject(open.error);
+  });
+}
+
+async function withQueue(mode, operation) {
+  const db = await openQueue();
+  return new Promise((resolve, reject) => {
+    const tx = db.transaction('requests', mode);
+    const request = operation(tx.objectStore('requests'));
+    tx.oncomplete = () => { db.close(); resolve(request.result); };
+    tx.onerror = tx.onabort = () => { db.close(); reject(tx.error); };
+  });
+}
+
+// Oldest first: ids are increasing
+const queued = () => withQueue('readonly', store => store.getAll());
+const enqueue = entry => withQueue('readwrite', store => store.add(entry));
+const dequeue = id => withQueue('readwrite', store => store.delete(id));
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    from fastapi.testclient import TestClient
+
+    import main
+
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("at", ["2024-01-01T10:00:00Z", "2024-01-01T12:00:00+02:00", "1704103200"])
+def test_history_takes_times_with_an_offset(client, at):
+    assert client.get("/api/plakakia/history", params={"at": at}).status_code == 200
+
+
+def test_history_rejects_times_without_an_offset(client):
+    response = client.get("/api/plakakia/history", params={"at": "2024-01-01T10:00:00"})
+    assert response.status_code == 422
+
+
+def test_quote_rejects_times_without_an_offset(client):
+    response = client.post("/api/plakakia/quote", params={"at": "2024-01-01T10:00:00"}, json={"m2": 10})
+    assert response.status_code == 422
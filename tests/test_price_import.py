@@ -0,0 +1,30 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from price_import import PriceImport
+from storage import XmlCatalogStore
+
+DATA = Path(__file__).resolve().parent.parent / "data"
+GROUPS = ("areas", "volumes", "workers", "extras")
+
+
+@pytest.fixture
+def store(tmp_path):
+    shutil.copy(DATA / "plakakia.xml", tmp_path / "plakakia.xml")
+    return XmlCatalogStore("plakakia", tmp_path / "plakakia.xml", GROUPS)
+
+
+@pytest.mark.parametrize("name", ["Πλακάκι <30x30>", "Κόλλα πάχος > 5mm", "<script>alert(1)</script>"])
+def test_new_item_names_are_kept_as_written(store, name):
+    # The pages escape names when rendering them; the import takes them verbatim
+    plan = PriceImport(store.entry(), GROUPS, ["key", "name", "unit", "price"], create=True, group="areas")
+    [row] = plan.feed([["plakaki_30", name, "m2", "12,50"]], 1)
+    assert row["action"] == "create"
+
+    updates, additions = plan.changes()
+    store.import_items(updates, additions)
+    item = next(item for item in store.load()["areas"] if item["key"] == "plakaki_30")
+    assert item["name"] == name
+    assert "&lt;" not in store.entry()["body"].decode("utf-8")
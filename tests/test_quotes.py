@@ -0,0 +1,62 @@
+import html
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+from quotes import PIECE_UNITS, build_quote_model, compute_quote
+from storage import XmlCatalogStore
+
+ROOT = Path(__file__).resolve().parent.parent
+GROUPS = ("areas", "volumes", "workers", "extras")
+
+
+@pytest.fixture
+def plakakia(tmp_path):
+    path = tmp_path / "plakakia.xml"
+    shutil.copy(ROOT / "data" / "plakakia.xml", path)
+    return build_quote_model("plakakia", XmlCatalogStore("plakakia", path, GROUPS).load())
+
+
+def line(quote, key):
+    return next(l for l in quote["lines"] if l["key"] == key)
+
+
+def test_bags_round_up_like_the_page(plakakia):
+    # 7 bags per 1 m3 at 9.00: the page orders 11 bags for 1.5 m3, not 10.5
+    tsimento = line(compute_quote(plakakia, {"m3": 1.5}), "tsimento")
+    assert tsimento["qty"] == 11
+    assert tsimento["cost"] == 99
+
+
+def test_page_rounds_the_server_piece_units(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    from fastapi.testclient import TestClient
+
+    import main
+
+    page = TestClient(main.app).get("/plakakia").text
+    tag = re.search(r'<script src="[^"]*quote-core[^"]*" data-piece-units="([^"]*)"', page)
+    assert tag is not None
+    assert set(html.unescape(tag.group(1)).split()) == PIECE_UNITS
+
+
+@pytest.mark.parametrize(
+    "inputs, key",
+    [({"counts": {"kola": 3}}, "kola"), ({"worker_days": {"ergatis": 2}}, "ergatis"), ({"prices": {"xx": 1}}, "xx")],
+)
+def test_unknown_keys_are_rejected(plakakia, inputs, key):
+    with pytest.raises(ValueError, match=f"'{key}'"):
+        compute_quote(plakakia, inputs)
+
+
+def test_quote_endpoint_names_the_unknown_key(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    from fastapi.testclient import TestClient
+
+    import main
+
+    response = TestClient(main.app).post("/api/plakakia/quote", json={"counts": {"kola": 3}})
+    assert response.status_code == 422
+    assert "kola" in response.json()["detail"]
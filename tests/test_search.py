@@ -0,0 +1,67 @@
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+from search import SearchIndex
+from storage import XmlCatalogStore
+
+DATA = Path(__file__).resolve().parent.parent / "data"
+GROUPS = ("areas", "volumes", "workers", "extras")
+
+
+class GatedStore:
+    """A store whose full reads (what a rebuild does) wait until `open` is set."""
+
+    def __init__(self, store):
+        self.store = store
+        self.open = threading.Event()
+        self.open.set()
+
+    def entry(self):
+        assert self.open.wait(10)
+        return self.store.entry()
+
+    def changes_since(self, version):
+        return self.store.changes_since(version)
+
+
+@pytest.fixture
+def store(tmp_path):
+    shutil.copy(DATA / "plakakia.xml", tmp_path / "plakakia.xml")
+    return XmlCatalogStore("plakakia", tmp_path / "plakakia.xml", GROUPS)
+
+
+def keys(index, query):
+    return [item["key"] for _, _, item in index.search(query, 20)]
+
+
+def test_rebuild_serves_the_previous_index_until_ready(store):
+    gated = GatedStore(store)
+    index = SearchIndex(gated)
+    index.refresh()
+    assert keys(index, "τσιμ") == ["tsimento"]
+
+    data = store.load()
+    data["areas"].append({"key": "marmaro", "name": "Μάρμαρο", "unit": "m2", "latest_price": 30.0})
+    store.replace(data)
+    gated.open.clear()
+    # Returns with the rebuild still waiting on the catalog
+    index.refresh()
+    assert keys(index, "μαρμ") == []
+    assert keys(index, "τσιμ") == ["tsimento"]
+
+    gated.open.set()
+    index.join(10)
+    assert keys(index, "μαρμ") == ["marmaro"]
+    assert index.version == store.entry()["version"]
+
+
+def test_price_changes_do_not_rebuild(store):
+    index = SearchIndex(store)
+    index.refresh()
+    store.update_price("tsimento", 9.5)
+    index.refresh()
+    assert index._rebuilder is None
+    assert [item["latest_price"] for _, _, item in index.search("τσιμ", 20)] == [9.5]
@@ -0,0 +1,73 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from storage import XmlCatalogStore
+
+DATA = Path(__file__).resolve().parent.parent / "data"
+GROUPS = ("areas", "volumes", "workers", "extras")
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    # The committed file: no journal/version attributes yet
+    path = tmp_path / "plakakia.xml"
+    shutil.copy(DATA / "plakakia.xml", path)
+    assert 'journal="' not in path.read_text(encoding="utf-8")
+    return path
+
+
+def test_first_save_after_loading_keeps_the_changes(catalog_path):
+    store = XmlCatalogStore("plakakia", catalog_path, GROUPS)
+    v0 = store.entry()["version"]
+    key = store.load()["areas"][0]["key"]
+
+    store.update_price(key, 12.34)
+
+    # The save stamped the file (a full snapshot), but it was a price change
+    assert 'journal="' in catalog_path.read_text(encoding="utf-8")
+    version, items = store.changes_since(v0)
+    assert version == v0 + 1
+    assert [(item["key"], item["latest_price"]) for item in items] == [(key, 12.34)]
+
+
+def test_snapshot_written_by_another_process_keeps_the_changes(catalog_path):
+    writer = XmlCatalogStore("plakakia", catalog_path, GROUPS)
+    reader = XmlCatalogStore("plakakia", catalog_path, GROUPS)
+    v0 = reader.entry()["version"]
+    assert writer.entry()["version"] == v0
+    key = writer.load()["areas"][0]["key"]
+
+    writer.update_price(key, 12.34)
+
+    version, items = reader.changes_since(v0)
+    assert version == v0 + 1
+    assert [item["key"] for item in items] == [key]
+
+
+def test_replace_is_a_resync(catalog_path):
+    store = XmlCatalogStore("plakakia", catalog_path, GROUPS)
+    v0 = store.entry()["version"]
+    store.replace(store.load())
+    assert store.changes_since(v0)[1] is None
+
+
+def test_load_does_not_write(catalog_path):
+    before = catalog_path.read_bytes()
+    XmlCatalogStore("plakakia", catalog_path, GROUPS).load()
+    assert catalog_path.read_bytes() == before
+
+
+def test_items_page_does_not_rebuild_the_catalog(catalog_path):
+    store = XmlCatalogStore("plakakia", catalog_path, GROUPS)
+    areas = store.load()["areas"]
+    store.update_price(areas[1]["key"], 12.34)
+
+    version, total, items = store.items_page("areas", 1, 2)
+    assert (version, total) == (store.version, len(areas))
+    assert [item["key"] for item in items] == [item["key"] for item in areas[1:3]]
+    assert items[0]["latest_price"] == 12.34
+    # Served from the tree; the whole catalog's entry waits for a full read
+    assert store._entry is None
+    assert store.items_page("areas", len(areas), 10) == (version, len(areas), [])
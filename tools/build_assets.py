@@ -0,0 +1,44 @@
+"""
+Precompress the static assets for the fingerprinted URLs (see assets.py).
+
+    python tools/build_assets.py
+
+Writes <file>.gz and <file>.br next to every file under static/ whose variants
+are missing or older than the file. Run after changing static files; the Docker
+image runs it at build time.
+"""
+import gzip
+import os
+import sys
+from pathlib import Path
+
+import brotli
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from assets import source_files  # noqa: E402
+
+COMPRESSORS = {
+    ".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+    ".br": lambda data: brotli.compress(data, quality=11),
+}
+
+
+def build(directory: Path):
+    for name in source_files(directory):
+        source = directory / name
+        data = source.read_bytes()
+        for suffix, compress in COMPRESSORS.items():
+            variant = source.with_name(source.name + suffix)
+            if variant.exists() and variant.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+                continue
+            packed = compress(data)
+            tmp = variant.with_name(f".{variant.name}.tmp")
+            tmp.write_bytes(packed)
+            os.replace(tmp, variant)
+            print(f"{variant.relative_to(ROOT)}: {len(data)} -> {len(packed)} bytes")
+
+
+if __name__ == "__main__":
+    build(ROOT / "static")
@@ -0,0 +1,79 @@
+"""
+Build the responsive image derivatives served by the picture() template helper.
+
+    pip install Pillow   # 11.3+ for AVIF
+    python tools/build_images.py
+
+For every image directly under images/, writes AVIF and WebP copies at the
+widths in WIDTHS that are narrower than the original (plus the original width)
+to images/derived/, and records them in images/derived/manifest.json. Also
+writes the app icons of the web app manifest (images/derived/icon-<size>.png),
+cut from the logo's emblem. Run it again after adding or replacing an image;
+the outputs are committed.
+"""
+import json
+from pathlib import Path
+
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parent.parent
+IMAGES = ROOT / "images"
+DERIVED = IMAGES / "derived"
+
+WIDTHS = (160, 320, 480, 640, 960, 1280)
+
+# Format -> Pillow save options
+FORMATS = {
+    "avif": {"format": "AVIF", "quality": 55, "speed": 4},
+    "webp": {"format": "WEBP", "quality": 78, "method": 6},
+}
+
+# App icons: the round emblem at the left of the header logo, as square PNGs
+ICON_SOURCE = ("HeaderLogoLight.png", (5, 7, 135, 137))
+ICON_SIZES = (192, 512)
+ICON_MARGIN = 0.06  # transparent border, as a share of the icon size
+
+
+def build():
+    DERIVED.mkdir(exist_ok=True)
+    manifest = {}
+    for source in sorted(IMAGES.iterdir()):
+        if source.suffix.lower() not in (".jpg", ".jpeg", ".png"):
+            continue
+        with Image.open(source) as original:
+            original.load()
+        width, height = original.size
+        mode = "RGBA" if "A" in original.getbands() else "RGB"
+        image = original.convert(mode)
+        widths = [w for w in WIDTHS if w < width] + [width]
+        entry = {"width": width, "height": height, "sources": {}}
+        for fmt, options in FORMATS.items():
+            srcset = []
+            for w in widths:
+                resized = image if w == width else image.resize((w, round(height * w / width)), Image.LANCZOS)
+                target = DERIVED / f"{source.stem}-{w}.{fmt}"
+                resized.save(target, **options)
+                srcset.append([w, target.relative_to(IMAGES).as_posix()])
+            entry["sources"][fmt] = srcset
+        manifest[source.name] = entry
+        full_width = (IMAGES / entry["sources"]["avif"][-1][1]).stat().st_size
+        print(f"{source.name}: {width}x{height}, {source.stat().st_size} -> {full_width} bytes as AVIF")
+    (DERIVED / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    build_icons()
+
+
+def build_icons():
+    name, box = ICON_SOURCE
+    with Image.open(IMAGES / name) as logo:
+        emblem = logo.convert("RGBA").crop(box)
+    for size in ICON_SIZES:
+        inner = round(size * (1 - 2 * ICON_MARGIN))
+        icon = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        icon.paste(emblem.resize((inner, inner), Image.LANCZOS), ((size - inner) // 2,) * 2)
+        target = DERIVED / f"icon-{size}.png"
+        icon.save(target, optimize=True)
+        print(f"{target.relative_to(IMAGES)}: {size}x{size}, {target.stat().st_size} bytes")
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,41 @@
+"""
+Copy the catalogs between the XML files and the SQLite database.
+
+    python tools/catalog_db.py import   # data/<name>.xml -> CATALOG_DB
+    python tools/catalog_db.py export   # CATALOG_DB -> data/<name>.xml
+
+Each catalog is replaced as a whole, in one transaction (import) or one atomic
+file write (export). Run from anywhere; paths are relative to the project root
+unless CATALOG_DB is absolute. Switch the app over with CATALOG_BACKEND=sqlite.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402  (needs the project root as cwd for the data paths)
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("direction", choices=("import", "export"))
+    parser.add_argument("catalogs", nargs="*", help="catalogs to copy (default: all)")
+    args = parser.parse_args(argv)
+
+    for name in args.catalogs or list(main.CATALOG_SPECS):
+        if name not in main.CATALOG_SPECS:
+            parser.error(f"unknown catalog '{name}'")
+        xml_store, db_store = main.open_store(name, "xml"), main.open_store(name, "sqlite")
+        source, target = (xml_store, db_store) if args.direction == "import" else (db_store, xml_store)
+        data = source.load()
+        target.replace(data)
+        count = sum(len(items) for items in data.values())
+        print(f"{args.direction}ed {name}: {count} items ({source.path} -> {target.path})")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,107 @@
+"""
+Import a supplier price list (CSV) into a catalog; see price_import.py.
+
+    python tools/import_prices.py plakakia supplier.csv                 # dry run: print the diff
+    python tools/import_prices.py plakakia supplier.csv --apply         # then write it
+    python tools/import_prices.py plakakia supplier.csv --column key=Κωδικός --column price="Τιμή χονδρικής"
+    python tools/import_prices.py plakakia supplier.csv --create --group areas --apply
+
+The file is read in batches, so its length does not matter. The diff lists the
+rows that change something or could not be used (--all for every row), then a
+summary with rows/s. --apply writes every change in one write, and only if no
+row had an error. Safe to run while the app is serving the same catalogs.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402  (needs the project root as cwd for the data paths)
+from price_import import PriceImport, parse_column_map  # noqa: E402
+
+BATCH_ROWS = 5000
+
+
+def format_row(d):
+    price = f"{d.get('old', ''):>10} -> {d['new']:<10}" if "new" in d else ""
+    note = d.get("error") or d.get("reason") or d.get("group", "")
+    return f"{d['row']:>7}  {d['action']:<9} {d.get('key', ''):<24} {price} {note}".rstrip()
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("catalog", choices=list(main.CATALOG_SPECS))
+    parser.add_argument("csv", type=Path, help="price list with a header row (comma or semicolon separated)")
+    parser.add_argument("--column", action="append", default=[], metavar="FIELD=HEADER",
+                        help="read a field (key, name, unit, price, group) from another column")
+    parser.add_argument("--create", action="store_true", help="add rows that match no item as new items")
+    parser.add_argument("--group", help="group of new items whose row has none")
+    parser.add_argument("--apply", action="store_true", help="write the changes (default: dry run)")
+    parser.add_argument("--all", action="store_true", help="list unchanged rows too")
+    parser.add_argument("--json", action="store_true", help="print the diff and summary as NDJSON")
+    args = parser.parse_args(argv)
+
+    store = main.get_store(args.catalog)
+    if args.group is not None and args.group not in store.groups:
+        parser.error(f"unknown group '{args.group}' (one of {', '.join(store.groups)})")
+    try:
+        columns = parse_column_map(args.column)
+    except ValueError as e:
+        parser.error(str(e))
+
+    started = time.perf_counter()
+    with open(args.csv, newline="", encoding="utf-8-sig") as fh:
+        header_line = fh.readline()
+        delimiter = main.csv_delimiter(header_line)
+        header = next(csv.reader([header_line], delimiter=delimiter), [])
+        try:
+            plan = PriceImport(store.entry(), store.groups, header, columns, create=args.create, group=args.group)
+        except ValueError as e:
+            parser.error(str(e))
+        rows = csv.reader(fh, delimiter=delimiter)
+        first_row = 1
+        while batch := list(itertools.islice(rows, BATCH_ROWS)):
+            for d in plan.feed(batch, first_row):
+                if args.json:
+                    print(json.dumps(d, ensure_ascii=False))
+                elif args.all or d["action"] != "unchanged":
+                    print(format_row(d))
+            first_row += len(batch)
+
+    summary = {**plan.summary(), "applied": False}
+    if args.apply and not plan.counts["error"]:
+        updates, additions = plan.changes()
+        try:
+            store.import_items(updates, additions)
+            summary["applied"] = True
+        except (KeyError, ValueError) as e:
+            summary["error"] = e.args[0]
+    elapsed = time.perf_counter() - started
+    summary.update(seconds=round(elapsed, 3), rows_per_s=round(plan.rows / elapsed, 1) if elapsed else None)
+
+    if args.json:
+        print(json.dumps({"summary": summary}, ensure_ascii=False))
+    else:
+        counts = ", ".join(f"{summary[action]} {action}" for action in ("update", "unchanged", "create", "skip", "error"))
+        print(f"{summary['rows']} rows ({counts}) in {summary['seconds']}s, {summary['rows_per_s']} rows/s",
+              file=sys.stderr)
+        if summary["applied"]:
+            print(f"applied: {summary['changed_items']} prices, {summary['new_items']} new items", file=sys.stderr)
+        elif args.apply:
+            print(f"not applied: {summary.get('error', 'fix the rows with errors first')}", file=sys.stderr)
+        else:
+            print("dry run: nothing written (--apply to write)", file=sys.stderr)
+    if args.apply and not summary["applied"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main_cli()